@@ -0,0 +1,69 @@
+"""
+Benchmark the reconstruction step of redpd_preprocess.highpass_from_diff: the original python recursion
+against the cumulative sum now used, on multi-hour 3-axis data.
+
+Usage: python benchmarks/benchmark_highpass_from_diff.py [--hours 3] [--sample_rate_hz 400]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import redpandas.redpd_preprocess as rpd_prep
+
+
+def reconstruct_from_diff_loop(sig_diff_wf: np.ndarray) -> np.ndarray:
+    """
+    Original reconstruction recursion in highpass_from_diff
+
+    :param sig_diff_wf: differential signal waveform
+    :return: reconstructed signal waveform
+    """
+    sig_reconstruct = np.zeros((len(sig_diff_wf)))
+    sig_reconstruct[0] = sig_diff_wf[0]
+    for i in range(1, len(sig_diff_wf) - 1):
+        sig_reconstruct[i] = sig_diff_wf[i] + sig_reconstruct[i-1]
+    return sig_reconstruct
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=3.)
+    parser.add_argument("--sample_rate_hz", type=float, default=400.)
+    args = parser.parse_args()
+
+    number_points = int(args.hours * 3600 * args.sample_rate_hz)
+    sig_epoch_s = np.arange(number_points) / args.sample_rate_hz
+    rng = np.random.default_rng(seed=0)
+    sig_3c = 9.8 + rng.normal(scale=0.1, size=(3, number_points)).cumsum(axis=1) / number_points
+
+    print(f"3-axis signal, {args.hours} hours at {args.sample_rate_hz} Hz: {number_points} points per axis")
+
+    sig_diff_3c = [rpd_prep.demean_nan(np.gradient(sig_3c[index_dimension])) for index_dimension in range(3)]
+
+    time_start = time.perf_counter()
+    reconstruct_loop = [reconstruct_from_diff_loop(sig_diff) for sig_diff in sig_diff_3c]
+    time_loop_s = time.perf_counter() - time_start
+
+    time_start = time.perf_counter()
+    reconstruct_cumsum = [rpd_prep.reconstruct_from_diff(sig_diff) for sig_diff in sig_diff_3c]
+    time_cumsum_s = time.perf_counter() - time_start
+
+    for loop, cumsum in zip(reconstruct_loop, reconstruct_cumsum):
+        np.testing.assert_array_equal(loop, cumsum)
+
+    print(f"Reconstruction, python loop: {time_loop_s:.3f} s")
+    print(f"Reconstruction, cumsum: {time_cumsum_s:.3f} s ({time_loop_s / time_cumsum_s:.0f}x)")
+
+    time_start = time.perf_counter()
+    for index_dimension in range(3):
+        rpd_prep.highpass_from_diff(sig_wf=sig_3c[index_dimension],
+                                    sig_epoch_s=sig_epoch_s,
+                                    sample_rate_hz=args.sample_rate_hz,
+                                    highpass_type='obspy')
+    print(f"Full highpass_from_diff (obspy), 3 axes: {time.perf_counter() - time_start:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ This is a helper function for other skyfall example files
 
 # Python libraries
 import os.path
-import pandas as pd
+from typing import List, Optional
 
 # RedVox RedPandas and related RedVox modules
 from redvox.common.data_window import DataWindow
@@ -20,12 +20,23 @@ from examples.skyfall.skyfall_config_file import skyfall_config
 LOADED_DF = None
 
 
-def dw_main(load_method: DataLoadMethod):
+def dw_main(load_method: DataLoadMethod,
+            columns: Optional[List[str]] = None):
     """
+    :param load_method: data loading method
+    :param columns: optional list of columns to return. With the parquet load method and no dataframe loaded yet, only
+        these columns are read from the file. Default is None, all columns
     :return: skyfall dataframe; exits if dataframe can't be found
     """
     global LOADED_DF
 
+    if LOADED_DF is None and columns is not None and load_method == DataLoadMethod.PARQUET:
+        print("Loading columns from existing RedPandas Parquet...", end=" ")
+        df_columns = rpd_df.read_df_from_parquet(os.path.join(skyfall_config.output_dir, skyfall_config.pd_pqt_file),
+                                                 columns=columns)
+        print("Done.")
+        return df_columns[columns]
+
     if LOADED_DF is None:
         # Load data options
         if load_method == DataLoadMethod.DATAWINDOW or load_method == DataLoadMethod.PICKLE:
@@ -46,11 +57,14 @@ def dw_main(load_method: DataLoadMethod):
 
         elif load_method == DataLoadMethod.PARQUET:  # Option C: Open dataframe from parquet file
             print("Loading existing RedPandas Parquet...", end=" ")
-            LOADED_DF = pd.read_parquet(os.path.join(skyfall_config.output_dir, skyfall_config.pd_pqt_file))
+            LOADED_DF = rpd_df.read_df_from_parquet(os.path.join(skyfall_config.output_dir,
+                                                                 skyfall_config.pd_pqt_file))
             print(f"Done. RedVox SDK version: {LOADED_DF['redvox_sdk_version'][0]}")
 
         else:
             print('\nNo data loading method selected.  Data is required to run program; will now exit.')
             exit(1)
 
+    if columns is not None:
+        return LOADED_DF[columns]
     return LOADED_DF
@@ -7,11 +7,9 @@ from libquantum.plot_templates import plot_time_frequency_reps as pnl
 # RedVox RedPandas and related RedVox modules
 import examples.skyfall.lib.skyfall_dw as sf_dw
 import redpandas.redpd_gravity as rpd_grav
-import redpandas.redpd_preprocess as rpd_prep
 
 # Configuration files
 from examples.skyfall.skyfall_config_file import skyfall_config
-from redpandas.redpd_config import DataLoadMethod
 
 
 def main():
@@ -51,15 +49,6 @@ def main():
         # Repeat here
         if accelerometer_data_raw_label and accelerometer_fs_label and accelerometer_data_highpass_label \
                 in df_skyfall_data.columns:
-            if skyfall_config.tdr_load_method == DataLoadMethod.PARQUET:
-                # Reshape wf columns
-                rpd_prep.df_column_unflatten(df=df_skyfall_data,
-                                             col_wf_label=accelerometer_data_raw_label,
-                                             col_ndim_label=accelerometer_data_raw_label + "_ndim")
-                rpd_prep.df_column_unflatten(df=df_skyfall_data,
-                                             col_wf_label=accelerometer_data_highpass_label,
-                                             col_ndim_label=accelerometer_data_highpass_label + "_ndim")
-
             print('accelerometer_sample_rate_hz:', df_skyfall_data[accelerometer_fs_label][station])
             print('accelerometer_epoch_s_0:', df_skyfall_data[accelerometer_epoch_s_label][station][0],
                   df_skyfall_data[accelerometer_epoch_s_label][station][-1])
@@ -85,21 +74,13 @@ def main():
             accelerometer_time_s = df_skyfall_data[accelerometer_epoch_s_label][station]
             accelerometer_sample_rate = 1 / np.mean(np.diff(accelerometer_time_s))
 
-            # get gravity and linear acceleration
-            gravity_x, linear_x = rpd_grav.get_gravity_and_linear_acceleration(
-                accelerometer=df_skyfall_data[accelerometer_data_raw_label][station][0],
-                sensor_sample_rate_hz=accelerometer_sample_rate,
-                low_pass_sample_rate_hz=2)
-
-            gravity_y, linear_y = rpd_grav.get_gravity_and_linear_acceleration(
-                accelerometer=df_skyfall_data[accelerometer_data_raw_label][station][1],
-                sensor_sample_rate_hz=accelerometer_sample_rate,
-                low_pass_sample_rate_hz=2)
-
-            gravity_z, linear_z = rpd_grav.get_gravity_and_linear_acceleration(
-                accelerometer=df_skyfall_data[accelerometer_data_raw_label][station][2],
+            # get gravity and linear acceleration, all three axes at once
+            gravity_3c, linear_3c = rpd_grav.get_gravity_and_linear_acceleration(
+                accelerometer=np.vstack(df_skyfall_data[accelerometer_data_raw_label][station][0:3]),
                 sensor_sample_rate_hz=accelerometer_sample_rate,
                 low_pass_sample_rate_hz=2)
+            gravity_x, gravity_y, gravity_z = gravity_3c
+            linear_x, linear_y, linear_z = linear_3c
 
             # Plot 3c acceleration gravity waveforms
             pnl.plot_wf_wf_wf_vert(redvox_id=station_id_str,
@@ -90,7 +90,7 @@ def main():
                   'location_horizontal_accuracy',
                   'barometer_epoch_s',
                   'barometer_wf_raw']
-    df_loc = sf_dw.dw_main(skyfall_config.tdr_load_method)[loc_fields]
+    df_loc = sf_dw.dw_main(skyfall_config.tdr_load_method, columns=loc_fields)
     print(f'Dimensions (# of rows, # of columns): {df_loc.shape}')
 
     # Pick only the balloon station
@@ -4,11 +4,9 @@ import numpy as np
 
 # RedVox RedPandas and related RedVox modules
 import examples.skyfall.lib.skyfall_dw as sf_dw
-import redpandas.redpd_preprocess as rpd_prep
 from libquantum.plot_templates import plot_time_frequency_reps as pnl
 
 # Configuration files
-from redpandas.redpd_config import DataLoadMethod
 from examples.skyfall.skyfall_config_file import skyfall_config
 
 
@@ -49,17 +47,6 @@ def main():
 
         if gyroscope_data_raw_label and gyroscope_fs_label and gyroscope_data_highpass_label \
                 in df_skyfall_data.columns:
-
-            if skyfall_config.tdr_load_method == DataLoadMethod.PARQUET:
-                # Reshape wf columns
-                rpd_prep.df_column_unflatten(df=df_skyfall_data,
-                                             col_wf_label=gyroscope_data_raw_label,
-                                             col_ndim_label=gyroscope_data_raw_label + "_ndim")
-
-                rpd_prep.df_column_unflatten(df=df_skyfall_data,
-                                             col_wf_label=gyroscope_data_highpass_label,
-                                             col_ndim_label=gyroscope_data_highpass_label + "_ndim")
-
             print('gyroscope_sample_rate_hz:', df_skyfall_data[gyroscope_fs_label][station])
             print('gyroscope_epoch_s_0:', df_skyfall_data[gyroscope_epoch_s_label][station][0],
                   df_skyfall_data[gyroscope_epoch_s_label][station][-1])
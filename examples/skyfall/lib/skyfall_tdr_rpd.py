@@ -4,14 +4,12 @@ import matplotlib.pyplot as plt
 import datetime as dtime
 
 # RedVox RedPandas and related RedVox modules
-import redpandas.redpd_preprocess as rpd_prep
 import redpandas.redpd_plot.wiggles as rpd_plot
 import redpandas.redpd_geospatial as rpd_geo
 from redpandas.redpd_scales import METERS_TO_KM
 from libquantum.plot_templates import plot_time_frequency_reps as pnl
 
 # Configuration files
-from redpandas.redpd_config import DataLoadMethod
 import examples.skyfall.lib.skyfall_dw as sf_dw
 from examples.skyfall.skyfall_config_file import skyfall_config, \
     ref_latitude_deg, ref_longitude_deg, ref_altitude_m, ref_epoch_s
@@ -97,16 +95,6 @@ def main():
             event_reference_time_epoch_s = df_skyfall_data[audio_epoch_s_label][station][0]
 
         if barometer_data_raw_label and barometer_data_highpass_label and barometer_fs_label in df_skyfall_data.columns:
-            if skyfall_config.tdr_load_method == DataLoadMethod.PARQUET:
-                # Reshape wf columns
-                rpd_prep.df_column_unflatten(df=df_skyfall_data,
-                                             col_wf_label=barometer_data_raw_label,
-                                             col_ndim_label=barometer_data_raw_label + "_ndim")
-
-                rpd_prep.df_column_unflatten(df=df_skyfall_data,
-                                             col_wf_label=barometer_data_highpass_label,
-                                             col_ndim_label=barometer_data_highpass_label + "_ndim")
-
             print('barometer_sample_rate_hz:', df_skyfall_data[barometer_fs_label][station])
             print('barometer_epoch_s_0:', df_skyfall_data[barometer_epoch_s_label][station][0])
 
@@ -117,15 +105,6 @@ def main():
         # Repeat here
         if accelerometer_data_raw_label and accelerometer_fs_label and accelerometer_data_highpass_label \
                 in df_skyfall_data.columns:
-            if skyfall_config.tdr_load_method == DataLoadMethod.PARQUET:
-                # Reshape wf columns
-                rpd_prep.df_column_unflatten(df=df_skyfall_data,
-                                             col_wf_label=accelerometer_data_raw_label,
-                                             col_ndim_label=accelerometer_data_raw_label + "_ndim")
-                rpd_prep.df_column_unflatten(df=df_skyfall_data,
-                                             col_wf_label=accelerometer_data_highpass_label,
-                                             col_ndim_label=accelerometer_data_highpass_label + "_ndim")
-
             print('accelerometer_sample_rate_hz:', df_skyfall_data[accelerometer_fs_label][station])
             print('accelerometer_epoch_s_0:',  df_skyfall_data[accelerometer_epoch_s_label][station][0],
                   df_skyfall_data[accelerometer_epoch_s_label][station][-1])
@@ -183,17 +162,6 @@ def main():
 
         if gyroscope_data_raw_label and gyroscope_fs_label and gyroscope_data_highpass_label \
                 in df_skyfall_data.columns:
-
-            if skyfall_config.tdr_load_method == DataLoadMethod.PARQUET:
-                # Reshape wf columns
-                rpd_prep.df_column_unflatten(df=df_skyfall_data,
-                                             col_wf_label=gyroscope_data_raw_label,
-                                             col_ndim_label=gyroscope_data_raw_label + "_ndim")
-
-                rpd_prep.df_column_unflatten(df=df_skyfall_data,
-                                             col_wf_label=gyroscope_data_highpass_label,
-                                             col_ndim_label=gyroscope_data_highpass_label + "_ndim")
-
             print('gyroscope_sample_rate_hz:', df_skyfall_data[gyroscope_fs_label][station])
             print('gyroscope_epoch_s_0:', df_skyfall_data[gyroscope_epoch_s_label][station][0],
                   df_skyfall_data[gyroscope_epoch_s_label][station][-1])
@@ -216,15 +184,6 @@ def main():
 
         if magnetometer_data_raw_label and magnetometer_fs_label and magnetometer_data_highpass_label \
                 in df_skyfall_data.columns:
-            if skyfall_config.tdr_load_method == DataLoadMethod.PARQUET:
-                # Reshape wf columns
-                rpd_prep.df_column_unflatten(df=df_skyfall_data,
-                                             col_wf_label=magnetometer_data_raw_label,
-                                             col_ndim_label=magnetometer_data_raw_label + "_ndim")
-                rpd_prep.df_column_unflatten(df=df_skyfall_data,
-                                             col_wf_label=magnetometer_data_highpass_label,
-                                             col_ndim_label=magnetometer_data_highpass_label + "_ndim")
-
             print('magnetometer_sample_rate_hz:', df_skyfall_data[magnetometer_fs_label][station])
             print('magnetometer_epoch_s_0:', df_skyfall_data[magnetometer_epoch_s_label][station][0],
                   df_skyfall_data[magnetometer_epoch_s_label][station][-1])
@@ -247,7 +206,6 @@ def main():
 
         if location_latitude_label and location_longitude_label and location_altitude_label and location_speed_label \
                 in df_skyfall_data.columns:
-
             print("Bounder End EPOCH:", ref_epoch_s)
             print("Bounder End LAT LON ALT:", ref_latitude_deg, ref_longitude_deg, ref_altitude_m)
 
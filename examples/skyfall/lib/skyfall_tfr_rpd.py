@@ -2,14 +2,12 @@
 import matplotlib.pyplot as plt
 
 # RedVox RedPandas and related RedVox modules
-import redpandas.redpd_preprocess as rpd_prep
 import redpandas.redpd_plot.mesh as rpd_plot
 import redpandas.redpd_tfr as rpd_tfr
 from libquantum.plot_templates import plot_time_frequency_reps as pnl
 import examples.skyfall.lib.skyfall_dw as sf_dw
 
 # Configuration file
-from redpandas.redpd_config import DataLoadMethod
 from examples.skyfall.skyfall_config_file import skyfall_config, tfr_config
 
 axes = ["X", "Y", "Z"]
@@ -94,7 +92,8 @@ def main():
                                                      tfr_type=tfr_config.tfr_type,
                                                      new_column_tfr_bits=audio_tfr_bits_label,
                                                      new_column_tfr_frequency_hz=audio_tfr_frequency_hz_label,
-                                                     new_column_tfr_time_s=audio_tfr_time_s_label)
+                                                     new_column_tfr_time_s=audio_tfr_time_s_label,
+                                                     cache_dir=tfr_config.tfr_cache_dir)
 
             pnl.plot_wf_mesh_vert(redvox_id=station_id_str,
                                   wf_panel_2_sig=df_skyfall_data[audio_data_label][station],
@@ -111,16 +110,6 @@ def main():
                                   wf_panel_2_units="Audio, Norm")
 
         if barometer_data_raw_label and barometer_data_highpass_label and barometer_fs_label in df_skyfall_data.columns:
-            if skyfall_config.tdr_load_method == DataLoadMethod.PARQUET:
-                # Reshape wf columns
-                rpd_prep.df_column_unflatten(df=df_skyfall_data,
-                                             col_wf_label=barometer_data_raw_label,
-                                             col_ndim_label=barometer_data_raw_label + "_ndim")
-
-                rpd_prep.df_column_unflatten(df=df_skyfall_data,
-                                             col_wf_label=barometer_data_highpass_label,
-                                             col_ndim_label=barometer_data_highpass_label + "_ndim")
-
             print('barometer_sample_rate_hz:', df_skyfall_data[barometer_fs_label][station])
             print('barometer_epoch_s_0:', df_skyfall_data[barometer_epoch_s_label][station][0])
 
@@ -137,7 +126,8 @@ def main():
                                                      tfr_type=tfr_config.tfr_type,
                                                      new_column_tfr_bits=barometer_tfr_bits_label,
                                                      new_column_tfr_frequency_hz=barometer_tfr_frequency_hz_label,
-                                                     new_column_tfr_time_s=barometer_tfr_time_s_label)
+                                                     new_column_tfr_time_s=barometer_tfr_time_s_label,
+                                                     cache_dir=tfr_config.tfr_cache_dir)
 
             pnl.plot_wf_mesh_vert(redvox_id=station_id_str,
                                   wf_panel_2_sig=df_skyfall_data[bar_sig_label][station][0],
@@ -156,15 +146,6 @@ def main():
         # Repeat here
         if accelerometer_data_raw_label and accelerometer_fs_label and accelerometer_data_highpass_label \
                 in df_skyfall_data.columns:
-            if skyfall_config.tdr_load_method == DataLoadMethod.PARQUET:
-                # Reshape wf columns
-                rpd_prep.df_column_unflatten(df=df_skyfall_data,
-                                             col_wf_label=accelerometer_data_raw_label,
-                                             col_ndim_label=accelerometer_data_raw_label + "_ndim")
-                rpd_prep.df_column_unflatten(df=df_skyfall_data,
-                                             col_wf_label=accelerometer_data_highpass_label,
-                                             col_ndim_label=accelerometer_data_highpass_label + "_ndim")
-
             print('accelerometer_sample_rate_hz:', df_skyfall_data[accelerometer_fs_label][station])
             print('accelerometer_epoch_s_0:', df_skyfall_data[accelerometer_epoch_s_label][station][0],
                   df_skyfall_data[accelerometer_epoch_s_label][station][-1])
@@ -182,7 +163,8 @@ def main():
                                                      tfr_type=tfr_config.tfr_type,
                                                      new_column_tfr_bits=accelerometer_tfr_bits_label,
                                                      new_column_tfr_frequency_hz=accelerometer_tfr_frequency_hz_label,
-                                                     new_column_tfr_time_s=accelerometer_tfr_time_s_label)
+                                                     new_column_tfr_time_s=accelerometer_tfr_time_s_label,
+                                                     cache_dir=tfr_config.tfr_cache_dir)
 
             for ax_n in range(3):
                 pnl.plot_wf_mesh_vert(redvox_id=station_id_str,
@@ -202,17 +184,6 @@ def main():
 
         if gyroscope_data_raw_label and gyroscope_fs_label and gyroscope_data_highpass_label \
                 in df_skyfall_data.columns:
-
-            if skyfall_config.tdr_load_method == DataLoadMethod.PARQUET:
-                # Reshape wf columns
-                rpd_prep.df_column_unflatten(df=df_skyfall_data,
-                                             col_wf_label=gyroscope_data_raw_label,
-                                             col_ndim_label=gyroscope_data_raw_label + "_ndim")
-
-                rpd_prep.df_column_unflatten(df=df_skyfall_data,
-                                             col_wf_label=gyroscope_data_highpass_label,
-                                             col_ndim_label=gyroscope_data_highpass_label + "_ndim")
-
             print('gyroscope_sample_rate_hz:', df_skyfall_data[gyroscope_fs_label][station])
             print('gyroscope_epoch_s_0:', df_skyfall_data[gyroscope_epoch_s_label][station][0],
                   df_skyfall_data[gyroscope_epoch_s_label][station][-1])
@@ -230,7 +201,8 @@ def main():
                                                      tfr_type=tfr_config.tfr_type,
                                                      new_column_tfr_bits=gyroscope_tfr_bits_label,
                                                      new_column_tfr_frequency_hz=gyroscope_tfr_frequency_hz_label,
-                                                     new_column_tfr_time_s=gyroscope_tfr_time_s_label)
+                                                     new_column_tfr_time_s=gyroscope_tfr_time_s_label,
+                                                     cache_dir=tfr_config.tfr_cache_dir)
             for ax_n in range(3):
                 pnl.plot_wf_mesh_vert(redvox_id=station_id_str,
                                       wf_panel_2_sig=df_skyfall_data[gyr_sig_label][station][ax_n],
@@ -249,15 +221,6 @@ def main():
 
         if magnetometer_data_raw_label and magnetometer_fs_label and magnetometer_data_highpass_label \
                 in df_skyfall_data.columns:
-            if skyfall_config.tdr_load_method == DataLoadMethod.PARQUET:
-                # Reshape wf columns
-                rpd_prep.df_column_unflatten(df=df_skyfall_data,
-                                             col_wf_label=magnetometer_data_raw_label,
-                                             col_ndim_label=magnetometer_data_raw_label + "_ndim")
-                rpd_prep.df_column_unflatten(df=df_skyfall_data,
-                                             col_wf_label=magnetometer_data_highpass_label,
-                                             col_ndim_label=magnetometer_data_highpass_label + "_ndim")
-
             print('magnetometer_sample_rate_hz:', df_skyfall_data[magnetometer_fs_label][station])
             print('magnetometer_epoch_s_0:', df_skyfall_data[magnetometer_epoch_s_label][station][0],
                   df_skyfall_data[magnetometer_epoch_s_label][station][-1])
@@ -275,7 +238,8 @@ def main():
                                                      tfr_type=tfr_config.tfr_type,
                                                      new_column_tfr_bits=magnetometer_tfr_bits_label,
                                                      new_column_tfr_frequency_hz=magnetometer_tfr_frequency_hz_label,
-                                                     new_column_tfr_time_s=magnetometer_tfr_time_s_label)
+                                                     new_column_tfr_time_s=magnetometer_tfr_time_s_label,
+                                                     cache_dir=tfr_config.tfr_cache_dir)
             for ax_n in range(3):
                 pnl.plot_wf_mesh_vert(redvox_id=station_id_str,
                                       wf_panel_2_sig=df_skyfall_data[mag_sig_label][station][ax_n],
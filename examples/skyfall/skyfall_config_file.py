@@ -44,4 +44,5 @@ tfr_config = TFRConfig(tfr_type='stft',
                                          'Gyr': 18.,
                                          'Mag': 18.},
                        sensor_highpass=True,
-                       tfr_load_method="datawindow")
+                       tfr_load_method="datawindow",
+                       tfr_cache_dir=os.path.join(SKYFALL_DIR, "rpd_files", "tfr_cache"))
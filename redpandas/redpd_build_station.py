@@ -132,23 +132,22 @@ def build_station(station: Station,
     else:  # barometer, acceleration, gyroscope, magnetometer, linear_accel, orientation, rotation_vector, gravity
         sensor_sample_rate_hz, sensor_epoch_s, sensor_raw, sensor_nans = sensor_uneven(station=station,
                                                                                        sensor_label=sensor_label)
-        list_sensor_highpass = []
         if sensor_sample_rate_hz:
-            for index_dimension, _ in enumerate(sensor_raw):
-                sensor_waveform_highpass, _ = rpd_prep.highpass_from_diff(sig_wf=sensor_raw[index_dimension],
-                                                                          sig_epoch_s=sensor_epoch_s,
-                                                                          sample_rate_hz=sensor_sample_rate_hz,
-                                                                          fold_signal=True,
-                                                                          highpass_type=highpass_type,
-                                                                          frequency_filter_low=frequency_filter_low,
-                                                                          filter_order=filter_order)
-                list_sensor_highpass.append(sensor_waveform_highpass)
+            # All axes filtered in one call
+            sensor_waveform_highpass, _ = \
+                rpd_prep.highpass_from_diff_multichannel(sig_wf=sensor_raw,
+                                                         sig_epoch_s=sensor_epoch_s,
+                                                         sample_rate_hz=sensor_sample_rate_hz,
+                                                         fold_signal=True,
+                                                         highpass_type=highpass_type,
+                                                         frequency_filter_low=frequency_filter_low,
+                                                         filter_order=filter_order)
 
             return {f'{sensor_label}_sensor_name': eval('station.' + sensor_label + '_sensor()').name,
                     f'{sensor_label}_sample_rate_hz': sensor_sample_rate_hz,
                     f'{sensor_label}_epoch_s': sensor_epoch_s,
                     f'{sensor_label}_wf_raw': sensor_raw,
-                    f'{sensor_label}_wf_highpass': np.array(list_sensor_highpass),
+                    f'{sensor_label}_wf_highpass': sensor_waveform_highpass,
                     f'{sensor_label}_nans': sensor_nans}
         else:
             return {}
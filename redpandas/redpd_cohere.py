@@ -2,13 +2,134 @@
 Calculate coherence.
 """
 
+from functools import partial
+from typing import Optional, Tuple, Union
+
 import numpy as np
 import pandas as pd
-from scipy import signal
+from scipy import fft, signal
 from libquantum import utils
+import redpandas.redpd_filter as rpd_filter
+import redpandas.redpd_parallel as rpd_par
 import redpandas.redpd_plot.coherence as rpd_plt
 
 
+def welch_segments_fft(sig_wf: np.ndarray,
+                       window_points: int,
+                       window_overlap_points: int) -> np.ndarray:
+    """
+    Real FFTs of the segments averaged by Welch's method, with the scipy.signal.welch defaults:
+    periodic Hann window, constant (mean) detrend per segment, no padding
+
+    :param sig_wf: signal waveform
+    :param window_points: number of points per segment
+    :param window_overlap_points: number of points to overlap between segments
+    :return: numpy array (number of segments, window_points // 2 + 1) with the segment FFTs
+    """
+    window = signal.get_window('hann', window_points)
+    step = window_points - window_overlap_points
+    segments = np.lib.stride_tricks.sliding_window_view(np.asarray(sig_wf, dtype=float), window_points)[::step]
+    segments = segments - np.mean(segments, axis=-1, keepdims=True)
+    return fft.rfft(segments * window, axis=-1)
+
+
+def spectral_density_from_segments(segments_fft_x: np.ndarray,
+                                   segments_fft_y: np.ndarray,
+                                   sample_rate_hz: float,
+                                   window_points: int) -> np.ndarray:
+    """
+    One-sided cross spectral density of x and y from their Welch segment FFTs, same scaling as scipy.signal.csd.
+    With y = x it is the auto spectral density of scipy.signal.welch (take the real part)
+
+    :param segments_fft_x: segment FFTs of x, from welch_segments_fft
+    :param segments_fft_y: segment FFTs of y, from welch_segments_fft
+    :param sample_rate_hz: sample rate in Hz used for the density scaling
+    :param window_points: number of points per segment
+    :return: numpy array with cross spectral density
+    """
+    window = signal.get_window('hann', window_points)
+    spectral_density = np.mean(np.conj(segments_fft_x) * segments_fft_y, axis=0) \
+        / (sample_rate_hz * np.sum(window**2))
+    # Fold negative frequencies, DC and Nyquist appear once
+    if window_points % 2:
+        spectral_density[1:] *= 2
+    else:
+        spectral_density[1:-1] *= 2
+    return spectral_density
+
+
+def _coherence_spectra_scipy(sig_n: np.ndarray,
+                             sig_m: np.ndarray,
+                             sig_sample_rate_hz: float,
+                             ref_sample_rate_hz: float,
+                             window_points: int,
+                             window_overlap_points: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray,
+                                                                  np.ndarray, np.ndarray]:
+    """
+    Auto spectra, cross spectrum and coherence of a signal and the reference with scipy.signal
+
+    :param sig_n: signal waveform
+    :param sig_m: reference signal waveform
+    :param sig_sample_rate_hz: sample rate of signal in Hz
+    :param ref_sample_rate_hz: sample rate of reference signal in Hz
+    :param window_points: number of points per segment
+    :param window_overlap_points: number of points to overlap between segments
+    :return: signal auto spectrum, reference auto spectrum, cross spectrum, coherence frequency and coherence
+    """
+    _, auto_spectrum_sig = signal.welch(x=sig_n,
+                                        fs=sig_sample_rate_hz,
+                                        nperseg=window_points,
+                                        noverlap=window_overlap_points)
+    _, auto_spectrum_ref = signal.welch(x=sig_m,
+                                        fs=ref_sample_rate_hz,
+                                        nperseg=window_points,
+                                        noverlap=window_overlap_points)
+
+    # Compute cross-power spectral density with ref sample rate
+    _, cross_spectrum = signal.csd(x=sig_n,
+                                   y=sig_m,
+                                   fs=ref_sample_rate_hz,
+                                   nperseg=window_points,
+                                   noverlap=window_overlap_points)
+
+    # Coherence, same as coherence from PSD
+    frequency_coherence, coherence_welch = signal.coherence(x=sig_n,
+                                                            y=sig_m,
+                                                            fs=ref_sample_rate_hz,
+                                                            nperseg=window_points,
+                                                            noverlap=window_overlap_points)
+    return auto_spectrum_sig, auto_spectrum_ref, cross_spectrum, frequency_coherence, coherence_welch
+
+
+def _coherence_spectra_from_segments(segments_fft_n: np.ndarray,
+                                     segments_fft_m: np.ndarray,
+                                     sig_sample_rate_hz: float,
+                                     ref_sample_rate_hz: float,
+                                     window_points: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray,
+                                                                  np.ndarray, np.ndarray]:
+    """
+    Auto spectra, cross spectrum and coherence of a signal and the reference from their cached Welch segment FFTs,
+    same results as _coherence_spectra_scipy for signals of equal length
+
+    :param segments_fft_n: signal segment FFTs
+    :param segments_fft_m: reference signal segment FFTs
+    :param sig_sample_rate_hz: sample rate of signal in Hz
+    :param ref_sample_rate_hz: sample rate of reference signal in Hz
+    :param window_points: number of points per segment
+    :return: signal auto spectrum, reference auto spectrum, cross spectrum, coherence frequency and coherence
+    """
+    auto_spectrum_sig_ref_rate = \
+        spectral_density_from_segments(segments_fft_n, segments_fft_n, ref_sample_rate_hz, window_points).real
+    auto_spectrum_sig = auto_spectrum_sig_ref_rate * ref_sample_rate_hz / sig_sample_rate_hz
+    auto_spectrum_ref = \
+        spectral_density_from_segments(segments_fft_m, segments_fft_m, ref_sample_rate_hz, window_points).real
+    cross_spectrum = spectral_density_from_segments(segments_fft_n, segments_fft_m, ref_sample_rate_hz, window_points)
+
+    frequency_coherence = fft.rfftfreq(window_points, 1/ref_sample_rate_hz)
+    coherence_welch = np.abs(cross_spectrum)**2 / auto_spectrum_sig_ref_rate / auto_spectrum_ref
+    return auto_spectrum_sig, auto_spectrum_ref, cross_spectrum, frequency_coherence, coherence_welch
+
+
 def coherence_numpy(sig_in: np.ndarray,
                     sig_in_ref: np.ndarray,
                     sig_sample_rate_hz: int,
@@ -150,7 +271,10 @@ def coherence_re_ref_pandas(df: pd.DataFrame,
                             new_column_label_cohere_frequency: str = 'coherence_frequency',
                             new_column_label_cohere_value: str = 'coherence_value',
                             new_column_label_cohere_response_magnitude_bits: str = 'coherence_response_magnitude_bits',
-                            new_column_label_cohere_response_phase_degrees: str = 'coherence_response_phase_degrees'
+                            new_column_label_cohere_response_phase_degrees: str = 'coherence_response_phase_degrees',
+                            engine: str = 'fft',
+                            n_workers: Optional[int] = None,
+                            common_sample_rate_hz: Optional[Union[str, float]] = None
                             ) -> pd.DataFrame:
     """
     Find coherence between signals stored in dataframe, plot results
@@ -174,8 +298,25 @@ def coherence_re_ref_pandas(df: pd.DataFrame,
     :param new_column_label_cohere_value: string for new column containing coherence values
     :param new_column_label_cohere_response_magnitude_bits: string for new column containing coherence response in bits
     :param new_column_label_cohere_response_phase_degrees: string for new column containing coherence phase in degrees
+    :param engine: 'fft' computes the Welch segment FFTs of every station once and derives the auto spectra, cross
+        spectrum, coherence and response from them; 'scipy' calls scipy.signal welch, csd and coherence per station.
+        Stations with a different number of points than the reference always use 'scipy'. Default is 'fft'
+    :param n_workers: number of processes to compute the station segment FFTs with the 'fft' engine.
+        Default is None (serial)
+    :param common_sample_rate_hz: optional common sample rate in Hz, or 'Min' for the minimum sample rate in df.
+        Signals are resampled to it (resample_common_rate_pandas, added as new columns to df and reused by later calls
+        while the signals are unchanged) so every pair is covered. Default is None, no resampling
     :return: input pandas dataframe with new columns
     """
+    if engine not in ['fft', 'scipy']:
+        raise ValueError(f"Unknown coherence engine '{engine}'. Type 'fft' or 'scipy'.")
+
+    if common_sample_rate_hz is not None:
+        df, sig_wf_label, sig_sample_rate_label = \
+            rpd_filter.resample_common_rate_pandas(df=df,
+                                                   sig_wf_label=sig_wf_label,
+                                                   sample_rate_hz_label=sig_sample_rate_label,
+                                                   common_sample_rate_hz=common_sample_rate_hz)
 
     number_sig = len(df.index)
     print("Coherence, number of signals excluding reference:", number_sig-1)
@@ -199,6 +340,30 @@ def coherence_re_ref_pandas(df: pd.DataFrame,
         print("Coherence Reference station ", df[sig_id_label][m])
         sig_m = np.copy(df[sig_wf_label][m]) * sig_ref_calib
 
+        # Same segments for all stations, set by the reference sample rate
+        window_points = int(window_seconds * df[sig_sample_rate_label][m])
+        window_overlap_points = int(window_overlap_fractional*window_points)
+
+        # Cache the segment FFTs of the reference and of the stations with the same number of points
+        segments_fft = {}
+        if engine == 'fft' and window_points <= len(sig_m):
+            n_cached = [n for n in df.index if len(df[sig_wf_label][n]) == len(sig_m) and n != m and
+                        np.abs(df[sig_sample_rate_label][m] - df[sig_sample_rate_label][n])
+                        <= fs_fractional_tolerance*df[sig_sample_rate_label][m]]
+            segments_fft_list = rpd_par.parallel_map(partial(welch_segments_fft,
+                                                             window_points=window_points,
+                                                             window_overlap_points=window_overlap_points),
+                                                     [sig_m] + [np.copy(df[sig_wf_label][n]) * sig_calib
+                                                                for n in n_cached],
+                                                     n_workers=n_workers)
+            segments_fft = dict(zip(n_cached, segments_fft_list[1:]))
+            segments_fft_m = segments_fft_list[0]
+            if sig_calib == sig_ref_calib:
+                segments_fft[m] = segments_fft_m
+            else:
+                segments_fft[m] = welch_segments_fft(np.copy(df[sig_wf_label][m]) * sig_calib,
+                                                     window_points, window_overlap_points)
+
         for n in df.index:
             sample_rate_condition = np.abs(df[sig_sample_rate_label][m] - df[sig_sample_rate_label][n]) \
                                     > fs_fractional_tolerance*df[sig_sample_rate_label][m]
@@ -210,36 +375,26 @@ def coherence_re_ref_pandas(df: pd.DataFrame,
                 sig_n = np.copy(df[sig_wf_label][n]) * sig_calib
 
             # Compute PSDs for each and coherence between the two
-            window_points = int(window_seconds * df[sig_sample_rate_label][m])
-            window_overlap_points = int(window_overlap_fractional*window_points)
-
-            frequency_auto, auto_spectrum_sig = signal.welch(x=sig_n,
-                                                             fs=df[sig_sample_rate_label][n],
-                                                             nperseg=window_points,
-                                                             noverlap=window_overlap_points)
-            _, auto_spectrum_ref = signal.welch(x=sig_m,
-                                                fs=df[sig_sample_rate_label][m],
-                                                nperseg=window_points,
-                                                noverlap=window_overlap_points)
-
-            # Compute cross-power spectral density with ref sample rate
-            frequency_cross, cross_spectrum = signal.csd(x=sig_n,
-                                                         y=sig_m,
-                                                         fs=df[sig_sample_rate_label][m],
-                                                         nperseg=window_points,
-                                                         noverlap=window_overlap_points)
+            if n in segments_fft:
+                auto_spectrum_sig, auto_spectrum_ref, cross_spectrum, frequency_coherence, coherence_welch = \
+                    _coherence_spectra_from_segments(segments_fft_n=segments_fft[n],
+                                                     segments_fft_m=segments_fft_m,
+                                                     sig_sample_rate_hz=df[sig_sample_rate_label][n],
+                                                     ref_sample_rate_hz=df[sig_sample_rate_label][m],
+                                                     window_points=window_points)
+            else:
+                auto_spectrum_sig, auto_spectrum_ref, cross_spectrum, frequency_coherence, coherence_welch = \
+                    _coherence_spectra_scipy(sig_n=sig_n,
+                                             sig_m=sig_m,
+                                             sig_sample_rate_hz=df[sig_sample_rate_label][n],
+                                             ref_sample_rate_hz=df[sig_sample_rate_label][m],
+                                             window_points=window_points,
+                                             window_overlap_points=window_overlap_points)
 
             psd_ref_bits = 0.5 * utils.log2epsilon(abs(auto_spectrum_ref))
             psd_sig_bits = 0.5 * utils.log2epsilon(abs(auto_spectrum_sig))
             cross_spectrum_bits = 0.5 * utils.log2epsilon(abs(cross_spectrum))
 
-            # Coherence, same as coherence from PSD
-            frequency_coherence, coherence_welch = signal.coherence(x=sig_n,
-                                                                    y=sig_m,
-                                                                    fs=df[sig_sample_rate_label][m],
-                                                                    nperseg=window_points,
-                                                                    noverlap=window_overlap_points)
-
             # Compute response
             h_complex_response_sig = auto_spectrum_sig / cross_spectrum
 
@@ -116,7 +116,8 @@ class TFRConfig:
                  mesh_color_scale: Optional[Union[Dict[str, str] or str]] = 'range',
                  mesh_color_range: Optional[Union[Dict[str, float] or float]] = 18.,
                  sensor_highpass: Optional[Union[Dict[str, bool] or bool]] = True,
-                 tfr_load_method: Optional[str] = "datawindow"):
+                 tfr_load_method: Optional[str] = "datawindow",
+                 tfr_cache_dir: Optional[str] = None):
         """
         Configuration parameters for skyfall_tfr_rpd
 
@@ -127,11 +128,13 @@ class TFRConfig:
         :param mesh_color_range: float or dictionary of floats, color range for spectrograms
         :param sensor_highpass: boolean or dictionary of booleans, use highpass of data if available
         :param tfr_load_method: optional string, chose loading data method: "datawindow", "pickle", or "parquet"
+        :param tfr_cache_dir: optional string, directory to cache computed TFRs between runs. Default is None
         """
         self.tfr_type = tfr_type
         self.tfr_order_number_N = tfr_order_number_N
         self.show_fig_titles = show_fig_titles
         self.tfr_load_method = DataLoadMethod.method_from_str(tfr_load_method)
+        self.tfr_cache_dir = tfr_cache_dir
         self.sensor_labels = ['Audio', 'Bar', 'Acc', 'Gyr', 'Mag']
         n = len(self.sensor_labels)
 
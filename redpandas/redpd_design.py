@@ -0,0 +1,122 @@
+"""
+Process-wide cache of filter designs and taper windows, shared by redpd_filter and redpd_preprocess.
+Cached arrays are read-only; the cache is bounded (least recently used designs are dropped) and counts hits and misses.
+"""
+
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+from scipy import signal
+
+DESIGN_CACHE_SIZE: int = 256
+
+
+@lru_cache(maxsize=DESIGN_CACHE_SIZE)
+def _butter_design(filter_order: int,
+                   edges: Union[float, Tuple[float, ...]],
+                   btype: str,
+                   output: str,
+                   sample_rate_hz: Optional[float]) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    design = signal.butter(N=filter_order, Wn=edges, btype=btype, output=output, fs=sample_rate_hz)
+    if output == 'ba':
+        b, a = design
+        b.setflags(write=False)
+        a.setflags(write=False)
+        return b, a
+    design.setflags(write=False)
+    return design
+
+
+@lru_cache(maxsize=DESIGN_CACHE_SIZE)
+def _tukey_window(number_points: int,
+                  alpha: float,
+                  sym: bool) -> np.ndarray:
+    window = signal.windows.tukey(M=number_points, alpha=alpha, sym=sym)
+    window.setflags(write=False)
+    return window
+
+
+@lru_cache(maxsize=DESIGN_CACHE_SIZE)
+def _resample_poly_filter(up: int,
+                          down: int,
+                          window: Union[str, Tuple]) -> np.ndarray:
+    # Same design as scipy.signal.resample_poly for a window name
+    max_rate = max(up, down)
+    fir_filter = signal.firwin(2 * 10 * max_rate + 1, 1. / max_rate, window=window)
+    fir_filter.setflags(write=False)
+    return fir_filter
+
+
+def butter_design(filter_order: int,
+                  edges: Union[float, Tuple[float, ...], np.ndarray],
+                  btype: str,
+                  output: str = 'sos',
+                  sample_rate_hz: Optional[float] = None) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Butterworth filter design, cached by (order, edges, type, output, sample rate)
+
+    :param filter_order: filter order
+    :param edges: corner frequency or [low, high] corner frequencies. In Hz if sample_rate_hz is given,
+        otherwise scaled by Nyquist (1 = Nyquist)
+    :param btype: 'bandpass', 'lowpass', 'highpass', 'high', ...; as in scipy.signal.butter
+    :param output: 'sos' or 'ba'. Default is 'sos'
+    :param sample_rate_hz: optional sample rate in Hz. Default is None, edges scaled by Nyquist
+    :return: second-order sections (a copy, scipy's sosfilt needs a writable array),
+        or read-only numerator b and denominator a
+    """
+    edges = tuple(float(edge) for edge in np.atleast_1d(edges))
+    design = _butter_design(int(filter_order), edges[0] if len(edges) == 1 else edges, btype, output,
+                            None if sample_rate_hz is None else float(sample_rate_hz))
+    if output == 'sos':
+        return np.array(design)
+    return design
+
+
+def tukey_window(number_points: int,
+                 alpha: float,
+                 sym: bool = True) -> np.ndarray:
+    """
+    Tukey taper window, cached by (number of points, alpha, sym)
+
+    :param number_points: number of points in the window
+    :param alpha: fraction of the window inside the cosine tapered window. 0 is rectangular, 1 is Hann
+    :param sym: symmetric window if True, periodic otherwise. Default is True
+    :return: read-only tukey window
+    """
+    return _tukey_window(int(number_points), float(alpha), bool(sym))
+
+
+def resample_poly_filter(up: int,
+                         down: int,
+                         window: Union[str, Tuple] = ('kaiser', 5.0)) -> np.ndarray:
+    """
+    Anti-alias FIR lowpass used by scipy.signal.resample_poly, cached by (up, down, window).
+    Pass it as the window of resample_poly, with up and down without common factors.
+
+    :param up: upsampling factor
+    :param down: downsampling factor
+    :param window: window name or tuple for scipy.signal.firwin. Default is ('kaiser', 5.0), as resample_poly
+    :return: read-only FIR filter coefficients
+    """
+    return _resample_poly_filter(int(up), int(down), window)
+
+
+def design_cache_info() -> Dict[str, tuple]:
+    """
+    :return: dictionary with 'butter', 'tukey' and 'resample_poly' cache statistics (hits, misses, maxsize, currsize)
+    """
+    return {'butter': _butter_design.cache_info(),
+            'tukey': _tukey_window.cache_info(),
+            'resample_poly': _resample_poly_filter.cache_info()}
+
+
+def clear_design_cache() -> None:
+    """
+    Empty the filter design, taper window and resampling filter caches and reset their statistics
+
+    :return: None
+    """
+    _butter_design.cache_clear()
+    _tukey_window.cache_clear()
+    _resample_poly_filter.cache_clear()
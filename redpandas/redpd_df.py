@@ -4,10 +4,14 @@ Pipeline from RedVox DataWindow to pandas DataFrame parquet.
 
 # Python libraries
 import os
-from typing import List, Optional, Union, Tuple
+from functools import partial
+from typing import Dict, List, Optional, Union, Tuple
+from urllib.parse import quote, unquote
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import matplotlib.pyplot as plt
 
 # RedVox and Red Pandas modules
@@ -16,6 +20,9 @@ from redvox.common.data_window import DataWindow
 import redpandas.redpd_datawin as rpd_dw
 import redpandas.redpd_dq as rpd_dq
 import redpandas.redpd_build_station as rpd_build_sta
+import redpandas.redpd_parallel as rpd_par
+import redpandas.redpd_preprocess as rpd_prep
+import redpandas.redpd_store as rpd_store
 from redpandas.redpd_config import RedpdConfig
 import redpandas.redpd_scales as rpd_scales
 import redvox.common.date_time_utils as dt_utils
@@ -69,7 +76,9 @@ def redpd_dataframe(input_dw: DataWindow,
                     sensor_labels: Optional[List[str]] = ["audio"],
                     highpass_type: Optional[str] = 'obspy',
                     frequency_filter_low: Optional[float] = 1./rpd_scales.Slice.T100S,
-                    filter_order: Optional[int] = 4) -> pd.DataFrame:
+                    filter_order: Optional[int] = 4,
+                    n_workers: Optional[int] = None,
+                    executor_type: Optional[str] = 'process') -> pd.DataFrame:
     """
     Construct pandas dataframe from RedVox DataWindow. Default sensor extracted is audio, for more options see sensor_labels parameter.
 
@@ -80,8 +89,12 @@ def redpd_dataframe(input_dw: DataWindow,
     :param highpass_type: optional string, type of highpass applied. One of: 'obspy', 'butter', or 'rc'. Default is 'obspy'
     :param frequency_filter_low: optional float, lowest frequency for highpass filter. Default is 100 second periods
     :param filter_order: optional integer, the order of the filter. Default is 4
+    :param n_workers: optional integer, number of workers building stations concurrently. Default is None (one station
+        at a time)
+    :param executor_type: optional string, pool used when n_workers is set. One of: 'process' or 'thread'.
+        Default is 'process'
 
-    :return: pd.DataFrame
+    :return: pd.DataFrame, empty if the DataWindow has no stations. Raises ValueError if every station fails
     """
     print("Initiating conversion from RedVox DataWindow to RedPandas:")
     rdvx_data: DataWindow = input_dw
@@ -91,13 +104,35 @@ def redpd_dataframe(input_dw: DataWindow,
 
     # BEGIN RED PANDAS
     print("\nInitiating RedVox Redpandas:")
-    df_all_sensors_all_stations = pd.DataFrame([rpd_build_sta.station_to_dict_from_dw(station=station,
-                                                                                      sdk_version=rdvx_data.sdk_version(),
-                                                                                      sensor_labels=sensor_labels,
-                                                                                      highpass_type=highpass_type,
-                                                                                      frequency_filter_low=frequency_filter_low,
-                                                                                      filter_order=filter_order)
-                                                for station in rdvx_data.stations()])
+    stations = rdvx_data.stations()
+    if len(stations) == 0:
+        print("\nNo stations in DataWindow, returning an empty DataFrame")
+        return pd.DataFrame()
+
+    list_station_dicts = rpd_par.parallel_map(partial(rpd_build_sta.station_to_dict_from_dw,
+                                                      sdk_version=rdvx_data.sdk_version(),
+                                                      sensor_labels=sensor_labels,
+                                                      highpass_type=highpass_type,
+                                                      frequency_filter_low=frequency_filter_low,
+                                                      filter_order=filter_order),
+                                              stations,
+                                              n_workers=n_workers,
+                                              executor_type=executor_type,
+                                              return_exceptions=True)
+
+    # Report stations that could not be built, keep the rest
+    list_failed_station_ids = []
+    for station, station_dict in zip(stations, list_station_dicts):
+        if isinstance(station_dict, Exception):
+            print(f"\nStation {station.id()} failed and was skipped: {station_dict!r}")
+            list_failed_station_ids.append(station.id())
+    if len(list_failed_station_ids) > 0:
+        print(f"\nTotal stations failed: {len(list_failed_station_ids)} {list_failed_station_ids}")
+    if len(list_failed_station_ids) == len(stations):
+        raise ValueError(f"All stations failed, no RedPandas DataFrame to build: {list_failed_station_ids}")
+
+    df_all_sensors_all_stations = pd.DataFrame([station_dict for station_dict in list_station_dicts
+                                                if not isinstance(station_dict, Exception)])
     df_all_sensors_all_stations.sort_values(by="station_id", ignore_index=True, inplace=True)
 
     # Offer glimpse of what the DataFrame contains
@@ -245,3 +280,425 @@ def export_df_to_parquet(df: pd.DataFrame,
 
     return full_output_dir_path_parquet
 
+
+# Field metadata keys marking multidimensional columns in Arrow parquet exports
+ARROW_LAYOUT_KEY: bytes = b"redpandas_layout"
+ARROW_NDIM_KEY: bytes = b"redpandas_ndim"
+
+
+def _ndarray_column_ndim(column_values: np.ndarray) -> int:
+    """
+    :param column_values: values of a DataFrame column
+    :return: number of dimensions of the array cells if all of them have the same ndim >= 2, 0 for 1D/scalar columns
+             and -1 for mixed dimensions
+    """
+    ndims = {cell.ndim for cell in column_values if rpd_store.is_waveform(cell)}
+    if len(ndims) == 0 or max(ndims) < 2:
+        return 0
+    if len(ndims) > 1 or np.any([np.iscomplexobj(cell) for cell in column_values if rpd_store.is_waveform(cell)]):
+        return -1
+    return ndims.pop()
+
+
+def _ndarray_column_to_arrow(column_values: np.ndarray,
+                             ndim: int) -> pa.Array:
+    """
+    Convert a column of multidimensional arrays to Arrow. Columns where every cell has the same shape are stored as
+    a FixedShapeTensor (one contiguous buffer), otherwise as nested lists with one level per dimension, large lists
+    (64-bit offsets) for levels with more than 2**31 - 1 elements. Missing cells (not arrays, e.g. NaN for a station
+    without the sensor) are stored as nulls
+
+    :param column_values: values of a DataFrame column, multidimensional arrays or missing values
+    :param ndim: number of dimensions of the array cells
+    :return: Arrow array
+    """
+    is_array = np.array([rpd_store.is_waveform(cell) for cell in column_values], dtype=bool)
+    cells = [cell for cell in column_values if rpd_store.is_waveform(cell)]
+    dtype = np.result_type(*[cell.dtype for cell in cells])
+    shapes = np.array([cell.shape for cell in cells], dtype=np.int64).reshape((len(cells), ndim))
+
+    if np.all(is_array) and np.all(shapes == shapes[0]):
+        return pa.FixedShapeTensorArray.from_numpy_ndarray(np.stack(cells).astype(dtype, copy=False))
+
+    # Shapes of all rows, missing rows are empty
+    shapes_all = np.zeros((len(column_values), ndim), dtype=np.int64)
+    shapes_all[is_array] = shapes
+    values = pa.array(np.concatenate([np.ravel(cell) for cell in cells]).astype(dtype, copy=False)) \
+        if len(cells) > 0 else pa.array([], type=pa.from_numpy_dtype(dtype))
+    # Build the list levels from the innermost out. Level k has prod(shape[:k]) lists of length shape[k] per row
+    nested = values
+    for level in reversed(range(ndim)):
+        lists_per_row = np.prod(shapes_all[:, :level], axis=1, dtype=np.int64)
+        list_lengths = np.repeat(shapes_all[:, level], lists_per_row)
+        offsets = np.concatenate(([0], np.cumsum(list_lengths, dtype=np.int64)))
+        mask = None if level > 0 else pa.array(~is_array)
+        if offsets[-1] > np.iinfo(np.int32).max:
+            # More than 2**31 elements in the column, e.g. long TFRs, need 64-bit offsets
+            nested = pa.LargeListArray.from_arrays(pa.array(offsets, type=pa.int64()), nested, mask=mask)
+        else:
+            nested = pa.ListArray.from_arrays(pa.array(offsets.astype(np.int32)), nested, mask=mask)
+    return nested
+
+
+def _fixed_shape_tensor_to_cells(chunk: pa.ExtensionArray,
+                                 zero_copy: bool = True) -> List[np.ndarray]:
+    """
+    :param chunk: FixedShapeTensor array
+    :param zero_copy: return read-only views of the Arrow buffer if True, writable copies otherwise. Default is True
+    :return: list with one array per row, NaN for null rows
+    """
+    if chunk.null_count > 0:
+        is_valid = chunk.is_valid().to_numpy(zero_copy_only=False)
+        cells_valid = iter(_fixed_shape_tensor_to_cells(chunk.filter(chunk.is_valid()), zero_copy=zero_copy))
+        return [next(cells_valid) if valid else float("NaN") for valid in is_valid]
+    tensor = chunk.to_numpy_ndarray()
+    if not zero_copy:
+        tensor = np.array(tensor)
+    return list(tensor)
+
+
+def _nested_list_to_cells(chunk: Union[pa.ListArray, pa.LargeListArray],
+                          ndim: int,
+                          zero_copy: bool = True) -> List[np.ndarray]:
+    """
+    :param chunk: nested list array with ndim list levels, lists or large lists
+    :param ndim: number of dimensions of the array cells
+    :param zero_copy: return read-only views of the Arrow buffer if True, writable copies otherwise. Default is True
+    :return: list with one array per row, NaN for null rows
+    """
+    is_valid = chunk.is_valid().to_numpy(zero_copy_only=False)
+    shapes = np.zeros((len(chunk), ndim), dtype=np.int64)
+    # Index of the first element of each row at the current level
+    starts = np.arange(len(chunk))
+    level = chunk
+    for dimension in range(ndim):
+        offsets = level.offsets.to_numpy()
+        list_lengths = np.diff(offsets)
+        has_lists = starts < len(list_lengths)
+        shapes[has_lists, dimension] = list_lengths[starts[has_lists]]
+        starts = offsets[np.minimum(starts, len(list_lengths))]
+        level = level.values
+    values = level.to_numpy(zero_copy_only=False, writable=not zero_copy)
+    stops = starts + np.prod(shapes, axis=1)
+    return [values[start:stop].reshape(shape) if valid else float("NaN")
+            for start, stop, shape, valid in zip(starts, stops, shapes, is_valid)]
+
+
+def df_to_arrow_table(df: pd.DataFrame,
+                      preserve_index: Optional[bool] = None) -> pa.Table:
+    """
+    Convert a RedPandas DataFrame to an Arrow table, multidimensional columns are stored as FixedShapeTensor or nested
+    lists. Columns with cells of different dimensions are flattened with '_ndim' columns as in export_df_to_parquet.
+
+    :param df: input pandas DataFrame
+    :param preserve_index: store the index, see pyarrow.Table.from_pandas. Default is None
+    :return: Arrow table
+    """
+    ndarray_columns = {}
+    df_flat = df.copy()
+    for column in df.columns:
+        ndim = _ndarray_column_ndim(df[column].to_numpy())
+        if ndim > 0:
+            ndarray_columns[column] = ndim
+        elif ndim == 0 and any(isinstance(cell, rpd_store.WaveformHandle) for cell in df[column]):
+            df_flat[column] = pd.Series([np.asarray(cell) if isinstance(cell, rpd_store.WaveformHandle) else cell
+                                         for cell in df[column]], index=df.index, dtype=object)
+        elif ndim < 0:
+            df_flat[f'{column}_ndim'] = [np.asarray(np.shape(cell)) for cell in df[column]]
+            df_flat[column] = [np.ravel(cell) for cell in df[column]]
+
+    table = pa.Table.from_pandas(df_flat.drop(columns=list(ndarray_columns)), preserve_index=preserve_index)
+    for column, ndim in ndarray_columns.items():
+        arrow_column = _ndarray_column_to_arrow(df[column].to_numpy(), ndim=ndim)
+        layout = b"tensor" if isinstance(arrow_column.type, pa.FixedShapeTensorType) else b"nested"
+        field = pa.field(column, arrow_column.type, metadata={ARROW_LAYOUT_KEY: layout,
+                                                              ARROW_NDIM_KEY: str(ndim).encode()})
+        if table.num_columns == 0:
+            # Table without columns has no rows, start from the first array column
+            table = pa.Table.from_arrays([arrow_column], schema=pa.schema([field], metadata=table.schema.metadata))
+        else:
+            table = table.add_column(list(df_flat.columns).index(column), field, arrow_column)
+    return table
+
+
+def export_df_to_parquet_arrow(df: pd.DataFrame,
+                               output_dir_pqt: str,
+                               output_filename_pqt: Optional[str] = None,
+                               event_name: Optional[str] = "Redvox") -> str:
+    """
+    Export RedPandas DataFrame to parquet keeping the shape of multidimensional arrays (3c sensors, TFRs) in Arrow
+    columns, without the '_ndim' shape columns. Columns where every row has the same shape are stored as
+    FixedShapeTensor, other multidimensional columns as nested lists. Load with read_df_from_parquet.
+    Columns with cells of different dimensions are flattened with '_ndim' columns as in export_df_to_parquet.
+
+    :param df: input pandas DataFrame. REQUIRED
+    :param output_dir_pqt: string, output directory for parquet. REQUIRED
+    :param output_filename_pqt: optional string for parquet filename. Default is None
+    :param event_name: optional string with name of event. Default is "Redvox"
+
+    :return: string with full path (output directory and filename) of parquet
+    """
+    table = df_to_arrow_table(df)
+
+    # Make filename if non given
+    if output_filename_pqt is None:
+        output_filename_pqt: str = event_name + "_df.parquet"
+
+    if output_filename_pqt.find(".parquet") == -1 and output_filename_pqt.find(".pqt") == -1:
+        full_output_dir_path_parquet = os.path.join(output_dir_pqt, output_filename_pqt + ".parquet")
+    else:
+        full_output_dir_path_parquet = os.path.join(output_dir_pqt, output_filename_pqt)
+
+    pq.write_table(table, full_output_dir_path_parquet)
+    print(f"\nExported Parquet RedPandas DataFrame to {full_output_dir_path_parquet}")
+
+    return full_output_dir_path_parquet
+
+
+def df_from_arrow_table(table: pa.Table,
+                        zero_copy: bool = True) -> pd.DataFrame:
+    """
+    Convert an Arrow table read from a RedPandas parquet to a RedPandas DataFrame. Multidimensional columns written by
+    export_df_to_parquet_arrow are restored as arrays, flattened columns with '_ndim' shape columns (written by
+    export_df_to_parquet) are reshaped and the '_ndim' columns are kept as in a legacy load.
+
+    :param table: Arrow table
+    :param zero_copy: multidimensional cells are read-only views of the Arrow buffers if True, writable copies
+        otherwise. Default is True
+    :return: pandas DataFrame
+    """
+    ndarray_fields = [field for field in table.schema
+                      if field.metadata is not None and ARROW_LAYOUT_KEY in field.metadata]
+    ndarray_names = [field.name for field in ndarray_fields]
+    df = table.select([name for name in table.column_names if name not in ndarray_names]).to_pandas()
+
+    for field in ndarray_fields:
+        ndim = int(field.metadata[ARROW_NDIM_KEY])
+        cells = []
+        for chunk in table.column(field.name).chunks:
+            if isinstance(field.type, pa.FixedShapeTensorType):
+                cells += _fixed_shape_tensor_to_cells(chunk, zero_copy=zero_copy)
+            else:
+                cells += _nested_list_to_cells(chunk, ndim=ndim, zero_copy=zero_copy)
+        df.insert(table.column_names.index(field.name), field.name, pd.Series(cells, index=df.index, dtype=object))
+
+    if len(df.filter(like='_ndim', axis=1).columns) > 0:
+        rpd_prep.df_unflatten(df)
+    return df
+
+
+def read_df_from_parquet(path_parquet: str,
+                         columns: Optional[List[str]] = None,
+                         station_ids: Optional[List[str]] = None,
+                         station_id_label: str = "station_id",
+                         zero_copy: bool = True) -> pd.DataFrame:
+    """
+    Load a RedPandas DataFrame from a parquet written by export_df_to_parquet_arrow or export_df_to_parquet.
+    Only the selected columns and stations are read from the file; the '_ndim' shape columns of the selected columns
+    are loaded with them and used to restore the shape of multidimensional arrays.
+
+    :param path_parquet: path of the parquet file. REQUIRED
+    :param columns: optional list of column labels to load. Default is None, load all columns
+    :param station_ids: optional list of station ids to load. Default is None, load all stations
+    :param station_id_label: column label with the station ids, used with station_ids. Default is "station_id"
+    :param zero_copy: multidimensional cells are read-only views of the Arrow buffers if True, writable copies
+        otherwise. Default is True
+    :return: pandas DataFrame. A default index is renumbered when stations are selected
+    """
+    if columns is not None:
+        schema_names = pq.read_schema(path_parquet).names
+        columns_ndim = [f'{column}_ndim' for column in columns if f'{column}_ndim' in schema_names]
+        columns = list(columns) + [column for column in columns_ndim if column not in columns]
+    filters = None if station_ids is None else [(station_id_label, "in", [str(station) for station in station_ids])]
+
+    table = pq.read_table(path_parquet, columns=columns, filters=filters, use_pandas_metadata=True)
+    return df_from_arrow_table(table, zero_copy=zero_copy)
+
+
+# Sensor partitions of a RedPandas parquet dataset, columns are assigned by prefix. Longer prefixes first
+DATASET_SENSOR_LABELS: List[str] = ['best_location', 'location', 'audio', 'barometer', 'accelerometer', 'gyroscope',
+                                    'magnetometer', 'health', 'image', 'light', 'synchronization', 'clock']
+DATASET_STATION_SENSOR: str = "station"
+DATASET_PART_FILENAME: str = "part-0.parquet"
+
+
+def dataset_sensor_columns(df: pd.DataFrame,
+                           station_id_label: str = "station_id") -> Dict[str, List[str]]:
+    """
+    Assign the columns of a RedPandas DataFrame to sensor partitions by their sensor prefix ('audio_wf' to 'audio').
+    Columns without a sensor prefix (station metadata, derived products) go to the 'station' partition.
+
+    :param df: input pandas DataFrame
+    :param station_id_label: column label with the station ids, not assigned to a partition. Default is "station_id"
+    :return: dictionary with sensor label: list of column labels
+    """
+    sensor_columns = {}
+    for column in df.columns:
+        if column == station_id_label:
+            continue
+        sensor = next((label for label in DATASET_SENSOR_LABELS if column.startswith(f'{label}_')),
+                      DATASET_STATION_SENSOR)
+        sensor_columns.setdefault(sensor, []).append(column)
+    return sensor_columns
+
+
+def _is_missing_cell(cell) -> bool:
+    """
+    :param cell: DataFrame cell
+    :return: True if cell is a missing scalar (None or NaN)
+    """
+    return not (rpd_store.is_waveform(cell) or isinstance(cell, (list, str))) and bool(pd.isna(cell))
+
+
+def _write_parquet_dataset(df: pd.DataFrame,
+                           dataset_dir: str,
+                           sensor_columns: Optional[Dict[str, List[str]]],
+                           station_id_label: str,
+                           skip_existing: bool) -> List[str]:
+    """
+    Write one parquet file per station and sensor in dataset_dir/station_id=<id>/sensor=<label>/.
+    Sensors with only missing values for a station are not written.
+
+    :param df: input pandas DataFrame
+    :param dataset_dir: dataset directory
+    :param sensor_columns: dictionary with sensor label: list of column labels, default from dataset_sensor_columns
+    :param station_id_label: column label with the station ids
+    :param skip_existing: leave existing partitions untouched if True, overwrite them otherwise
+    :return: list of paths of the files written
+    """
+    if sensor_columns is None:
+        sensor_columns = dataset_sensor_columns(df, station_id_label=station_id_label)
+
+    paths_written = []
+    for row in range(len(df)):
+        station_id = str(df[station_id_label].iloc[row])
+        for sensor, columns in sensor_columns.items():
+            df_partition = df[columns].iloc[[row]].reset_index(drop=True)
+            if all(_is_missing_cell(cell) for cell in df_partition.iloc[0]):
+                continue
+            partition_dir = os.path.join(dataset_dir, f"station_id={quote(station_id, safe='')}",
+                                         f"sensor={quote(sensor, safe='')}")
+            path_partition = os.path.join(partition_dir, DATASET_PART_FILENAME)
+            if skip_existing and os.path.exists(path_partition):
+                print(f"Partition {partition_dir} exists, skipping")
+                continue
+            os.makedirs(partition_dir, exist_ok=True)
+            pq.write_table(df_to_arrow_table(df_partition, preserve_index=False), path_partition)
+            paths_written.append(path_partition)
+    return paths_written
+
+
+def export_df_to_parquet_dataset(df: pd.DataFrame,
+                                 output_dir_pqt: str,
+                                 event_name: Optional[str] = "Redvox",
+                                 sensor_columns: Optional[Dict[str, List[str]]] = None,
+                                 station_id_label: str = "station_id") -> str:
+    """
+    Export RedPandas DataFrame to a hive-partitioned parquet dataset with one file per station and sensor:
+    <output_dir_pqt>/<event_name>_df/station_id=<id>/sensor=<label>/part-0.parquet.
+    Multidimensional arrays are stored as in export_df_to_parquet_arrow. Load with read_df_from_parquet_dataset.
+
+    :param df: input pandas DataFrame. REQUIRED
+    :param output_dir_pqt: string, output directory for the dataset. REQUIRED
+    :param event_name: optional string with name of event. Default is "Redvox"
+    :param sensor_columns: optional dictionary with sensor label: list of column labels. Default is None, assign the
+        columns by sensor prefix with dataset_sensor_columns
+    :param station_id_label: column label with the station ids. Default is "station_id"
+
+    :return: string with full path of the dataset directory
+    """
+    full_output_dir_path_dataset = os.path.join(output_dir_pqt, event_name + "_df")
+    paths_written = _write_parquet_dataset(df=df, dataset_dir=full_output_dir_path_dataset,
+                                           sensor_columns=sensor_columns, station_id_label=station_id_label,
+                                           skip_existing=False)
+    print(f"\nExported {len(paths_written)} Parquet RedPandas partitions to {full_output_dir_path_dataset}")
+
+    return full_output_dir_path_dataset
+
+
+def append_df_to_parquet_dataset(df: pd.DataFrame,
+                                 dataset_dir: str,
+                                 sensor_columns: Optional[Dict[str, List[str]]] = None,
+                                 station_id_label: str = "station_id") -> List[str]:
+    """
+    Add new stations or sensors to a parquet dataset written by export_df_to_parquet_dataset.
+    Existing partitions are not rewritten.
+
+    :param df: input pandas DataFrame with the new stations and/or sensors. REQUIRED
+    :param dataset_dir: string, dataset directory. REQUIRED
+    :param sensor_columns: optional dictionary with sensor label: list of column labels. Default is None, assign the
+        columns by sensor prefix with dataset_sensor_columns
+    :param station_id_label: column label with the station ids. Default is "station_id"
+
+    :return: list of paths of the partition files added
+    """
+    paths_written = _write_parquet_dataset(df=df, dataset_dir=dataset_dir, sensor_columns=sensor_columns,
+                                           station_id_label=station_id_label, skip_existing=True)
+    print(f"\nAdded {len(paths_written)} Parquet RedPandas partitions to {dataset_dir}")
+
+    return paths_written
+
+
+def _hive_partitions(directory: str,
+                     key: str) -> Dict[str, str]:
+    """
+    :param directory: directory with hive partitions
+    :param key: partition key
+    :return: dictionary with partition value: partition directory, sorted by value
+    """
+    partitions = {}
+    if os.path.isdir(directory):
+        for entry in sorted(os.listdir(directory)):
+            if entry.startswith(f"{key}=") and os.path.isdir(os.path.join(directory, entry)):
+                partitions[unquote(entry[len(key) + 1:])] = os.path.join(directory, entry)
+    return partitions
+
+
+def read_df_from_parquet_dataset(dataset_dir: str,
+                                 columns: Optional[List[str]] = None,
+                                 station_ids: Optional[List[str]] = None,
+                                 sensors: Optional[List[str]] = None,
+                                 station_id_label: str = "station_id",
+                                 zero_copy: bool = True) -> pd.DataFrame:
+    """
+    Load a RedPandas DataFrame from a parquet dataset written by export_df_to_parquet_dataset.
+    Only the partitions of the selected stations and sensors that have selected columns are read.
+
+    :param dataset_dir: string, dataset directory. REQUIRED
+    :param columns: optional list of column labels to load. Default is None, load all columns
+    :param station_ids: optional list of station ids to load. Default is None, load all stations
+    :param sensors: optional list of sensor partitions to load, e.g. ['audio', 'station']. Default is None, load all
+    :param station_id_label: column label for the station ids. Default is "station_id"
+    :param zero_copy: multidimensional cells are read-only views of the Arrow buffers if True, writable copies
+        otherwise. Default is True
+    :return: pandas DataFrame with one row per station, ordered by station id. Sensors missing for a station are NaN
+    """
+    station_partitions = _hive_partitions(dataset_dir, key="station_id")
+    if station_ids is not None:
+        station_ids = [str(station) for station in station_ids]
+        station_partitions = {station: path for station, path in station_partitions.items() if station in station_ids}
+
+    df_stations = []
+    for station_id, station_dir in station_partitions.items():
+        df_sensors = [pd.DataFrame({station_id_label: [station_id]})]
+        for sensor, sensor_dir in _hive_partitions(station_dir, key="sensor").items():
+            if sensors is not None and sensor not in sensors:
+                continue
+            path_partition = os.path.join(sensor_dir, DATASET_PART_FILENAME)
+            columns_partition = None
+            if columns is not None:
+                schema_names = pq.read_schema(path_partition).names
+                columns_partition = [column for column in columns if column in schema_names]
+                if len(columns_partition) == 0:
+                    continue
+            df_sensors.append(read_df_from_parquet(path_partition, columns=columns_partition, zero_copy=zero_copy))
+        df_stations.append(pd.concat(df_sensors, axis=1))
+
+    if len(df_stations) == 0:
+        return pd.DataFrame(columns=[station_id_label])
+    df = pd.concat(df_stations, ignore_index=True)
+    if columns is not None:
+        columns_first = [station_id_label] + [column for column in columns if column in df.columns
+                                              and column != station_id_label]
+        df = df[columns_first + [column for column in df.columns if column not in columns_first]]
+    return df
@@ -5,7 +5,10 @@ import numpy as np
 import pandas as pd
 from scipy import signal
 import redpandas.redpd_preprocess as rpd_prep
+import redpandas.redpd_design as rpd_design
 
+import hashlib
+from fractions import Fraction
 from typing import List, Tuple, Union
 
 
@@ -65,7 +68,69 @@ def decimate_individual_station(sig_wf: np.array,
     return reconstruct_time_s, decimate_data
 
 
+def resample_poly_individual_station(sig_wf: np.ndarray,
+                                     sig_epoch_s: np.ndarray,
+                                     sample_rate_hz: float,
+                                     new_sample_rate_hz: float,
+                                     max_denominator: int = 1000) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Resample data and timestamps for an individual station in one polyphase pass (scipy.signal.resample_poly) by the
+    rational factor up/down closest to new_sample_rate_hz/sample_rate_hz. The anti-alias filter design is cached.
+
+    :param sig_wf: signal waveform, 1D or (n_channels, n_samples)
+    :param sig_epoch_s: signal timestamps
+    :param sample_rate_hz: sample rate in Hz
+    :param new_sample_rate_hz: target sample rate in Hz
+    :param max_denominator: largest up or down factor considered for the rational approximation. Default is 1000
+    :return: np.array resampled timestamps, np.array resampled data, resampled sample rate in Hz
+    """
+    ratio = Fraction(float(new_sample_rate_hz) / float(sample_rate_hz)).limit_denominator(max_denominator)
+    if ratio.numerator == 0:
+        raise ValueError(f"Can not resample {sample_rate_hz} Hz to {new_sample_rate_hz} Hz "
+                         f"with factors up to {max_denominator}")
+    up, down = ratio.numerator, ratio.denominator
+    resample_sample_rate_hz = sample_rate_hz * up / down
+    if up == down:
+        return sig_epoch_s, sig_wf, sample_rate_hz
+
+    resample_data = signal.resample_poly(sig_wf, up, down, axis=-1,
+                                         window=rpd_design.resample_poly_filter(up=up, down=down))
+
+    # reconstruct signal timestamps from new sample rate hz
+    reconstruct_time_s = (np.arange(np.shape(resample_data)[-1]) / resample_sample_rate_hz) + sig_epoch_s[0]
+
+    return reconstruct_time_s, resample_data, resample_sample_rate_hz
+
+
 # Main filter modules
+def apply_by_shape(sig_wf_column: Union[pd.Series, List],
+                   sig_function) -> List:
+    """
+    Apply a function to all the signals of a column at once: rows are grouped by shape and dtype, each group is
+    stacked into one array (n_rows, ..., n_samples) for sig_function, and the results are scattered back.
+    sig_function must operate along the last axis (e.g. nanmean(..., axis=-1, keepdims=True)).
+
+    :param sig_wf_column: column of signal waveforms, 1D or (n_channels, n_samples); NaN for rows without data
+    :param sig_function: function of the stacked signals, returns an array with one result per row along axis 0
+    :return: list with the result of each row, views of the group results; NaN for rows without data
+    """
+    sig_wf_column = list(sig_wf_column)
+    list_results = [float("NaN")] * len(sig_wf_column)
+
+    groups = {}
+    for position, sig_wf in enumerate(sig_wf_column):
+        if type(sig_wf) == float:
+            continue
+        groups.setdefault((np.shape(sig_wf), np.asarray(sig_wf).dtype.str), []).append(position)
+
+    for positions in groups.values():
+        group_results = sig_function(np.stack([sig_wf_column[position] for position in positions]))
+        for position, result in zip(positions, group_results):
+            list_results[position] = result
+
+    return list_results
+
+
 def signal_zero_mean_pandas(df: pd.DataFrame,
                             sig_wf_label: str,
                             new_column_label: str = 'zero_mean') -> pd.DataFrame:
@@ -80,21 +145,9 @@ def signal_zero_mean_pandas(df: pd.DataFrame,
     # label new column in df
     new_column_label_sig_data = new_column_label
 
-    list_zero_mean_data = []  # list that will be converted to a column
-    for n in df.index:
-
-        if type(df[sig_wf_label][n]) == float:
-            list_zero_mean_data.append(float("NaN"))
-            continue
-
-        if df[sig_wf_label][n].ndim == 1:
-            list_zero_mean_data.append(df[sig_wf_label][n] - np.nanmean(df[sig_wf_label][n]))
-        else:
-            list_zero_mean_3c_data = []
-            for index_dimension, _ in enumerate(df[sig_wf_label][n]):
-                list_zero_mean_3c_data.append(df[sig_wf_label][n][index_dimension] - np.nanmean(df[sig_wf_label][n][index_dimension]))
-
-            list_zero_mean_data.append(np.array(list_zero_mean_3c_data))   # append 3 channels sensor into 'main' list
+    # All rows with the same shape at once, mean of each channel
+    list_zero_mean_data = apply_by_shape(df[sig_wf_label],
+                                         lambda sig_wf: sig_wf - np.nanmean(sig_wf, axis=-1, keepdims=True))
 
     df[new_column_label_sig_data] = list_zero_mean_data
 
@@ -117,29 +170,11 @@ def taper_tukey_pandas(df: pd.DataFrame,
     # label new column in df
     new_column_label_taper_data = sig_wf_label + "_" + new_column_label_append
 
-    list_taper = []
-
-    for row in df.index:
-        if type(df[sig_wf_label][row]) == float:
-            list_taper.append(float("NaN"))
-            continue
-
-        if df[sig_wf_label][row].ndim == 1:
-            sig_data_window = (df[sig_wf_label][row] * signal.windows.tukey(M=len(df[sig_wf_label][row]),
-                                                                            alpha=fraction_cosine,
-                                                                            sym=True))
-            list_taper.append(sig_data_window)
-
-        else:
-            list_taper_3c_data = []
-            for index_dimension, _ in enumerate(df[sig_wf_label][row]):
-                sig_data_window = (df[sig_wf_label][row][index_dimension]
-                                   * signal.windows.tukey(M=len(df[sig_wf_label][row][index_dimension]),
-                                                          alpha=fraction_cosine,
-                                                          sym=True))
-                list_taper_3c_data.append(sig_data_window)
-
-            list_taper.append(np.array(list_taper_3c_data))  # append 3 channels sensor into 'main' list
+    # All rows with the same shape at once, one window per length
+    list_taper = apply_by_shape(df[sig_wf_label],
+                                lambda sig_wf: sig_wf * rpd_design.tukey_window(number_points=np.shape(sig_wf)[-1],
+                                                                                alpha=fraction_cosine,
+                                                                                sym=True))
 
     df[new_column_label_taper_data] = list_taper
 
@@ -170,24 +205,10 @@ def normalize_pandas(df: pd.DataFrame,
     else:
         norm_type_utils = rpd_prep.NormType.OTHER
 
-    list_normalized_signals = []  # list that will be converted to a column
-    for row in range(len(df)):
-        if type(df[sig_wf_label][row]) == float:
-            list_normalized_signals.append(float("NaN"))
-            continue
-
-        if df[sig_wf_label][row].ndim == 1:
-            # use libquantum utils normalize module
-            list_normalized_signals.append(rpd_prep.normalize(sig_wf=df[sig_wf_label][row], scaling=scaling,
-                                                              norm_type=norm_type_utils))
-        else:
-            list_3c_normalized_signals = []
-            for index_dimension, _ in enumerate(df[sig_wf_label][row]):
-                list_3c_normalized_signals.append(rpd_prep.normalize(sig_wf=df[sig_wf_label][row][index_dimension],
-                                                                     scaling=scaling,
-                                                                     norm_type=norm_type_utils))
-
-            list_normalized_signals.append(np.array(list_3c_normalized_signals))
+    # All rows with the same shape at once, norm of each channel
+    list_normalized_signals = apply_by_shape(df[sig_wf_label],
+                                             lambda sig_wf: rpd_prep.normalize(sig_wf=sig_wf, scaling=scaling,
+                                                                               norm_type=norm_type_utils, axis=-1))
 
     df[new_column_label] = list_normalized_signals
 
@@ -204,7 +225,8 @@ def decimate_signal_pandas(df: pd.DataFrame,
                            new_column_label_decimated_sig: str = 'decimated_sig_data',
                            new_column_label_decimated_sig_timestamps: str = 'decimated_sig_epoch',
                            new_column_label_decimated_sample_rate_hz: str = 'decimated_sample_rate_hz',
-                           verbose: bool = False) -> pd.DataFrame:
+                           verbose: bool = False,
+                           engine: str = 'decimate') -> pd.DataFrame:
     """
     Decimate all signal data (via spicy.signal.decimate). Decimates to the smallest sample rate recorded in data frame
     or to custom frequency.
@@ -221,9 +243,15 @@ def decimate_signal_pandas(df: pd.DataFrame,
     :param new_column_label_decimated_sig_timestamps: label for new column containing signal decimated timestamps
     :param new_column_label_decimated_sample_rate_hz: label for new column containing signal decimated sample rate
     :param verbose: print statements. Default is False
+    :param engine: 'decimate' for IIR decimation by integer factors, in prime factor steps above 12;
+        'poly' for one polyphase pass (resample_poly) by the closest rational factor, any ratio and 3c signals.
+        Default is 'decimate'
 
     :return: original data frame with added columns for decimated signal, timestamps, and sample rate
     """
+    if engine not in ['decimate', 'poly']:
+        raise ValueError(f"Unknown engine '{engine}'. Type 'decimate' or 'poly'.")
+
     # select frequency to downsample to
     if downsample_frequency_hz == 'Min' or downsample_frequency_hz == 'min':
         min_sample_rate = df[sample_rate_hz_label].min()  # find min sample rate in sample rate column
@@ -248,6 +276,27 @@ def decimate_signal_pandas(df: pd.DataFrame,
                 print(f'No data found for {df[sig_id_label][row]} {sig_wf_label}')
             continue
 
+        if engine == 'poly':
+            if df[sample_rate_hz_label][row] > min_sample_rate:
+                decimated_timestamp, decimated_data, decimated_sample_rate_hz = \
+                    resample_poly_individual_station(sig_wf=df[sig_wf_label][row],
+                                                     sig_epoch_s=df[sig_timestamps_label][row],
+                                                     sample_rate_hz=df[sample_rate_hz_label][row],
+                                                     new_sample_rate_hz=min_sample_rate)
+                if verbose:
+                    print(f'{df[sig_id_label][row]} data resampled to {decimated_sample_rate_hz} Hz')
+            else:
+                if verbose:
+                    print(f'{df[sig_id_label][row]} does not need to be downsampled')
+                decimated_timestamp = df[sig_timestamps_label][row]
+                decimated_data = df[sig_wf_label][row]
+                decimated_sample_rate_hz = df[sample_rate_hz_label][row]
+
+            list_all_decimated_timestamps.append(decimated_timestamp)
+            list_all_decimated_data.append(decimated_data)
+            list_all_decimated_sample_rate_hz.append(decimated_sample_rate_hz)
+            continue
+
         if df[sample_rate_hz_label][row] != min_sample_rate:
             # calculate downsampling factor to reach downsampled frequency
             downsampling_factor = int(df[sample_rate_hz_label][row]/min_sample_rate)
@@ -384,6 +433,152 @@ def decimate_signal_pandas_audio_rdvx(df: pd.DataFrame,
     return df
 
 
+COMMON_RATE_ATTRS_KEY: str = "redpandas_common_rate"
+
+
+def common_rate_column_label(sig_label: str,
+                             common_sample_rate_hz: float) -> str:
+    """
+    :param sig_label: string for column name with the signal data in df
+    :param common_sample_rate_hz: common sample rate in Hz
+    :return: label of the column with the signal data resampled to the common sample rate
+    """
+    return f"{sig_label}_{common_sample_rate_hz:g}hz"
+
+
+def common_rate_fingerprint(df: pd.DataFrame,
+                            sig_labels: List[str],
+                            sample_rate_hz_label: str) -> str:
+    """
+    Fingerprint of the signals resampled by resample_common_rate_pandas: hash of the values, shapes and dtypes of the
+    signal columns and of the sample rates
+
+    :param df: input pandas data frame
+    :param sig_labels: list of column names with signal data in df, e.g. waveform and timestamps
+    :param sample_rate_hz_label: string for column name with sample rate in Hz information in df
+    :return: sha256 hex digest
+    """
+    fingerprint_hash = hashlib.sha256()
+    for n in df.index:
+        for sig_label in sig_labels:
+            sig_wf = df[sig_label][n]
+            if type(sig_wf) == float:
+                fingerprint_hash.update(b"nan")
+                continue
+            sig_wf = np.ascontiguousarray(sig_wf)
+            fingerprint_hash.update(sig_wf.tobytes())
+            fingerprint_hash.update(repr((sig_wf.shape, sig_wf.dtype.str)).encode())
+        fingerprint_hash.update(repr(float(df[sample_rate_hz_label][n])).encode())
+    return fingerprint_hash.hexdigest()
+
+
+def resample_common_rate_pandas(df: pd.DataFrame,
+                                sig_wf_label: str,
+                                sample_rate_hz_label: str,
+                                common_sample_rate_hz: Union[str, float] = 'Min',
+                                sig_timestamps_label: str = None,
+                                reuse_existing: bool = True,
+                                verbose: bool = False) -> Tuple[pd.DataFrame, str, str]:
+    """
+    Resample all signals in df to a common sample rate with one polyphase pass per station (resample_poly), up or down.
+    Results are stored in df as columns labeled by the common sample rate (see common_rate_column_label):
+    the waveform, the resampled sample rate and, if sig_timestamps_label is given, the timestamps.
+    A fingerprint of the source signals and sample rates is kept in df.attrs, so later calls with the same common
+    sample rate return those columns without resampling as long as the source data is unchanged.
+
+    :param df: input pandas data frame
+    :param sig_wf_label: string for column name with the waveform data in df
+    :param sample_rate_hz_label: string for column name with sample rate in Hz information in df
+    :param common_sample_rate_hz: common sample rate in Hz, or 'Min' for the minimum sample rate in df. Default is 'Min'
+    :param sig_timestamps_label: optional string for column name with the waveform timestamp data in df.
+        Default is None, timestamps are not resampled
+    :param reuse_existing: if True, return the columns for the common sample rate already in df when they were
+        resampled from the same signals and sample rates. False always resamples. Default is True
+    :param verbose: print statements. Default is False
+    :return: original data frame with the resampled columns, waveform and sample rate column labels of the
+        resampled data
+    """
+    if common_sample_rate_hz == 'Min' or common_sample_rate_hz == 'min':
+        common_sample_rate_hz = df[sample_rate_hz_label].min()
+    common_sample_rate_hz = float(common_sample_rate_hz)
+
+    common_wf_label = common_rate_column_label(sig_wf_label, common_sample_rate_hz)
+    common_sample_rate_hz_label = common_rate_column_label(sample_rate_hz_label, common_sample_rate_hz)
+    labels = [common_wf_label, common_sample_rate_hz_label]
+    if sig_timestamps_label is not None:
+        labels.append(common_rate_column_label(sig_timestamps_label, common_sample_rate_hz))
+
+    source_labels = [sig_wf_label] if sig_timestamps_label is None else [sig_wf_label, sig_timestamps_label]
+    fingerprint = common_rate_fingerprint(df=df, sig_labels=source_labels, sample_rate_hz_label=sample_rate_hz_label)
+    if reuse_existing and all(label in df.columns for label in labels) and \
+            df.attrs.get(COMMON_RATE_ATTRS_KEY, {}).get(common_wf_label) == fingerprint:
+        if verbose:
+            print(f'Using existing signals resampled to {common_sample_rate_hz} Hz')
+        return df, common_wf_label, common_sample_rate_hz_label
+
+    list_all_resampled_timestamps = []
+    list_all_resampled_data = []
+    list_all_resampled_sample_rate_hz = []
+
+    for n in df.index:
+        sig_wf = df[sig_wf_label][n]
+        if type(sig_wf) == float:  # not an array, no data
+            list_all_resampled_timestamps.append(float("NaN"))
+            list_all_resampled_data.append(float("NaN"))
+            list_all_resampled_sample_rate_hz.append(float("NaN"))
+            continue
+
+        sig_epoch_s = np.zeros(1) if sig_timestamps_label is None else df[sig_timestamps_label][n]
+        resampled_timestamp, resampled_data, resampled_sample_rate_hz = \
+            resample_poly_individual_station(sig_wf=sig_wf,
+                                             sig_epoch_s=sig_epoch_s,
+                                             sample_rate_hz=df[sample_rate_hz_label][n],
+                                             new_sample_rate_hz=common_sample_rate_hz)
+        if verbose:
+            print(f'{n}: {df[sample_rate_hz_label][n]} Hz resampled to {resampled_sample_rate_hz} Hz')
+
+        list_all_resampled_timestamps.append(resampled_timestamp)
+        list_all_resampled_data.append(resampled_data)
+        list_all_resampled_sample_rate_hz.append(resampled_sample_rate_hz)
+
+    df[common_wf_label] = pd.Series(list_all_resampled_data, index=df.index, dtype=object)
+    df[common_sample_rate_hz_label] = list_all_resampled_sample_rate_hz
+    if sig_timestamps_label is not None:
+        df[labels[2]] = pd.Series(list_all_resampled_timestamps, index=df.index, dtype=object)
+    df.attrs[COMMON_RATE_ATTRS_KEY] = {**df.attrs.get(COMMON_RATE_ATTRS_KEY, {}), common_wf_label: fingerprint}
+
+    return df, common_wf_label, common_sample_rate_hz_label
+
+
+def butter_filtfilt_taper(sig_wf: np.ndarray,
+                          edges: Union[float, Tuple[float, float]],
+                          btype: str,
+                          filter_order: int = 4,
+                          tukey_alpha: float = 0.5,
+                          filter_form: str = 'ba') -> np.ndarray:
+    """
+    Apply a taper and a zero phase butterworth filter along the last axis, all channels of a 3c sensor at once
+
+    :param sig_wf: signal waveform, 1D or (n_channels, n_samples)
+    :param edges: corner frequency or (low, high) corner frequencies, scaled by Nyquist (1 = Nyquist)
+    :param btype: filter type, 'bandpass' or 'high'
+    :param filter_order: filter order is doubled with filtfilt, nominal 4 -> 8
+    :param tukey_alpha: 0 = no taper, 1 = Hann taper
+    :param filter_form: 'ba' for filtfilt with transfer function coefficients, 'sos' for sosfiltfilt with second-order
+        sections, stable at low normalized corner frequencies. Default is 'ba'
+    :return: filtered signal, same shape as sig_wf
+    """
+    sig_taper = np.asarray(sig_wf) * rpd_design.tukey_window(number_points=np.shape(sig_wf)[-1], alpha=tukey_alpha)
+    if filter_form == 'sos':
+        sos = rpd_design.butter_design(filter_order=filter_order, edges=edges, btype=btype, output='sos')
+        return signal.sosfiltfilt(sos, sig_taper, axis=-1)
+    elif filter_form == 'ba':
+        b, a = rpd_design.butter_design(filter_order=filter_order, edges=edges, btype=btype, output='ba')
+        return signal.filtfilt(b, a, sig_taper, axis=-1)
+    else:
+        raise ValueError(f"Unknown filter_form '{filter_form}'. Type 'ba' or 'sos'.")
+
+
 def bandpass_butter_pandas(df: pd.DataFrame,
                            sig_wf_label: str,
                            sig_sample_rate_label: str,
@@ -393,7 +588,8 @@ def bandpass_butter_pandas(df: pd.DataFrame,
                            tukey_alpha: float = 0.5,
                            new_column_label_sig_bandpass: str = 'bandpass',
                            new_column_label_frequency_low: str = 'frequency_low_hz',
-                           new_column_label_frequency_high: str = 'frequency_high_hz') -> pd.DataFrame:
+                           new_column_label_frequency_high: str = 'frequency_high_hz',
+                           filter_form: str = 'ba') -> pd.DataFrame:
     """
     Apply a taper and a butterworth bandpass filter
 
@@ -407,6 +603,8 @@ def bandpass_butter_pandas(df: pd.DataFrame,
     :param new_column_label_sig_bandpass: string for new column with bandpassed signal data
     :param new_column_label_frequency_low: string for new column
     :param new_column_label_frequency_high: string for new column
+    :param filter_form: 'ba' for filtfilt with transfer function coefficients, 'sos' for sosfiltfilt with second-order
+        sections, stable at low normalized corner frequencies (e.g. 100 s periods at 800 Hz). Default is 'ba'
 
     :return: original df with added columns for band passed tapered signal, frequency high and low values
     """
@@ -425,45 +623,22 @@ def bandpass_butter_pandas(df: pd.DataFrame,
             list_all_frequency_high_hz.append(float("NaN"))
             continue
 
-        if df[sig_wf_label][j].ndim == 1:
-            nyquist = 0.5 * df[sig_sample_rate_label][j]
-            edge_low = frequency_cut_low_hz / nyquist
-            edge_high = frequency_cut_high_hz / nyquist
-            if edge_high >= 1:
-                edge_high = 0.5  # Half of nyquist
-            [b, a] = signal.butter(N=filter_order,
-                                   Wn=[edge_low, edge_high],
-                                   btype='bandpass')
-            sig_taper = np.copy(df[sig_wf_label][j])
-            sig_taper = sig_taper * signal.windows.tukey(M=len(sig_taper), alpha=tukey_alpha)
-            sig_bandpass = signal.filtfilt(b, a, sig_taper)
-
-            # Append to list
-            list_all_signal_bandpass_data.append(sig_bandpass)
-            list_all_frequency_low_hz.append(frequency_cut_low_hz)
-            list_all_frequency_high_hz.append(frequency_cut_high_hz)
-
-        else:
-            list_3c_signal_bandpass_data = []
-            for index_dimension, _ in enumerate(df[sig_wf_label][j]):
-                nyquist = 0.5 * df[sig_sample_rate_label][j]
-                edge_low = frequency_cut_low_hz / nyquist
-                edge_high = frequency_cut_high_hz / nyquist
-                if edge_high >= 1:
-                    edge_high = 0.5  # Half of nyquist
-                [b, a] = signal.butter(N=filter_order,
-                                       Wn=[edge_low, edge_high],
-                                       btype='bandpass')
-                sig_taper = np.copy(df[sig_wf_label][j][index_dimension])
-                sig_taper = sig_taper * signal.windows.tukey(M=len(sig_taper), alpha=tukey_alpha)
-                sig_bandpass = signal.filtfilt(b, a, sig_taper)
-
-                list_3c_signal_bandpass_data.append(sig_bandpass)
-
-            # Append to list
-            list_all_signal_bandpass_data.append(np.array(list_3c_signal_bandpass_data))
-            list_all_frequency_low_hz.append(frequency_cut_low_hz)
-            list_all_frequency_high_hz.append(frequency_cut_high_hz)
+        nyquist = 0.5 * df[sig_sample_rate_label][j]
+        edge_low = frequency_cut_low_hz / nyquist
+        edge_high = frequency_cut_high_hz / nyquist
+        if edge_high >= 1:
+            edge_high = 0.5  # Half of nyquist
+        sig_bandpass = butter_filtfilt_taper(sig_wf=df[sig_wf_label][j],
+                                             edges=(edge_low, edge_high),
+                                             btype='bandpass',
+                                             filter_order=filter_order,
+                                             tukey_alpha=tukey_alpha,
+                                             filter_form=filter_form)
+
+        # Append to list
+        list_all_signal_bandpass_data.append(sig_bandpass)
+        list_all_frequency_low_hz.append(frequency_cut_low_hz)
+        list_all_frequency_high_hz.append(frequency_cut_high_hz)
 
     # Convert to columns and add it to df
     df[new_column_label_sig_bandpass] = list_all_signal_bandpass_data
@@ -482,7 +657,8 @@ def highpass_butter_pandas(df: pd.DataFrame,
                            tukey_alpha: float = 0.5,
                            new_column_label_sig_highpass: str = 'highpass',
                            new_column_label_frequency_low: str = 'frequency_low_hz',
-                           new_column_label_frequency_high: str = 'frequency_high_hz') -> pd.DataFrame:
+                           new_column_label_frequency_high: str = 'frequency_high_hz',
+                           filter_form: str = 'ba') -> pd.DataFrame:
     """
     Apply a taper and a butterworth bandpass filter
 
@@ -496,6 +672,8 @@ def highpass_butter_pandas(df: pd.DataFrame,
     :param new_column_label_sig_highpass: string for new column with highpass signal data
     :param new_column_label_frequency_low: string for new column
     :param new_column_label_frequency_high: string for new column
+    :param filter_form: 'ba' for filtfilt with transfer function coefficients, 'sos' for sosfiltfilt with second-order
+        sections, stable at low normalized corner frequencies (e.g. 100 s periods at 800 Hz). Default is 'ba'
 
     :return: original df with added columns for band passed tapered signal, frequency high and low values
     """
@@ -513,40 +691,19 @@ def highpass_butter_pandas(df: pd.DataFrame,
             list_all_frequency_high_hz.append(float("NaN"))
             continue
 
-        if df[sig_wf_label][j].ndim == 1:
-            nyquist = 0.5 * df[sig_sample_rate_label][j]
-            edge_low = frequency_cut_low_hz / nyquist
-            [b, a] = signal.butter(N=filter_order,
-                                   Wn=edge_low,
-                                   btype='high')
-            sig_taper = np.copy(df[sig_wf_label][j])
-            sig_taper = sig_taper * signal.windows.tukey(M=len(sig_taper), alpha=tukey_alpha)
-            sig_highpass = signal.filtfilt(b, a, sig_taper)
-
-            # Append to list
-            list_all_signal_highpass_data.append(sig_highpass)
-            list_all_frequency_low_hz.append(frequency_cut_low_hz)
-            list_all_frequency_high_hz.append(frequency_cut_high_hz)
-
-        else:
-            list_3c_signal_highpass_data = []
-            for index_dimension, _ in enumerate(df[sig_wf_label][j]):
-
-                nyquist = 0.5 * df[sig_sample_rate_label][j]
-                edge_low = frequency_cut_low_hz / nyquist
-                [b, a] = signal.butter(N=filter_order,
-                                       Wn=edge_low,
-                                       btype='high')
-                sig_taper = np.copy(df[sig_wf_label][j][index_dimension])
-                sig_taper = sig_taper * signal.windows.tukey(M=len(sig_taper), alpha=tukey_alpha)
-                sig_highpass = signal.filtfilt(b, a, sig_taper)
-
-                list_3c_signal_highpass_data.append(sig_highpass)
-
-            # Append to list
-            list_all_signal_highpass_data.append(np.array(list_3c_signal_highpass_data))
-            list_all_frequency_low_hz.append(frequency_cut_low_hz)
-            list_all_frequency_high_hz.append(frequency_cut_high_hz)
+        nyquist = 0.5 * df[sig_sample_rate_label][j]
+        edge_low = frequency_cut_low_hz / nyquist
+        sig_highpass = butter_filtfilt_taper(sig_wf=df[sig_wf_label][j],
+                                             edges=edge_low,
+                                             btype='high',
+                                             filter_order=filter_order,
+                                             tukey_alpha=tukey_alpha,
+                                             filter_form=filter_form)
+
+        # Append to list
+        list_all_signal_highpass_data.append(sig_highpass)
+        list_all_frequency_low_hz.append(frequency_cut_low_hz)
+        list_all_frequency_high_hz.append(frequency_cut_high_hz)
 
     # Convert to columns and add it to df
     df[new_column_label_sig_highpass] = list_all_signal_highpass_data
@@ -8,6 +8,7 @@ import pandas as pd
 import pymap3d as pm
 from typing import Any
 
+import redpandas.redpd_df as rpd_df
 from redpandas.redpd_scales import EPSILON, NANOS_TO_S, DEGREES_TO_METERS, PRESSURE_SEA_LEVEL_KPA
 
 
@@ -17,7 +18,9 @@ def redvox_loc(df_pqt_path: str) -> pd.DataFrame:
 
     :param df_pqt_path: path/to/parquet file with data stored in a pd.DataFrame
     :return: pd. DataFrame with columns {'station_id', 'location_epoch_s', 'location_latitude', 'location_longitude',
-    'location_altitude', 'location_speed', 'location_horizontal_accuracy', 'barometer_epoch_s', 'barometer_wf_raw'}
+    'location_altitude', 'location_speed', 'location_horizontal_accuracy', 'barometer_epoch_s', 'barometer_wf_raw'}.
+        'barometer_wf_raw' keeps its original shape (1, n_samples), restored by read_df_from_parquet; it used to be
+        returned flattened to (n_samples,)
     """
     # Check
     if not os.path.exists(df_pqt_path):
@@ -25,9 +28,6 @@ def redvox_loc(df_pqt_path: str) -> pd.DataFrame:
         print(df_pqt_path)
         exit()
 
-    df = pd.read_parquet(df_pqt_path)
-    print('Read parquet with pandas DataFrame')
-
     # Extract selected fields
     loc_fields = ['station_id',
                   'location_epoch_s',
@@ -38,7 +38,8 @@ def redvox_loc(df_pqt_path: str) -> pd.DataFrame:
                   'location_horizontal_accuracy',
                   'barometer_epoch_s',
                   'barometer_wf_raw']
-    df_loc = df[loc_fields]
+    df_loc = rpd_df.read_df_from_parquet(df_pqt_path, columns=loc_fields)[loc_fields]
+    print('Read parquet with pandas DataFrame')
 
     return df_loc
 
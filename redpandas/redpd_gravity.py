@@ -5,7 +5,8 @@ http://josejuansanchez.org/android-sensors-overview/gravity_and_linear_accelerat
 """
 
 import numpy as np
-from typing import Tuple
+from scipy import signal
+from typing import Tuple, Union
 
 
 # This is comparable to RC filter, smoothing factor is an approximation to alpha
@@ -22,23 +23,46 @@ def get_smoothing_factor(sensor_sample_rate_hz: float, low_pass_sample_rate_hz:
     return low_pass_sample_rate_hz / sensor_sample_rate_hz
 
 
+def exponential_filter(sensor_wf: np.ndarray,
+                       smoothing_factor: float,
+                       initial_value: Union[float, np.ndarray] = 0.) -> np.ndarray:
+    """
+    First order exponential (IIR) filter along the last axis: y[0] = initial_value,
+    y[i] = (1 - smoothing_factor) * y[i-1] + smoothing_factor * x[i]
+
+    :param sensor_wf: signal waveform, 1D or (n_channels, n_samples)
+    :param smoothing_factor: from get_smoothing_factor function
+    :param initial_value: first output sample, scalar or one value per channel. Default is 0
+    :return: numpy array with filtered signal, same shape as sensor_wf
+    """
+    sensor_wf = np.asarray(sensor_wf, dtype=np.float64)
+    initial_value = np.broadcast_to(initial_value, sensor_wf.shape[:-1]).astype(np.float64)
+
+    sensor_filtered = np.empty(sensor_wf.shape)
+    if sensor_wf.shape[-1] == 0:
+        return sensor_filtered
+    sensor_filtered[..., 0] = initial_value
+    # Initial state carries the contribution of the first sample to the second one
+    sensor_filtered[..., 1:], _ = signal.lfilter([smoothing_factor], [1., -(1 - smoothing_factor)],
+                                                 sensor_wf[..., 1:], axis=-1,
+                                                 zi=(1 - smoothing_factor) * initial_value[..., np.newaxis])
+    return sensor_filtered
+
+
 def get_gravity(accelerometer: np.ndarray, smoothing_factor: float) -> np.ndarray:
     """
     based on the slack thread: https://tinyurl.com/f6t3h2fp
 
-    :param accelerometer: accelerometer signal waveform
+    :param accelerometer: accelerometer signal waveform, 1D or all three axes (3, n_samples)
     :param smoothing_factor: from get_smoothing_factor function
     :return: numpy array with gravity values
     """
+    # initialize gravity at zero (nan if the axis has nans, as before)
+    gravity_initial = 0. * np.mean(accelerometer, axis=-1)
 
-    # initialize gravity array
-    gravity = np.zeros(len(accelerometer)) * np.mean(accelerometer)
-
-    # loop through to update gravity information
-    for i in range(len(gravity) - 1):
-        gravity[i + 1] = (1 - smoothing_factor) * gravity[i] + smoothing_factor * accelerometer[i + 1]
-
-    return gravity
+    return exponential_filter(sensor_wf=accelerometer,
+                              smoothing_factor=smoothing_factor,
+                              initial_value=gravity_initial)
 
 
 def get_gravity_and_linear_acceleration(accelerometer: np.ndarray,
@@ -47,7 +71,7 @@ def get_gravity_and_linear_acceleration(accelerometer: np.ndarray,
     """
     Obtain gravity and linear acceleration from smartphone accelerometer sensor
 
-    :param accelerometer: accelerometer signal waveform
+    :param accelerometer: accelerometer signal waveform, 1D or all three axes (3, n_samples)
     :param sensor_sample_rate_hz: sample rate of accelerometer in Hz
     :param low_pass_sample_rate_hz: sample rate of low pass filter in Hz
     :return: numpy array with gravity and numpy array with linear acceleration
@@ -76,21 +100,17 @@ def get_sensor_lowpass(sensor_wf: np.ndarray,
     """
     based on the slack thread: https://tinyurl.com/f6t3h2fp
 
-    :param sensor_wf: signal waveform
+    :param sensor_wf: signal waveform, 1D or (n_channels, n_samples)
     :param sensor_sample_rate_hz: sample rate of sensor in Hz
     :param lowpass_frequency_hz: sample rate of low pass filter in Hz
     :return: sensor low pass
     """
 
     smoothing_factor = lowpass_frequency_hz / sensor_sample_rate_hz
-    # initialize gravity array
-    sensor_lowpass = np.zeros(len(sensor_wf))
-
-    # loop through to update gravity information
-    for i in range(len(sensor_lowpass) - 1):
-        sensor_lowpass[i + 1] = (1 - smoothing_factor) * sensor_lowpass[i] + smoothing_factor * sensor_wf[i + 1]
 
-    return sensor_lowpass
+    return exponential_filter(sensor_wf=sensor_wf,
+                              smoothing_factor=smoothing_factor,
+                              initial_value=0.)
 
 
 def get_lowpass_and_highpass(sensor_wf: np.ndarray,
@@ -98,7 +118,7 @@ def get_lowpass_and_highpass(sensor_wf: np.ndarray,
                              lowpass_frequency_hz: float = 1) -> Tuple[np.ndarray, np.ndarray]:
     """
 
-    :param sensor_wf: signal waveform
+    :param sensor_wf: signal waveform, 1D or (n_channels, n_samples)
     :param sensor_sample_rate_hz: sample rate of sensor in Hz
     :param lowpass_frequency_hz: sample rate of low pass filter in Hz
     :return: sensor low pass and high pass
@@ -1,8 +1,9 @@
 """
-Iiterators used in redpd_preprocess.
+RC filters used in redpd_preprocess: per-sample iterators for streaming and array implementations.
 """
 
 import numpy as np
+from scipy import signal
 from typing import Tuple, Iterator
 
 # RC filter response: mag first contribution to stack overflow as slipstream
@@ -119,3 +120,85 @@ def rc_iterator_lowpass(sig_wf: np.ndarray,
         y_prev_low = rc_low_pass(x, y_prev_low, sample_rate_hz,
                                  frequency_cut_high_hz)
         yield y_prev_low
+
+
+# Array implementations of the RC filters above, same recursions evaluated with scipy.signal.lfilter
+def rc_high_pass_coefficients(sample_rate_hz: float,
+                              frequency_cut_low_hz: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Coefficients of the RC high pass recursion y[i] = alpha * (y[i-1] + x[i] - x[i-1])
+
+    :param sample_rate_hz: sample rate in Hz
+    :param frequency_cut_low_hz: low cutoff frequency in Hz
+    :return: numerator b, denominator a for lfilter
+    """
+    sample_interval_s = 1/sample_rate_hz
+    rc = 1/(2 * np.pi * frequency_cut_low_hz)
+    alpha = rc/(rc + sample_interval_s)
+    return np.array([alpha, -alpha]), np.array([1., -alpha])
+
+
+def rc_low_pass_coefficients(sample_rate_hz: float,
+                             frequency_cut_high_hz: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Coefficients of the RC low pass recursion y[i] = alpha * x[i] + (1 - alpha) * y[i-1]
+
+    :param sample_rate_hz: sample rate in Hz
+    :param frequency_cut_high_hz: high cutoff frequency in Hz
+    :return: numerator b, denominator a for lfilter
+    """
+    sample_interval_s = 1/sample_rate_hz
+    rc = 1/(2 * np.pi * frequency_cut_high_hz)
+    alpha = sample_interval_s/(rc + sample_interval_s)
+    return np.array([alpha]), np.array([1., -(1 - alpha)])
+
+
+def rc_high_pass_array(sig_wf: np.ndarray,
+                       sample_rate_hz: float,
+                       frequency_cut_low_hz: float) -> np.ndarray:
+    """
+    RC high pass filter of a whole signal, same output as rc_iterator_high_pass.
+    2D input (n_channels, n_samples) is filtered along the last axis.
+
+    :param sig_wf: signal waveform
+    :param sample_rate_hz: sample rate in Hz
+    :param frequency_cut_low_hz: low cutoff frequency in Hz
+    :return: high pass signal waveform
+    """
+    b, a = rc_high_pass_coefficients(sample_rate_hz, frequency_cut_low_hz)
+    # Zero initial state matches x_prev = y_prev = 0 in the iterator
+    return signal.lfilter(b, a, np.asarray(sig_wf, dtype=np.float64), axis=-1)
+
+
+def rc_low_pass_array(sig_wf: np.ndarray,
+                      sample_rate_hz: float,
+                      frequency_cut_high_hz: float) -> np.ndarray:
+    """
+    RC low pass filter of a whole signal, same output as rc_iterator_lowpass.
+    2D input (n_channels, n_samples) is filtered along the last axis.
+
+    :param sig_wf: signal waveform
+    :param sample_rate_hz: sample rate in Hz
+    :param frequency_cut_high_hz: high cutoff frequency in Hz
+    :return: low pass signal waveform
+    """
+    b, a = rc_low_pass_coefficients(sample_rate_hz, frequency_cut_high_hz)
+    return signal.lfilter(b, a, np.asarray(sig_wf, dtype=np.float64), axis=-1)
+
+
+def rc_highlow_array(sig_wf: np.ndarray,
+                     sample_rate_hz: float,
+                     frequency_cut_low_hz: float,
+                     frequency_cut_high_hz: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    RC high and low pass filters of a whole signal, same output as rc_iterator_highlow.
+    2D input (n_channels, n_samples) is filtered along the last axis.
+
+    :param sig_wf: signal waveform
+    :param sample_rate_hz: sample rate in Hz
+    :param frequency_cut_low_hz: low cutoff frequency in Hz
+    :param frequency_cut_high_hz: high cutoff frequency in Hz
+    :return: high pass signal waveform, low pass signal waveform
+    """
+    return rc_high_pass_array(sig_wf, sample_rate_hz, frequency_cut_low_hz), \
+        rc_low_pass_array(sig_wf, sample_rate_hz, frequency_cut_high_hz)
@@ -3,6 +3,7 @@ Functions to integrate, and apply complimentary filters for phone orientation.
 """
 
 import numpy as np
+from scipy import signal
 from scipy.integrate import cumulative_trapezoid
 from typing import List, Tuple
 
@@ -82,10 +83,11 @@ def get_roll_pitch(accel_x: float, accel_y: float, accel_z: float) -> Tuple[floa
     """
     Returns the pitch (rotation around y axis) and roll (rotation around x axis) from accelerometer data
     http://www.geekmomprojects.com/gyroscopes-and-accelerometers-on-a-chip/
+    Accepts scalars or numpy arrays of the same shape.
 
-    :param accel_x: x-axis acceleration value
-    :param accel_y: y-axis acceleration value
-    :param accel_z: z-axis acceleration value
+    :param accel_x: x-axis acceleration value(s)
+    :param accel_y: y-axis acceleration value(s)
+    :param accel_z: z-axis acceleration value(s)
     :return: pitch, roll
     """
     # get angle in radians
@@ -100,6 +102,7 @@ def get_yaw(roll: float, pitch: float, mag_x: float, mag_y: float, mag_z: float)
     """
     Returns yaw based on roll / pitch data and the magnetometer data
     https://roboticsclubiitk.github.io/2017/12/21/Beginners-Guide-to-IMU.html
+    Accepts scalars or numpy arrays of the same shape.
 
     :param roll: rotation around the x-axis
     :param pitch: rotation around the y-axis
@@ -117,24 +120,16 @@ def get_yaw(roll: float, pitch: float, mag_x: float, mag_y: float, mag_z: float)
 def get_roll_pitch_array(accelerometers: List) -> Tuple[np.ndarray, np.ndarray]:
     """
     Returns the pitch (rotation around y axis) and roll (rotation around x axis) array from accelerometer data
-    Loops through the get_pitch_and_roll function
+    Evaluates the get_roll_pitch function on the whole arrays
 
     :param accelerometers: List of the xyz components of accelerometer data
     :return: pitch_array, roll_array
     """
-    # Loop through get_xy_rotation
-    roll_array = []
-    pitch_array = []
+    pitch_array, roll_array = get_roll_pitch(accel_x=np.asarray(accelerometers[0]),
+                                             accel_y=np.asarray(accelerometers[1]),
+                                             accel_z=np.asarray(accelerometers[2]))
 
-    for i in range(len(accelerometers[0])):
-        pitch, roll = get_roll_pitch(accel_x=accelerometers[0][i],
-                                     accel_y=accelerometers[1][i],
-                                     accel_z=accelerometers[2][i])
-
-        roll_array.append(roll)
-        pitch_array.append(pitch)
-
-    return np.array(roll_array), np.array(pitch_array)
+    return np.asarray(roll_array), np.asarray(pitch_array)
 
 
 def get_yaw_array(roll_array: np.ndarray, pitch_array: np.ndarray, magnetometers: List) -> np.ndarray:
@@ -146,19 +141,15 @@ def get_yaw_array(roll_array: np.ndarray, pitch_array: np.ndarray, magnetometers
     :param magnetometers: List of xyz components of magnetometer data
     :return: yaw_array
     """
-    # Loop through get_xy_rotation
-    yaw_array = []
-
-    for i in range(len(magnetometers[0])):
-        yaw = get_yaw(roll=roll_array[i],
-                      pitch=pitch_array[i],
-                      mag_x=magnetometers[0][i],
-                      mag_y=magnetometers[1][i],
-                      mag_z=magnetometers[2][i])
+    number_points = len(magnetometers[0])
 
-        yaw_array.append(yaw)
+    yaw_array = get_yaw(roll=np.asarray(roll_array)[:number_points],
+                        pitch=np.asarray(pitch_array)[:number_points],
+                        mag_x=np.asarray(magnetometers[0]),
+                        mag_y=np.asarray(magnetometers[1]),
+                        mag_z=np.asarray(magnetometers[2]))
 
-    return np.array(yaw_array)
+    return np.asarray(yaw_array)
 
 
 def complimentary_filtering(gyroscope_time_s: np.ndarray, gyroscope_angle: np.ndarray,
@@ -170,7 +161,7 @@ def complimentary_filtering(gyroscope_time_s: np.ndarray, gyroscope_angle: np.nd
     http://blog.bitify.co.uk/2013/11/using-complementary-filter-to-combine.html
 
     :param gyroscope_time_s: timestamps corresponding to the gyroscope data in seconds
-    :param gyroscope_angle: the calculated angle from the gyroscope (roll, pitch, yaw)
+    :param gyroscope_angle: the calculated angle from the gyroscope (roll, pitch, yaw). Filtered in place
     :param accelerometer_angle: the calculated angle from the accelerometer (roll, pitch, yaw)
     :param smoothing_factor: determines the sensitivity of the accelerometer
     :return: filtered angle
@@ -179,11 +170,17 @@ def complimentary_filtering(gyroscope_time_s: np.ndarray, gyroscope_angle: np.nd
     gyroscope_angle_change = np.diff(gyroscope_angle)
     gyroscope_time_delta = np.diff(gyroscope_time_s)
 
-    # Loop through the data to apply complimentary filter
     filtered_angle = gyroscope_angle
-    for i in range(len(accelerometer_angle) - 1):
-        filtered_angle[i + 1] = \
-            smoothing_factor * (filtered_angle[i] + gyroscope_angle_change[i] * gyroscope_time_delta[i]) \
-            + smoothing_factor * accelerometer_angle[i + 1]
+    number_points = len(accelerometer_angle)
+    if number_points < 2:
+        return filtered_angle
+
+    # The recursion filtered[i + 1] = smoothing_factor * (filtered[i] + gyro_change[i] * time_delta[i])
+    # + smoothing_factor * accel[i + 1] is a first order IIR filter driven by the gyro and accel terms
+    filter_input = smoothing_factor * (gyroscope_angle_change[:number_points - 1] *
+                                       gyroscope_time_delta[:number_points - 1] +
+                                       np.asarray(accelerometer_angle)[1:number_points])
+    filtered_angle[1:number_points], _ = signal.lfilter([1.], [1., -smoothing_factor], filter_input,
+                                                        zi=[smoothing_factor * filtered_angle[0]])
 
     return filtered_angle
@@ -0,0 +1,129 @@
+"""
+Utilities to run RedPandas jobs concurrently in thread or process pools.
+"""
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+def get_executor(executor_type: str = "process",
+                 n_workers: Optional[int] = None) -> Executor:
+    """
+    Construct a pool executor
+
+    :param executor_type: 'process' or 'thread'. Default is 'process'
+    :param n_workers: maximum number of workers in the pool. Default is None (number of processors on the machine)
+    :return: concurrent.futures Executor
+    """
+    if executor_type == "process":
+        return ProcessPoolExecutor(max_workers=n_workers)
+    elif executor_type == "thread":
+        return ThreadPoolExecutor(max_workers=n_workers)
+    else:
+        raise ValueError(f"Unknown executor type '{executor_type}'. Type 'process' or 'thread'.")
+
+
+def _call_or_exception(func: Callable, item: Any) -> Any:
+    """
+    Call func on item, returning the raised exception instead of propagating it
+
+    :param func: function to call
+    :param item: argument for func
+    :return: result of func(item) or the exception raised by it
+    """
+    try:
+        return func(item)
+    except Exception as error:
+        return error
+
+
+def parallel_map(func: Callable,
+                 items: Iterable,
+                 n_workers: Optional[int] = None,
+                 executor_type: str = "process",
+                 return_exceptions: bool = False) -> List[Any]:
+    """
+    Apply func to every item, optionally in a pool of workers. Results are returned in the same order as items.
+    With a process pool, func and items must be picklable (module level functions, functools.partial of those).
+
+    :param func: function of one argument
+    :param items: arguments for func
+    :param n_workers: number of workers. Default is None, run serially in the calling process
+    :param executor_type: 'process' or 'thread'. Default is 'process'
+    :param return_exceptions: if True, an exception raised for an item is returned in place of its result instead
+        of being raised. Default is False
+    :return: list with func(item) for each item
+    """
+    items = list(items)
+
+    if return_exceptions:
+        job = _call_or_exception
+    else:
+        job = None
+
+    if n_workers is None or n_workers <= 1 or len(items) <= 1:
+        if job is None:
+            return [func(item) for item in items]
+        return [job(func, item) for item in items]
+
+    with get_executor(executor_type=executor_type, n_workers=n_workers) as executor:
+        if job is None:
+            futures = [executor.submit(func, item) for item in items]
+            return [future.result() for future in futures]
+
+        futures = [executor.submit(job, func, item) for item in items]
+        results = []
+        for future in futures:
+            # Errors moving the job to or from the worker (e.g. pickling) surface here
+            try:
+                results.append(future.result())
+            except Exception as error:
+                results.append(error)
+        return results
+
+
+def share_array(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, Tuple[str, Tuple[int, ...], str]]:
+    """
+    Copy an array into a new shared memory block, so workers can read it without pickling.
+    The caller owns the block: close and unlink it when the workers are done.
+
+    :param array: numpy array to share
+    :return: shared memory block and descriptor (name, shape, dtype) to pass to attach_shared_array
+    """
+    array = np.ascontiguousarray(array)
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return shm, (shm.name, array.shape, array.dtype.str)
+
+
+def attach_shared_array(descriptor: Tuple[str, Tuple[int, ...], str]) -> Tuple[shared_memory.SharedMemory,
+                                                                               np.ndarray]:
+    """
+    Attach to an array shared with share_array. Release every view of the array before closing the block.
+
+    :param descriptor: (name, shape, dtype) from share_array
+    :return: shared memory block and numpy array backed by it
+    """
+    name, shape, dtype = descriptor
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def read_shared_array(descriptor: Tuple[str, Tuple[int, ...], str],
+                      index: Any = Ellipsis) -> np.ndarray:
+    """
+    Copy (part of) an array shared with share_array into local memory
+
+    :param descriptor: (name, shape, dtype) from share_array
+    :param index: index or slice of the shared array to copy. Default is the whole array
+    :return: numpy array
+    """
+    shm, shared_array = attach_shared_array(descriptor)
+    try:
+        return np.array(shared_array[index])
+    finally:
+        del shared_array
+        shm.close()
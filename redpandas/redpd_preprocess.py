@@ -4,7 +4,7 @@ before construction of RedPandas DataFrame.
 """
 
 from enum import Enum
-from typing import Tuple, Union
+from typing import Iterable, Iterator, Optional, Tuple, Union
 
 import numpy as np
 from scipy import signal
@@ -15,6 +15,7 @@ import pandas as pd
 from redvox.common import date_time_utils as dt
 import redpandas.redpd_iterator as rdp_iter
 import redpandas.redpd_scales as rpd_scales
+import redpandas.redpd_design as rpd_design
 
 
 # Define classes
@@ -47,21 +48,25 @@ def datetime_now_epoch_micros() -> float:
     return dt.datetime_to_epoch_microseconds_utc(dt.now())
 
 
-def normalize(sig_wf: np.ndarray, scaling: float = 1., norm_type: NormType = NormType.MAX) -> np.ndarray:
+def normalize(sig_wf: np.ndarray, scaling: float = 1., norm_type: NormType = NormType.MAX,
+              axis: Optional[int] = None) -> np.ndarray:
     """
     Scale a 1D time series
 
     :param sig_wf: signal waveform
     :param scaling: scaling parameter, division
     :param norm_type: {'max', l1, l2}, optional
+    :param axis: optional axis along which the norm is computed, e.g. -1 to scale each row of a 2D array.
+        Default is None, one norm for the whole array
     :return: The scaled series
     """
+    keepdims = axis is not None
     if norm_type == NormType.MAX:
-        return sig_wf / np.nanmax(np.abs(sig_wf))
+        return sig_wf / np.nanmax(np.abs(sig_wf), axis=axis, keepdims=keepdims)
     elif norm_type == NormType.L1:
-        return sig_wf / np.nansum(sig_wf)
+        return sig_wf / np.nansum(sig_wf, axis=axis, keepdims=keepdims)
     elif norm_type == NormType.L2:
-        return sig_wf / np.sqrt(np.nansum(sig_wf * sig_wf))
+        return sig_wf / np.sqrt(np.nansum(sig_wf * sig_wf, axis=axis, keepdims=keepdims))
     else:  # Must be NormType.Other
         return sig_wf / scaling
 
@@ -118,21 +123,21 @@ def taper_tukey(sig_wf_or_time: np.ndarray,
     :param fraction_cosine: fraction of the window inside the cosine tapered window, shared between the head and tail
     :return: tukey taper window amplitude
     """
-    return signal.windows.tukey(M=np.size(sig_wf_or_time), alpha=fraction_cosine, sym=True)
+    return np.array(rpd_design.tukey_window(number_points=np.size(sig_wf_or_time), alpha=fraction_cosine, sym=True))
 
 
 def pad_reflection_symmetric(sig_wf: np.ndarray) -> Tuple[np.ndarray, int]:
     """
-    Apply reflection transformation
+    Apply reflection transformation. Multichannel input (n_channels, n_samples) is folded along the last axis.
 
     :param sig_wf: signal waveform
     :return: input signal with reflected edges, numbers of points folded per edge
     """
-    number_points_to_flip_per_edge = int(len(sig_wf)//2)
-    wf_folded = np.pad(np.copy(sig_wf),
-                       (number_points_to_flip_per_edge, number_points_to_flip_per_edge),
-                       'reflect')
-    wf_folded *= taper_tukey(wf_folded, fraction_cosine=0.5)
+    number_points_to_flip_per_edge = int(np.shape(sig_wf)[-1]//2)
+    pad_width = [(0, 0)] * (np.ndim(sig_wf) - 1) + [(number_points_to_flip_per_edge, number_points_to_flip_per_edge)]
+    wf_folded = np.pad(np.copy(sig_wf), pad_width, 'reflect')
+    # Same taper for every channel
+    wf_folded *= rpd_design.tukey_window(number_points=np.shape(wf_folded)[-1], alpha=0.5, sym=True)
     return wf_folded, number_points_to_flip_per_edge
 
 
@@ -186,16 +191,14 @@ def rc_high_pass_signal(sig_wf: np.ndarray,
                         sample_rate_hz: int,
                         highpass_cutoff: float) -> np.ndarray:
     """
-    Apply RC high pass filter to signal
+    Apply RC high pass filter to signal. 2D input (n_channels, n_samples) is filtered along the last axis.
 
     :param sig_wf: signal waveform
     :param sample_rate_hz: sampling rate in Hz
     :param highpass_cutoff: filter corner frequency in Hz
-    :return: highpass signal
+    :return: highpass signal, same shape as sig_wf
     """
-    return np.array([[high]
-                     for high
-                     in rdp_iter.rc_iterator_high_pass(sig_wf, sample_rate_hz, highpass_cutoff)])
+    return rdp_iter.rc_high_pass_array(sig_wf, sample_rate_hz, highpass_cutoff)
 
 
 # "Traditional" solution, up to Nyquist
@@ -217,7 +220,8 @@ def bandpass_butter_uneven(sig_wf: np.ndarray,
     nyquist = 0.5 * sample_rate_hz
     edge_low = frequency_cut_low_hz / nyquist
     edge_high = 0.5
-    [b, a] = signal.butter(N=filter_order, Wn=[edge_low, edge_high], btype='bandpass')
+    [b, a] = rpd_design.butter_design(filter_order=filter_order, edges=[edge_low, edge_high], btype='bandpass',
+                                      output='ba')
     return signal.filtfilt(b, a, np.copy(sig_wf))
 
 
@@ -281,10 +285,43 @@ def highpass_from_diff(sig_wf: np.ndarray,
     :zero phase filters are acausal
     :return: filtered signal waveform, frequency_filter_low value used
     """
+    sensor_waveform_reconstruct, frequency_filter_low = \
+        highpass_from_diff_multichannel(sig_wf=np.reshape(sig_wf, (1, -1)),
+                                        sig_epoch_s=sig_epoch_s,
+                                        sample_rate_hz=sample_rate_hz,
+                                        fold_signal=fold_signal,
+                                        highpass_type=highpass_type,
+                                        frequency_filter_low=frequency_filter_low,
+                                        filter_order=filter_order)
+
+    return sensor_waveform_reconstruct[0], frequency_filter_low
+
+
+def highpass_from_diff_multichannel(sig_wf: np.ndarray,
+                                    sig_epoch_s: np.ndarray,
+                                    sample_rate_hz: int or float,
+                                    fold_signal: bool = True,
+                                    highpass_type: str = 'obspy',
+                                    frequency_filter_low: float = 1./rpd_scales.Slice.T100S,
+                                    filter_order: int = 4) -> Tuple[np.ndarray, float]:
+    """
+    Same as highpass_from_diff for all channels of a sensor at once, e.g. the 3 axes of the accelerometer.
+    Filters along the last axis; the taper and the filter coefficients are computed once for all channels.
+
+    :param sig_wf: signal waveform with shape (n_channels, n_samples)
+    :param sig_epoch_s: signal time in epoch s, shared by all channels
+    :param sample_rate_hz: sampling rate in Hz
+    :param fold_signal: apply reflection transformation and fold edges
+    :param highpass_type: 'obspy', 'butter', 'rc'
+    :param frequency_filter_low: apply highpass filter. Default is 100 second periods
+    :param filter_order: filter corners / order. Default is 4.
+    :zero phase filters are acausal
+    :return: filtered signal waveform with shape (n_channels, n_samples), frequency_filter_low value used
+    """
     # Apply diff to remove DC offset; difference of nans is a nan
     # Replace nans with zeros, otherwise most things don't run
     # Using gradient instead of diff seems to fix off by zero issue!
-    sensor_waveform_grad_dm = demean_nan(np.gradient(sig_wf))
+    sensor_waveform_grad_dm = demean_nan_matrix(np.gradient(np.atleast_2d(sig_wf), axis=-1))
 
     # Override default high pass at 100 seconds if signal is too short
     # May be able to zero pad ... with ringing. Or fold as needed.
@@ -299,48 +336,179 @@ def highpass_from_diff(sig_wf: np.ndarray,
         sensor_waveform_fold = sensor_waveform_grad_dm
 
     if highpass_type == "obspy":
-        # Zero phase, acausal
-        sensor_waveform_dp_filtered = \
-            obspy.signal.filter.highpass(corners=filter_order,
-                                         data=np.copy(sensor_waveform_fold),
-                                         freq=frequency_filter_low,
-                                         df=sample_rate_hz,
-                                         zerophase=True)
+        # Zero phase, acausal. Same check, design and forward-backward sosfilt as obspy.signal.filter.highpass,
+        # which only reverses the first axis
+        if frequency_filter_low / (0.5 * sample_rate_hz) > 1:
+            raise ValueError("Selected corner frequency is above Nyquist.")
+        sos = rpd_design.butter_design(filter_order=filter_order,
+                                       edges=frequency_filter_low / (0.5 * sample_rate_hz),
+                                       btype='highpass',
+                                       output='sos')
+        sensor_waveform_dp_filtered = np.flip(signal.sosfilt(sos, sensor_waveform_fold, axis=-1), axis=-1)
+        sensor_waveform_dp_filtered = np.flip(signal.sosfilt(sos, sensor_waveform_dp_filtered, axis=-1), axis=-1)
 
     elif highpass_type == "butter":
-        [b, a] = signal.butter(N=filter_order,
-                               Wn=frequency_filter_low,
-                               fs=sample_rate_hz,
-                               btype='highpass',
-                               output='ba')
+        [b, a] = rpd_design.butter_design(filter_order=filter_order,
+                                          edges=frequency_filter_low,
+                                          sample_rate_hz=sample_rate_hz,
+                                          btype='highpass',
+                                          output='ba')
         # Zero phase, acausal
-        sensor_waveform_dp_filtered = signal.filtfilt(b, a, sensor_waveform_fold)
+        sensor_waveform_dp_filtered = signal.filtfilt(b, a, sensor_waveform_fold, axis=-1)
 
     elif highpass_type == "rc":
-        # RC is slow and not zero-phase, does not need a taper to work (but it doesn't hurt)
-        sensor_waveform_dp_filtered = \
-            rc_high_pass_signal(sig_wf=np.copy(sensor_waveform_fold),
-                                sample_rate_hz=sample_rate_hz,
-                                highpass_cutoff=frequency_filter_low)
+        # RC is not zero-phase, does not need a taper to work (but it doesn't hurt)
+        sensor_waveform_dp_filtered = rc_high_pass_signal(sig_wf=sensor_waveform_fold,
+                                                          sample_rate_hz=sample_rate_hz,
+                                                          highpass_cutoff=frequency_filter_low)
 
     else:
         raise Exception("No filter selected. Type 'obspy', 'butter', or 'rc'.")
 
     if fold_signal is True:
         # Cut fold edges of wf
-        sensor_waveform_dp_filtered = sensor_waveform_dp_filtered[number_points_folded:-number_points_folded]
+        sensor_waveform_dp_filtered = sensor_waveform_dp_filtered[..., number_points_folded:-number_points_folded]
 
     # Reconstruct Function dP: P(0), P(i) = dP(i) + P(i-1)
-    sensor_waveform_reconstruct = np.zeros((len(sensor_waveform_dp_filtered)))
-    # Initialize
-    sensor_waveform_reconstruct[0] = sensor_waveform_dp_filtered[0]
-
-    for i in range(1, len(sensor_waveform_dp_filtered) - 1):
-        sensor_waveform_reconstruct[i] = sensor_waveform_dp_filtered[i] + sensor_waveform_reconstruct[i-1]
+    sensor_waveform_reconstruct = reconstruct_from_diff(sensor_waveform_dp_filtered)
 
     return sensor_waveform_reconstruct, frequency_filter_low
 
 
+def reconstruct_from_diff(sig_diff_wf: np.ndarray) -> np.ndarray:
+    """
+    Reconstruct signal from its differential along the last axis: P(0) = dP(0), P(i) = dP(i) + P(i-1).
+    As in the original recursion, the last sample is not reconstructed and is left at zero.
+
+    :param sig_diff_wf: differential signal waveform, 1D or (n_channels, n_samples)
+    :return: reconstructed signal waveform
+    """
+    # cumsum accumulates sequentially, same result as the recursion
+    sig_reconstruct = np.cumsum(sig_diff_wf, axis=-1, dtype=np.float64)
+    if np.shape(sig_reconstruct)[-1] > 1:
+        sig_reconstruct[..., -1] = 0.
+    return sig_reconstruct
+
+
+# Streaming version of highpass_from_diff for records that do not fit in memory
+def highpass_from_diff_chunks(sig_wf_chunks: Iterable[np.ndarray],
+                              sample_rate_hz: int or float,
+                              highpass_type: str = 'butter',
+                              frequency_filter_low: float = 1./rpd_scales.Slice.T100S,
+                              filter_order: int = 4) -> Iterator[np.ndarray]:
+    """
+    Causal highpass from the differential signal, chunk by chunk: gradient, highpass and reconstruction as in
+    highpass_from_diff, with the filter state and the reconstruction sum carried between chunks.
+    Memory is bounded by the chunk size. Chunks are 1D or (n_channels, n_samples) and split along the last axis.
+    Differences with highpass_from_diff: the filter is causal (single pass, no fold), the filter state is
+    initialized at steady state on the first differential sample instead of removing the mean of the whole record,
+    and the last sample is reconstructed.
+
+    :param sig_wf_chunks: consecutive chunks of the signal waveform, any lengths
+    :param sample_rate_hz: sampling rate in Hz
+    :param highpass_type: 'butter' or 'rc'. Default is 'butter'
+    :param frequency_filter_low: apply highpass filter. Default is 100 second periods
+    :param filter_order: filter corners / order, used by 'butter'. Default is 4.
+    :return: yield reconstructed highpass signal, one sample behind the input (np.gradient needs the next sample);
+        all samples are yielded once the input is exhausted
+    """
+    if highpass_type == "butter":
+        sos = rpd_design.butter_design(filter_order=filter_order,
+                                       edges=frequency_filter_low,
+                                       sample_rate_hz=sample_rate_hz,
+                                       btype='highpass',
+                                       output='sos')
+    elif highpass_type == "rc":
+        b, a = rdp_iter.rc_high_pass_coefficients(sample_rate_hz, frequency_filter_low)
+    else:
+        raise Exception("No filter selected. Type 'butter' or 'rc'.")
+
+    # Samples not differentiated yet, with the previous sample as context once past the first chunk
+    sig_pending = None
+    is_first_sample = True
+    filter_state = None
+    reconstruct_sum = 0.
+
+    def _highpass_reconstruct(sig_grad: np.ndarray) -> np.ndarray:
+        nonlocal filter_state, reconstruct_sum
+        sig_grad = np.nan_to_num(sig_grad)
+        if filter_state is None:
+            # Steady state for a constant input equal to the first sample, no startup transient from the DC offset
+            sig_first = sig_grad[..., 0]
+            if highpass_type == "butter":
+                filter_state = signal.sosfilt_zi(sos)[(slice(None),) + (None,) * sig_first.ndim] * sig_first[..., None]
+            else:
+                filter_state = signal.lfilter_zi(b, a) * sig_first[..., None]
+        if highpass_type == "butter":
+            sig_filtered, filter_state = signal.sosfilt(sos, sig_grad, axis=-1, zi=filter_state)
+        else:
+            sig_filtered, filter_state = signal.lfilter(b, a, sig_grad, axis=-1, zi=filter_state)
+        # Reconstruct Function dP: P(0), P(i) = dP(i) + P(i-1)
+        sig_reconstruct = np.cumsum(sig_filtered, axis=-1, dtype=np.float64) + reconstruct_sum
+        reconstruct_sum = sig_reconstruct[..., -1:]
+        return sig_reconstruct
+
+    for sig_chunk in sig_wf_chunks:
+        sig_chunk = np.asarray(sig_chunk, dtype=np.float64)
+        sig_pending = sig_chunk if sig_pending is None else np.concatenate((sig_pending, sig_chunk), axis=-1)
+        if sig_pending.shape[-1] < 3 and not (is_first_sample and sig_pending.shape[-1] == 2):
+            continue
+        # Central differences as np.gradient, one sided difference for the first sample of the record
+        sig_grad = 0.5 * (sig_pending[..., 2:] - sig_pending[..., :-2])
+        if is_first_sample:
+            sig_grad = np.concatenate((sig_pending[..., 1:2] - sig_pending[..., :1], sig_grad), axis=-1)
+            is_first_sample = False
+        sig_pending = sig_pending[..., -2:]
+        yield _highpass_reconstruct(sig_grad)
+
+    # One sided difference for the last sample of the record
+    if sig_pending is not None and sig_pending.shape[-1] >= 2:
+        yield _highpass_reconstruct(sig_pending[..., -1:] - sig_pending[..., -2:-1])
+
+
+def highpass_from_diff_chunked(sig_wf: np.ndarray,
+                               sample_rate_hz: int or float,
+                               chunk_points: int = 2**20,
+                               highpass_type: str = 'butter',
+                               frequency_filter_low: float = 1./rpd_scales.Slice.T100S,
+                               filter_order: int = 4,
+                               out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Causal highpass from the differential signal of a long record, processed in chunks with
+    highpass_from_diff_chunks. sig_wf can be a memory-mapped array (np.load(mmap_mode='r') or a WaveformHandle),
+    so that only one chunk is in memory at a time.
+
+    :param sig_wf: signal waveform, 1D or (n_channels, n_samples)
+    :param sample_rate_hz: sampling rate in Hz
+    :param chunk_points: number of points per chunk. Default is 2**20
+    :param highpass_type: 'butter' or 'rc'. Default is 'butter'
+    :param frequency_filter_low: apply highpass filter. Default is 100 second periods
+    :param filter_order: filter corners / order, used by 'butter'. Default is 4.
+    :param out: optional output array with the shape of sig_wf, e.g. a writable memory-mapped array.
+        Default is None, a new array
+    :return: filtered signal waveform, same shape as sig_wf
+    """
+    number_points = np.shape(sig_wf)[-1]
+    # Same requirement as np.gradient in highpass_from_diff
+    if number_points < 2:
+        raise ValueError(f"At least 2 points are needed for the differential signal, got {number_points}")
+    if out is None:
+        out = np.empty(np.shape(sig_wf), dtype=np.float64)
+
+    sig_wf_chunks = (sig_wf[..., index_start:index_start + chunk_points]
+                     for index_start in range(0, number_points, chunk_points))
+    index_out = 0
+    for sig_reconstruct in highpass_from_diff_chunks(sig_wf_chunks=sig_wf_chunks,
+                                                     sample_rate_hz=sample_rate_hz,
+                                                     highpass_type=highpass_type,
+                                                     frequency_filter_low=frequency_filter_low,
+                                                     filter_order=filter_order):
+        out[..., index_out:index_out + sig_reconstruct.shape[-1]] = sig_reconstruct
+        index_out += sig_reconstruct.shape[-1]
+
+    return out
+
+
 # Auxiliary functions to open parquets
 def df_unflatten(df: pd.DataFrame) -> None:
     """
@@ -355,18 +523,25 @@ def df_unflatten(df: pd.DataFrame) -> None:
     og_names = [col.replace('_ndim', '') for col in df_ndim.columns]
 
     for col_name in og_names:
-        col_ndim_label = col_name + "_ndim"
-        col_values = df[col_name].to_numpy()
-        for index_array in df.index:
-            if len(df[col_ndim_label][index_array]) > 1:  # check that there is data
-                if len(df[col_ndim_label][index_array]) == 2:
-                    col_values[index_array].shape = (int(df[col_ndim_label][index_array][0]),
-                                                     int(df[col_ndim_label][index_array][1]))
+        if col_name in df.columns:
+            df_column_unflatten(df=df, col_wf_label=col_name, col_ndim_label=col_name + "_ndim")
+
 
-                if len(df[col_ndim_label][index_array]) == 3:  # tfr
-                    col_values[index_array].shape = (int(df[col_ndim_label][index_array][0]),
-                                                     int(df[col_ndim_label][index_array][1]),
-                                                     int(df[col_ndim_label][index_array][2]))
+def unflatten_values(col_values: np.ndarray,
+                     col_ndim: np.ndarray) -> np.ndarray:
+    """
+    Reshape flattened arrays to their original shape, any number of dimensions.
+
+    :param col_values: flattened arrays, usually waveform arrays
+    :param col_ndim: original shape of each array. Shapes with less than two elements (1D or missing data) are skipped
+    :return: object array with the reshaped arrays, views of the flattened arrays where possible
+    """
+    values_unflatten = np.empty(len(col_values), dtype=object)
+    for index_array, (values, shape) in enumerate(zip(col_values, col_ndim)):
+        if np.size(shape) > 1:  # check that there is data
+            values = np.reshape(values, np.asarray(shape, dtype=np.int64))
+        values_unflatten[index_array] = values
+    return values_unflatten
 
 
 def df_column_unflatten(df: pd.DataFrame,
@@ -381,14 +556,6 @@ def df_column_unflatten(df: pd.DataFrame,
     :return: original df, replaces column values with reshaped ones
     """
 
-    col_values = df[col_wf_label].to_numpy()
-    for index_array in df.index:
-        if len(df[col_ndim_label][index_array]) > 1:  # check that there is data
-            if len(df[col_ndim_label][index_array]) == 2:
-                col_values[index_array].shape = (int(df[col_ndim_label][index_array][0]),
-                                                 int(df[col_ndim_label][index_array][1]))
-
-            if len(df[col_ndim_label][index_array]) == 3:  # tfr
-                col_values[index_array].shape = (int(df[col_ndim_label][index_array][0]),
-                                                 int(df[col_ndim_label][index_array][1]),
-                                                 int(df[col_ndim_label][index_array][2]))
\ No newline at end of file
+    df[col_wf_label] = pd.Series(unflatten_values(col_values=df[col_wf_label].to_numpy(),
+                                                  col_ndim=df[col_ndim_label].to_numpy()),
+                                 index=df.index, dtype=object)
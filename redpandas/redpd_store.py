@@ -0,0 +1,161 @@
+"""
+Memory-mapped store for the waveform and TFR arrays of a RedPandas DataFrame.
+Arrays are written to .npy files and the DataFrame cells keep lightweight handles that behave as read-only arrays.
+"""
+
+import os
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+STORE_SUFFIX: str = ".npy"
+
+
+class WaveformHandle(np.lib.mixins.NDArrayOperatorsMixin):
+    """
+    Handle to an array stored in a .npy file. The file is memory-mapped on first use, read-only.
+    Arithmetic, numpy functions and indexing return in-memory arrays; other ndarray attributes
+    (min, max, reshape, T, ...) are those of the memory-mapped array.
+    Pickling keeps only the path, so handles are cheap to send to worker processes.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: path of the .npy file
+        """
+        self.path = path
+        self._array: Optional[np.memmap] = None
+
+    @property
+    def array(self) -> np.ndarray:
+        """
+        :return: read-only memory-mapped array
+        """
+        if self._array is None:
+            self._array = np.load(self.path, mmap_mode='r')
+        return self._array
+
+    @property
+    def shape(self) -> tuple:
+        return self.array.shape
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.array.dtype
+
+    @property
+    def ndim(self) -> int:
+        return self.array.ndim
+
+    @property
+    def size(self) -> int:
+        return self.array.size
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __iter__(self):
+        return iter(self.array)
+
+    def __getitem__(self, key):
+        return self.array[key]
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        if copy:
+            return np.array(self.array, dtype=dtype)
+        return np.asarray(self.array, dtype=dtype)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        inputs = tuple(np.asarray(value) if isinstance(value, WaveformHandle) else value for value in inputs)
+        if "out" in kwargs:
+            kwargs["out"] = tuple(np.asarray(value) if isinstance(value, WaveformHandle) else value
+                                  for value in kwargs["out"])
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.array, name)
+
+    def __reduce__(self):
+        return WaveformHandle, (self.path,)
+
+    def __repr__(self) -> str:
+        return f"WaveformHandle({self.path!r}, shape={self.shape}, dtype={self.dtype})"
+
+
+def is_waveform(cell) -> bool:
+    """
+    :param cell: DataFrame cell
+    :return: True if cell is an array or a WaveformHandle
+    """
+    return isinstance(cell, (np.ndarray, WaveformHandle))
+
+
+def store_array(array: np.ndarray,
+                path: str) -> WaveformHandle:
+    """
+    Write an array to a .npy file
+
+    :param array: array to store
+    :param path: path of the .npy file, directories are created if needed
+    :return: handle to the stored array
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    np.save(path, np.asarray(array), allow_pickle=False)
+    return WaveformHandle(path)
+
+
+def store_df_arrays(df: pd.DataFrame,
+                    store_dir: str,
+                    columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Move the arrays of a RedPandas DataFrame to memory-mapped .npy files in store_dir/<column>/<row index>.npy and
+    replace them with WaveformHandle. Arrays shared between rows (e.g. TFR grids) are stored once.
+
+    :param df: input pandas DataFrame
+    :param store_dir: store directory
+    :param columns: optional list of column labels to store. Default is None, all columns with numeric arrays
+    :return: original data frame with arrays replaced by handles
+    """
+    if columns is None:
+        columns = [column for column in df.columns
+                   if any(isinstance(cell, np.ndarray) and cell.dtype != object for cell in df[column])]
+
+    stored: Dict[int, WaveformHandle] = {}
+    for column in columns:
+        handles = []
+        for n in df.index:
+            cell = df[column][n]
+            if not isinstance(cell, np.ndarray) or cell.dtype == object:
+                handles.append(cell)
+                continue
+            if id(cell) not in stored:
+                path = os.path.join(store_dir, quote(str(column), safe=''), quote(str(n), safe='') + STORE_SUFFIX)
+                stored[id(cell)] = store_array(cell, path)
+            handles.append(stored[id(cell)])
+        df[column] = pd.Series(handles, index=df.index, dtype=object)
+
+    return df
+
+
+def load_df_arrays(df: pd.DataFrame,
+                   columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Replace WaveformHandle cells with in-memory arrays
+
+    :param df: input pandas DataFrame
+    :param columns: optional list of column labels to load. Default is None, all columns
+    :return: original data frame with handles replaced by arrays
+    """
+    if columns is None:
+        columns = list(df.columns)
+
+    for column in columns:
+        if any(isinstance(cell, WaveformHandle) for cell in df[column]):
+            df[column] = pd.Series([np.array(cell) if isinstance(cell, WaveformHandle) else cell
+                                    for cell in df[column]], index=df.index, dtype=object)
+
+    return df
@@ -2,10 +2,235 @@
 Calculate Time Representation Frequency.
 """
 
+from functools import partial
+from typing import Optional, Tuple
+
 import numpy as np
 import pandas as pd
 from libquantum import atoms, spectra, utils
-import redpandas.redpd_preprocess as rpd_prep
+import redpandas.redpd_design as rpd_design
+import redpandas.redpd_parallel as rpd_par
+import redpandas.redpd_tfr_cache as rpd_tfr_cache
+
+TFR_STORAGE_TYPES = ['float64', 'float32', 'uint16']
+
+
+def cwt_chirp_bits_multichannel(sig_wf: np.ndarray,
+                                frequency_sample_rate_hz: float,
+                                band_order_Nth: float = 3) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    CWT in bits for every channel of a multichannel signal, same result as libquantum atoms.cwt_chirp_from_sig
+    (cwt_type "fft" and default scales) applied to each channel. Each chirp atom and its FFT is computed once
+    and applied to all the channels.
+
+    :param sig_wf: signal waveforms (n_channels, n_samples)
+    :param frequency_sample_rate_hz: sample rate in Hz
+    :param band_order_Nth: Nth order of constant Q bands. Default is 3
+    :return: cwt in bits (n_channels, n_frequencies, n_samples), time in s and frequency in Hz
+    """
+    sig_wf = np.atleast_2d(sig_wf)
+    wavelet_points = sig_wf.shape[-1]
+    _, min_frequency_hz = atoms.chirp_scales_from_duration(band_order_Nth=band_order_Nth,
+                                                           sig_duration_s=wavelet_points/frequency_sample_rate_hz)
+
+    order_Nth, _, _, _, frequency_cwt_hz_flipped, _, _ = \
+        atoms.chirp_frequency_bands(scale_order_input=band_order_Nth,
+                                    frequency_low_input=min_frequency_hz,
+                                    frequency_sample_rate_input=frequency_sample_rate_hz,
+                                    frequency_high_input=frequency_sample_rate_hz/2.)
+    scale_points = len(frequency_cwt_hz_flipped)
+
+    sig_fft = np.fft.fft(sig_wf, axis=-1)
+    cwt_bits = np.empty((sig_wf.shape[0], scale_points, wavelet_points))
+    for ii in range(scale_points):
+        atom, _ = atoms.chirp_centered_4cwt(band_order_Nth=order_Nth,
+                                            sig_or_time=sig_wf[0],
+                                            scale_frequency_center_hz=frequency_cwt_hz_flipped[ii],
+                                            frequency_sample_rate_hz=frequency_sample_rate_hz)
+        cwt_raw = np.fft.ifft(sig_fft*np.conj(np.fft.fft(atom)), axis=-1)
+        # Time scales are increasing, flip to decreasing frequency
+        cwt_bits[:, scale_points - 1 - ii, :] = \
+            utils.log2epsilon(np.concatenate((cwt_raw[:, wavelet_points//2:], cwt_raw[:, 0:wavelet_points//2]),
+                                             axis=-1))
+
+    time_s = np.arange(wavelet_points)/frequency_sample_rate_hz
+    frequency_cwt_hz = np.flip(frequency_cwt_hz_flipped)
+
+    return cwt_bits, time_s, frequency_cwt_hz
+
+
+def tfr_bits_multichannel(sig_wf: np.ndarray,
+                          frequency_sample_rate_hz: float,
+                          order_number_input: float = 3,
+                          tfr_type: str = 'cwt') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Taper and calculate the Time Frequency Representation in bits of every channel of a multichannel signal
+
+    :param sig_wf: signal waveforms (n_channels, n_samples)
+    :param frequency_sample_rate_hz: sample rate in Hz
+    :param order_number_input: band order Nth
+    :param tfr_type: 'cwt' or 'stft'
+    :return: tfr in bits (n_channels, n_frequencies, n_times), time in s and frequency in Hz shared by all channels
+    """
+    sig_wf = np.array(np.atleast_2d(sig_wf))
+    # One taper for all the channels
+    sig_wf *= rpd_design.tukey_window(number_points=np.size(sig_wf[0]), alpha=0.1)
+
+    if tfr_type == "cwt":
+        return cwt_chirp_bits_multichannel(sig_wf=sig_wf,
+                                           frequency_sample_rate_hz=frequency_sample_rate_hz,
+                                           band_order_Nth=order_number_input)
+
+    if tfr_type == "stft":
+        # libquantum STFT is single channel; the grids are kept from the first channel
+        sig_stft_bits = []
+        for index_channel in range(sig_wf.shape[0]):
+            _, stft_bits, sig_stft_time_s, sig_stft_frequency_hz = \
+                spectra.stft_from_sig(sig_wf=sig_wf[index_channel],
+                                      frequency_sample_rate_hz=frequency_sample_rate_hz,
+                                      band_order_Nth=order_number_input)
+            sig_stft_bits.append(stft_bits)
+        return np.array(sig_stft_bits), sig_stft_time_s, sig_stft_frequency_hz
+
+    raise ValueError(f"Unknown tfr_type '{tfr_type}'. Type 'cwt' or 'stft'.")
+
+
+def quantize_tfr_bits(tfr_bits: np.ndarray) -> Tuple[np.ndarray, float, float]:
+    """
+    Quantize a TFR in bits to uint16 codes, tfr_bits ~= codes * scale + offset
+
+    :param tfr_bits: tfr in bits
+    :return: uint16 codes, offset and scale
+    """
+    tfr_bits_offset = float(np.nanmin(tfr_bits))
+    tfr_bits_scale = (float(np.nanmax(tfr_bits)) - tfr_bits_offset)/np.iinfo(np.uint16).max
+    if tfr_bits_scale == 0:
+        tfr_bits_scale = 1.
+    tfr_bits_codes = np.rint((np.nan_to_num(tfr_bits, nan=tfr_bits_offset) - tfr_bits_offset)/tfr_bits_scale)
+    return tfr_bits_codes.astype(np.uint16), tfr_bits_offset, tfr_bits_scale
+
+
+def dequantize_tfr_bits(tfr_bits_codes: np.ndarray,
+                        tfr_bits_offset: float,
+                        tfr_bits_scale: float,
+                        dtype: type = np.float64) -> np.ndarray:
+    """
+    TFR in bits from uint16 codes made by quantize_tfr_bits
+
+    :param tfr_bits_codes: uint16 codes
+    :param tfr_bits_offset: offset from quantize_tfr_bits
+    :param tfr_bits_scale: scale from quantize_tfr_bits
+    :param dtype: output float type. Default is np.float64
+    :return: tfr in bits
+    """
+    return (tfr_bits_codes*dtype(tfr_bits_scale) + dtype(tfr_bits_offset)).astype(dtype, copy=False)
+
+
+def tfr_bits_from_panda(df: pd.DataFrame,
+                        n,
+                        tfr_bits_label: str = 'tfr_bits',
+                        dtype: type = np.float64) -> np.ndarray:
+    """
+    TFR in bits of a row, whatever the tfr_storage used by tfr_bits_panda
+
+    :param df: input pandas data frame
+    :param n: row index label in df
+    :param tfr_bits_label: string for the tfr in bits column name in df. Default is 'tfr_bits'
+    :param dtype: output float type. Default is np.float64
+    :return: tfr in bits
+    """
+    tfr_bits = df[tfr_bits_label][n]
+    if getattr(tfr_bits, "dtype", None) == np.uint16:
+        return dequantize_tfr_bits(tfr_bits_codes=tfr_bits,
+                                   tfr_bits_offset=df[tfr_bits_label + "_offset"][n],
+                                   tfr_bits_scale=df[tfr_bits_label + "_scale"][n],
+                                   dtype=dtype)
+    return np.asarray(tfr_bits, dtype=dtype)
+
+
+def tfr_grids_from_panda(df: pd.DataFrame,
+                         n,
+                         tfr_bits_label: str = 'tfr_bits',
+                         tfr_time_s_label: str = 'tfr_time_s',
+                         tfr_frequency_hz_label: str = 'tfr_frequency_hz') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Time and frequency grids of a row, expanded to one per channel for multichannel TFRs, as writable copies.
+    Works with the shared 1D grids of the compact tfr_storage modes of tfr_bits_panda and with per-channel grids.
+
+    :param df: input pandas data frame
+    :param n: row index label in df
+    :param tfr_bits_label: string for the tfr in bits column name in df. Default is 'tfr_bits'
+    :param tfr_time_s_label: string for the tfr time column name in df. Default is 'tfr_time_s'
+    :param tfr_frequency_hz_label: string for the tfr frequency column name in df. Default is 'tfr_frequency_hz'
+    :return: tfr time in s and frequency in Hz
+    """
+    tfr_time_s = np.array(df[tfr_time_s_label][n])
+    tfr_frequency_hz = np.array(df[tfr_frequency_hz_label][n])
+    tfr_bits_shape = np.shape(df[tfr_bits_label][n])
+    if len(tfr_bits_shape) == 3 and tfr_time_s.ndim == 1:
+        tfr_time_s = np.tile(tfr_time_s, (tfr_bits_shape[0], 1))
+        tfr_frequency_hz = np.tile(tfr_frequency_hz, (tfr_bits_shape[0], 1))
+    return tfr_time_s, tfr_frequency_hz
+
+
+def _compact_tfr_storage(df: pd.DataFrame,
+                         sample_rate_hz_label: str,
+                         tfr_storage: str,
+                         tfr_bits_label: str,
+                         tfr_time_s_label: str,
+                         tfr_frequency_hz_label: str) -> None:
+    """
+    Convert tfr_bits_panda columns in place to a compact storage: tfr in bits as float32 or uint16 codes
+    (with new '_offset' and '_scale' columns), and 1D time and frequency grids shared between rows of the same
+    sample rate
+
+    :param df: pandas data frame with tfr_bits_panda columns
+    :param sample_rate_hz_label: string for column name with sample rate in Hz information in df
+    :param tfr_storage: 'float32' or 'uint16'
+    :param tfr_bits_label: string for the tfr in bits column name in df
+    :param tfr_time_s_label: string for the tfr time column name in df
+    :param tfr_frequency_hz_label: string for the tfr frequency column name in df
+    :return: None
+    """
+    tfr_bits = list(df[tfr_bits_label])
+    tfr_time_s = list(df[tfr_time_s_label])
+    tfr_frequency_hz = list(df[tfr_frequency_hz_label])
+    tfr_bits_offset = [float("NaN")]*len(df.index)
+    tfr_bits_scale = [float("NaN")]*len(df.index)
+
+    # One grid object per distinct grid within a sample rate
+    shared_grids = {}
+
+    def _shared_grid(grid: np.ndarray, sample_rate_hz: float) -> np.ndarray:
+        grid = np.asarray(grid)
+        if grid.ndim > 1:
+            grid = grid[(0,)*(grid.ndim - 1)]
+        candidates = shared_grids.setdefault((sample_rate_hz, len(grid)), [])
+        for candidate in candidates:
+            if candidate is grid or np.array_equal(candidate, grid):
+                return candidate
+        grid = np.array(grid)
+        grid.setflags(write=False)
+        candidates.append(grid)
+        return grid
+
+    for position, n in enumerate(df.index):
+        if not isinstance(tfr_bits[position], np.ndarray):
+            continue
+        if tfr_storage == 'float32':
+            tfr_bits[position] = tfr_bits[position].astype(np.float32)
+        else:
+            tfr_bits[position], tfr_bits_offset[position], tfr_bits_scale[position] = \
+                quantize_tfr_bits(tfr_bits[position])
+        tfr_time_s[position] = _shared_grid(tfr_time_s[position], df[sample_rate_hz_label][n])
+        tfr_frequency_hz[position] = _shared_grid(tfr_frequency_hz[position], df[sample_rate_hz_label][n])
+
+    df[tfr_bits_label] = tfr_bits
+    df[tfr_time_s_label] = tfr_time_s
+    df[tfr_frequency_hz_label] = tfr_frequency_hz
+    if tfr_storage == 'uint16':
+        df[tfr_bits_label + "_offset"] = tfr_bits_offset
+        df[tfr_bits_label + "_scale"] = tfr_bits_scale
 
 
 def frame_panda_no_offset(df: pd.DataFrame,
@@ -115,7 +340,14 @@ def tfr_bits_panda(df: pd.DataFrame,
                    tfr_type: str = 'cwt',
                    new_column_tfr_bits: str = 'tfr_bits',
                    new_column_tfr_time_s: str = 'tfr_time_s',
-                   new_column_tfr_frequency_hz: str = 'tfr_frequency_hz') -> pd.DataFrame:
+                   new_column_tfr_frequency_hz: str = 'tfr_frequency_hz',
+                   engine: str = 'batch',
+                   n_workers: Optional[int] = None,
+                   executor_type: str = 'process',
+                   cache_dir: Optional[str] = None,
+                   cache_max_size_bytes: int = rpd_tfr_cache.TFR_CACHE_MAX_SIZE_BYTES,
+                   tfr_storage: str = 'float64',
+                   verbose: bool = False) -> pd.DataFrame:
     """
     Calculate Time Frequency Representation for a signal
 
@@ -127,8 +359,77 @@ def tfr_bits_panda(df: pd.DataFrame,
     :param new_column_tfr_bits: label for new column containing tfr in bits
     :param new_column_tfr_time_s: label for new column containing tfr timestamps in epoch s
     :param new_column_tfr_frequency_hz: label for new column containing tfr frequency in Hz
+    :param engine: 'batch' tapers and transforms every channel of every station with the same number of points
+        and sample rate together, the time and frequency grids are computed once per group and copied to each row
+        (writable, one per channel for multichannel rows); 'loop' transforms one channel at a time. Default is 'batch'
+    :param n_workers: number of workers to spread blocks of (station, channel) TFRs with the 'batch' engine.
+        Signals reach the workers through shared memory. Default is None (serial)
+    :param executor_type: 'process' or 'thread'. Default is 'process'
+    :param cache_dir: directory for the on-disk TFR cache. TFRs are looked up by a hash of the waveform,
+        sample rate, tfr_type, order and libquantum version, and only the missing ones are computed.
+        Default is None (no cache)
+    :param cache_max_size_bytes: size limit of cache_dir, least recently used TFRs are evicted. Default is 2 GiB
+    :param tfr_storage: 'float64' keeps the full tfr and a grid per channel; 'float32' stores the tfr in bits as
+        float32; 'uint16' stores it as uint16 codes with new '_offset' and '_scale' columns. Both compact modes keep
+        one read-only 1D time and frequency grid shared by the rows of each sample rate. Use tfr_bits_from_panda
+        and tfr_grids_from_panda to read them back. Default is 'float64'
+    :param verbose: print statements. Default is False
     :return: input dataframe with new columns
     """
+    if tfr_storage not in TFR_STORAGE_TYPES:
+        raise ValueError(f"Unknown tfr_storage '{tfr_storage}'. Type one of {TFR_STORAGE_TYPES}.")
+    if tfr_storage != 'float64':
+        df = tfr_bits_panda(df=df,
+                            sig_wf_label=sig_wf_label,
+                            sig_sample_rate_label=sig_sample_rate_label,
+                            order_number_input=order_number_input,
+                            tfr_type=tfr_type,
+                            new_column_tfr_bits=new_column_tfr_bits,
+                            new_column_tfr_time_s=new_column_tfr_time_s,
+                            new_column_tfr_frequency_hz=new_column_tfr_frequency_hz,
+                            engine=engine,
+                            n_workers=n_workers,
+                            executor_type=executor_type,
+                            cache_dir=cache_dir,
+                            cache_max_size_bytes=cache_max_size_bytes,
+                            verbose=verbose)
+        _compact_tfr_storage(df=df,
+                             sample_rate_hz_label=sig_sample_rate_label,
+                             tfr_storage=tfr_storage,
+                             tfr_bits_label=new_column_tfr_bits,
+                             tfr_time_s_label=new_column_tfr_time_s,
+                             tfr_frequency_hz_label=new_column_tfr_frequency_hz)
+        return df
+
+    if cache_dir is not None:
+        return _tfr_bits_panda_cached(df=df,
+                                      sig_wf_label=sig_wf_label,
+                                      sig_sample_rate_label=sig_sample_rate_label,
+                                      order_number_input=order_number_input,
+                                      tfr_type=tfr_type,
+                                      new_column_tfr_bits=new_column_tfr_bits,
+                                      new_column_tfr_time_s=new_column_tfr_time_s,
+                                      new_column_tfr_frequency_hz=new_column_tfr_frequency_hz,
+                                      engine=engine,
+                                      n_workers=n_workers,
+                                      executor_type=executor_type,
+                                      cache_dir=cache_dir,
+                                      cache_max_size_bytes=cache_max_size_bytes,
+                                      verbose=verbose)
+
+    if engine == 'batch':
+        return _tfr_bits_panda_batch(df=df,
+                                     sig_wf_label=sig_wf_label,
+                                     sig_sample_rate_label=sig_sample_rate_label,
+                                     order_number_input=order_number_input,
+                                     tfr_type=tfr_type,
+                                     new_column_tfr_bits=new_column_tfr_bits,
+                                     new_column_tfr_time_s=new_column_tfr_time_s,
+                                     new_column_tfr_frequency_hz=new_column_tfr_frequency_hz,
+                                     n_workers=n_workers,
+                                     executor_type=executor_type)
+    elif engine != 'loop':
+        raise ValueError(f"Unknown tfr engine '{engine}'. Type 'batch' or 'loop'.")
 
     tfr_bits = []
     tfr_time_s = []
@@ -145,7 +446,7 @@ def tfr_bits_panda(df: pd.DataFrame,
         if df[sig_wf_label][n].ndim == 1:  # audio basically
 
             sig_wf_n = np.copy(df[sig_wf_label][n])
-            sig_wf_n *= rpd_prep.taper_tukey(sig_wf_or_time=sig_wf_n, fraction_cosine=0.1)
+            sig_wf_n *= rpd_design.tukey_window(number_points=np.size(sig_wf_n), alpha=0.1)
 
             if tfr_type == "cwt":
                 # Compute complex wavelet transform (cwt) from signal duration
@@ -176,7 +477,7 @@ def tfr_bits_panda(df: pd.DataFrame,
             for index_dimension, _ in enumerate(df[sig_wf_label][n]):
 
                 sig_wf_n = np.copy(df[sig_wf_label][n][index_dimension])
-                sig_wf_n *= rpd_prep.taper_tukey(sig_wf_or_time=sig_wf_n, fraction_cosine=0.1)
+                sig_wf_n *= rpd_design.tukey_window(number_points=np.size(sig_wf_n), alpha=0.1)
 
                 if tfr_type == "cwt":
                     # Compute complex wavelet transform (cwt) from signal duration
@@ -208,3 +509,220 @@ def tfr_bits_panda(df: pd.DataFrame,
     df[new_column_tfr_frequency_hz] = tfr_frequency_hz
 
     return df
+
+
+def _tfr_bits_shared_channels(job: Tuple[Tuple[str, Tuple[int, ...], str], int, int, float],
+                              order_number_input: float = 3,
+                              tfr_type: str = 'cwt') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Worker for tfr_bits_panda: TFR of a block of channels read from a shared memory array
+
+    :param job: shared array descriptor, first and last (excluded) channel, sample rate in Hz
+    :param order_number_input: band order Nth
+    :param tfr_type: 'cwt' or 'stft'
+    :return: tfr in bits (n_channels, n_frequencies, n_times), time in s and frequency in Hz
+    """
+    descriptor, channel_start, channel_stop, sample_rate_hz = job
+    return tfr_bits_multichannel(sig_wf=rpd_par.read_shared_array(descriptor, slice(channel_start, channel_stop)),
+                                 frequency_sample_rate_hz=sample_rate_hz,
+                                 order_number_input=order_number_input,
+                                 tfr_type=tfr_type)
+
+
+def _tfr_bits_groups_pool(group_sig_wf: list,
+                          group_sample_rate_hz: list,
+                          order_number_input: float,
+                          tfr_type: str,
+                          n_workers: int,
+                          executor_type: str = 'process') -> list:
+    """
+    TFR of groups of channels across a pool of workers. Every group goes to shared memory once and is split in
+    blocks of channels, results are put back together in channel order.
+
+    :param group_sig_wf: list of signal waveforms (n_channels, n_samples), one per group
+    :param group_sample_rate_hz: sample rate in Hz of each group
+    :param order_number_input: band order Nth
+    :param tfr_type: 'cwt' or 'stft'
+    :param n_workers: number of workers
+    :param executor_type: 'process' or 'thread'. Default is 'process'
+    :return: list with tfr in bits, time in s and frequency in Hz for each group
+    """
+    shared_blocks = []
+    jobs = []
+    job_groups = []
+    try:
+        for index_group, (sig_wf, sample_rate_hz) in enumerate(zip(group_sig_wf, group_sample_rate_hz)):
+            shm, descriptor = rpd_par.share_array(sig_wf)
+            shared_blocks.append(shm)
+            for channels in np.array_split(np.arange(len(sig_wf)), min(len(sig_wf), n_workers)):
+                jobs.append((descriptor, int(channels[0]), int(channels[-1]) + 1, sample_rate_hz))
+                job_groups.append(index_group)
+
+        job_results = rpd_par.parallel_map(partial(_tfr_bits_shared_channels,
+                                                   order_number_input=order_number_input,
+                                                   tfr_type=tfr_type),
+                                           jobs, n_workers=n_workers, executor_type=executor_type)
+    finally:
+        for shm in shared_blocks:
+            shm.close()
+            shm.unlink()
+
+    group_results = []
+    for index_group in range(len(group_sig_wf)):
+        results = [result for result, job_group in zip(job_results, job_groups) if job_group == index_group]
+        group_results.append((np.concatenate([result[0] for result in results]), results[0][1], results[0][2]))
+    return group_results
+
+
+def _tfr_bits_panda_batch(df: pd.DataFrame,
+                          sig_wf_label: str,
+                          sig_sample_rate_label: str,
+                          order_number_input: float = 3,
+                          tfr_type: str = 'cwt',
+                          new_column_tfr_bits: str = 'tfr_bits',
+                          new_column_tfr_time_s: str = 'tfr_time_s',
+                          new_column_tfr_frequency_hz: str = 'tfr_frequency_hz',
+                          n_workers: Optional[int] = None,
+                          executor_type: str = 'process') -> pd.DataFrame:
+    """
+    Batched tfr_bits_panda: stations are grouped by number of points and sample rate, and all the channels of a
+    group are transformed in one call, or split in blocks of channels across a pool of workers
+
+    :param df: input pandas data frame
+    :param sig_wf_label: string for the waveform column name in df
+    :param sig_sample_rate_label: string for column name with sample rate in Hz information in df
+    :param order_number_input: band order Nth
+    :param tfr_type: 'cwt' or 'stft'
+    :param new_column_tfr_bits: label for new column containing tfr in bits
+    :param new_column_tfr_time_s: label for new column containing tfr timestamps in epoch s
+    :param new_column_tfr_frequency_hz: label for new column containing tfr frequency in Hz
+    :param n_workers: number of workers. Default is None (serial)
+    :param executor_type: 'process' or 'thread'. Default is 'process'
+    :return: input dataframe with new columns
+    """
+    if tfr_type not in ["cwt", "stft"]:
+        raise ValueError(f"Unknown tfr_type '{tfr_type}'. Type 'cwt' or 'stft'.")
+
+    tfr_bits = [float("NaN")]*len(df.index)
+    tfr_time_s = [float("NaN")]*len(df.index)
+    tfr_frequency_hz = [float("NaN")]*len(df.index)
+
+    # Group rows by number of points and sample rate
+    groups = {}
+    for position, n in enumerate(df.index):
+        if sig_wf_label not in df.columns or type(df[sig_wf_label][n]) == float:
+            continue
+        groups.setdefault((np.shape(df[sig_wf_label][n])[-1], df[sig_sample_rate_label][n]), []).append(position)
+
+    group_sample_rate_hz = [sample_rate_hz for _, sample_rate_hz in groups.keys()]
+    group_positions = list(groups.values())
+    group_sig_wf = [np.concatenate([np.atleast_2d(df[sig_wf_label][df.index[position]]) for position in positions])
+                    for positions in group_positions]
+
+    if n_workers is None or n_workers <= 1:
+        group_results = [tfr_bits_multichannel(sig_wf=sig_wf,
+                                               frequency_sample_rate_hz=sample_rate_hz,
+                                               order_number_input=order_number_input,
+                                               tfr_type=tfr_type)
+                         for sig_wf, sample_rate_hz in zip(group_sig_wf, group_sample_rate_hz)]
+    else:
+        group_results = _tfr_bits_groups_pool(group_sig_wf=group_sig_wf,
+                                              group_sample_rate_hz=group_sample_rate_hz,
+                                              order_number_input=order_number_input,
+                                              tfr_type=tfr_type,
+                                              n_workers=n_workers,
+                                              executor_type=executor_type)
+
+    for positions, (group_bits, group_time_s, group_frequency_hz) in zip(group_positions, group_results):
+        sig_wf_rows = [df[sig_wf_label][df.index[position]] for position in positions]
+
+        index_channel = 0
+        for position, sig_wf in zip(positions, sig_wf_rows):
+            if np.ndim(sig_wf) == 1:  # audio basically
+                tfr_bits[position] = group_bits[index_channel]
+                # Each row gets its own writable grids, as with the 'loop' engine
+                tfr_time_s[position] = np.array(group_time_s)
+                tfr_frequency_hz[position] = np.array(group_frequency_hz)
+                index_channel += 1
+            else:  # sensor that is acceleration/gyroscope/magnetometer/barometer
+                number_channels = len(sig_wf)
+                tfr_bits[position] = group_bits[index_channel:index_channel + number_channels]
+                tfr_time_s[position] = np.tile(group_time_s, (number_channels, 1))
+                tfr_frequency_hz[position] = np.tile(group_frequency_hz, (number_channels, 1))
+                index_channel += number_channels
+
+    df[new_column_tfr_bits] = tfr_bits
+    df[new_column_tfr_time_s] = tfr_time_s
+    df[new_column_tfr_frequency_hz] = tfr_frequency_hz
+
+    return df
+
+
+def _tfr_bits_panda_cached(df: pd.DataFrame,
+                           sig_wf_label: str,
+                           sig_sample_rate_label: str,
+                           order_number_input: float,
+                           tfr_type: str,
+                           new_column_tfr_bits: str,
+                           new_column_tfr_time_s: str,
+                           new_column_tfr_frequency_hz: str,
+                           engine: str,
+                           n_workers: Optional[int],
+                           executor_type: str,
+                           cache_dir: str,
+                           cache_max_size_bytes: int,
+                           verbose: bool = False) -> pd.DataFrame:
+    """
+    tfr_bits_panda with the on-disk cache: cached rows are loaded, the rest are computed and stored.
+    See tfr_bits_panda for the parameters.
+
+    :return: input dataframe with new columns
+    """
+    tfr_bits = [float("NaN")]*len(df.index)
+    tfr_time_s = [float("NaN")]*len(df.index)
+    tfr_frequency_hz = [float("NaN")]*len(df.index)
+
+    missing_positions = []
+    missing_keys = []
+    for position, n in enumerate(df.index):
+        if sig_wf_label not in df.columns or type(df[sig_wf_label][n]) == float:
+            continue
+        key = rpd_tfr_cache.tfr_cache_key(sig_wf=df[sig_wf_label][n],
+                                          sample_rate_hz=df[sig_sample_rate_label][n],
+                                          tfr_type=tfr_type,
+                                          order_number_input=order_number_input)
+        tfr_cached = rpd_tfr_cache.load_tfr(cache_dir=cache_dir, key=key)
+        if tfr_cached is None:
+            missing_positions.append(position)
+            missing_keys.append(key)
+        else:
+            tfr_bits[position], tfr_time_s[position], tfr_frequency_hz[position] = tfr_cached
+
+    if verbose:
+        print(f"TFR cache: {len(df.index) - len(missing_positions)} of {len(df.index)} rows loaded from {cache_dir}")
+
+    if len(missing_positions) > 0:
+        df_missing = tfr_bits_panda(df=df.iloc[missing_positions][[sig_wf_label, sig_sample_rate_label]].copy(),
+                                    sig_wf_label=sig_wf_label,
+                                    sig_sample_rate_label=sig_sample_rate_label,
+                                    order_number_input=order_number_input,
+                                    tfr_type=tfr_type,
+                                    engine=engine,
+                                    n_workers=n_workers,
+                                    executor_type=executor_type)
+        for index_missing, (position, key) in enumerate(zip(missing_positions, missing_keys)):
+            tfr_bits[position] = df_missing["tfr_bits"].iloc[index_missing]
+            tfr_time_s[position] = df_missing["tfr_time_s"].iloc[index_missing]
+            tfr_frequency_hz[position] = df_missing["tfr_frequency_hz"].iloc[index_missing]
+            rpd_tfr_cache.save_tfr(cache_dir=cache_dir,
+                                   key=key,
+                                   tfr_bits=tfr_bits[position],
+                                   tfr_time_s=tfr_time_s[position],
+                                   tfr_frequency_hz=tfr_frequency_hz[position],
+                                   max_size_bytes=cache_max_size_bytes)
+
+    df[new_column_tfr_bits] = tfr_bits
+    df[new_column_tfr_time_s] = tfr_time_s
+    df[new_column_tfr_frequency_hz] = tfr_frequency_hz
+
+    return df
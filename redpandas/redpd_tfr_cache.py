@@ -0,0 +1,142 @@
+"""
+Content-addressed on-disk cache for Time Frequency Representations.
+"""
+
+import hashlib
+import os
+import tempfile
+from importlib import metadata
+from typing import Optional, Tuple
+
+import numpy as np
+
+TFR_CACHE_MAX_SIZE_BYTES: int = 2**31
+TFR_CACHE_SUFFIX: str = ".npz"
+
+
+def libquantum_version() -> str:
+    """
+    :return: installed libquantum version, 'unknown' if it cannot be found
+    """
+    try:
+        return metadata.version("libquantum")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def tfr_cache_key(sig_wf: np.ndarray,
+                  sample_rate_hz: float,
+                  tfr_type: str,
+                  order_number_input: float) -> str:
+    """
+    Cache key for the TFR of a signal: hash of the waveform (values, shape and dtype), sample rate, tfr type,
+    band order and libquantum version
+
+    :param sig_wf: signal waveform, 1D or (n_channels, n_samples)
+    :param sample_rate_hz: sample rate in Hz
+    :param tfr_type: 'cwt' or 'stft'
+    :param order_number_input: band order Nth
+    :return: sha256 hex digest
+    """
+    sig_wf = np.ascontiguousarray(sig_wf)
+    key_hash = hashlib.sha256()
+    key_hash.update(sig_wf.tobytes())
+    key_hash.update(repr((sig_wf.shape, sig_wf.dtype.str, float(sample_rate_hz), tfr_type,
+                          float(order_number_input), libquantum_version())).encode())
+    return key_hash.hexdigest()
+
+
+def tfr_cache_path(cache_dir: str,
+                   key: str) -> str:
+    """
+    :param cache_dir: cache directory
+    :param key: cache key from tfr_cache_key
+    :return: path of the cache file for key
+    """
+    return os.path.join(cache_dir, key + TFR_CACHE_SUFFIX)
+
+
+def load_tfr(cache_dir: str,
+             key: str) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Load a cached TFR and mark it as recently used
+
+    :param cache_dir: cache directory
+    :param key: cache key from tfr_cache_key
+    :return: tfr in bits, time in s and frequency in Hz, or None if not in the cache
+    """
+    path = tfr_cache_path(cache_dir, key)
+    try:
+        with np.load(path) as tfr_file:
+            tfr = tfr_file["tfr_bits"], tfr_file["tfr_time_s"], tfr_file["tfr_frequency_hz"]
+    except (OSError, KeyError, ValueError):
+        # Missing, or partially written/corrupt file: recompute
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return tfr
+
+
+def save_tfr(cache_dir: str,
+             key: str,
+             tfr_bits: np.ndarray,
+             tfr_time_s: np.ndarray,
+             tfr_frequency_hz: np.ndarray,
+             max_size_bytes: int = TFR_CACHE_MAX_SIZE_BYTES) -> None:
+    """
+    Store a TFR in the cache as a compressed .npz file, then evict least recently used files above max_size_bytes
+
+    :param cache_dir: cache directory, created if needed
+    :param key: cache key from tfr_cache_key
+    :param tfr_bits: tfr in bits
+    :param tfr_time_s: tfr time in s
+    :param tfr_frequency_hz: tfr frequency in Hz
+    :param max_size_bytes: maximum size of the cache directory in bytes. Default is 2 GiB
+    :return: None
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write to a temporary file and rename, readers never see a partial file
+    file_descriptor, path_temporary = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "wb") as tfr_file:
+            np.savez_compressed(tfr_file,
+                                tfr_bits=np.asarray(tfr_bits),
+                                tfr_time_s=np.asarray(tfr_time_s),
+                                tfr_frequency_hz=np.asarray(tfr_frequency_hz))
+        os.replace(path_temporary, tfr_cache_path(cache_dir, key))
+    except BaseException:
+        if os.path.exists(path_temporary):
+            os.remove(path_temporary)
+        raise
+    evict_tfr_cache(cache_dir=cache_dir, max_size_bytes=max_size_bytes)
+
+
+def evict_tfr_cache(cache_dir: str,
+                    max_size_bytes: int = TFR_CACHE_MAX_SIZE_BYTES) -> int:
+    """
+    Remove least recently used cache files until the cache directory is at most max_size_bytes
+
+    :param cache_dir: cache directory
+    :param max_size_bytes: maximum size of the cache directory in bytes. Default is 2 GiB
+    :return: number of files removed
+    """
+    cache_files = []
+    for entry in os.scandir(cache_dir):
+        if entry.is_file() and entry.name.endswith(TFR_CACHE_SUFFIX):
+            file_stat = entry.stat()
+            cache_files.append((file_stat.st_mtime, file_stat.st_size, entry.path))
+
+    cache_size_bytes = sum(file_size for _, file_size, _ in cache_files)
+    number_removed = 0
+    for _, file_size, path in sorted(cache_files):
+        if cache_size_bytes <= max_size_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            continue
+        cache_size_bytes -= file_size
+        number_removed += 1
+    return number_removed
@@ -2,11 +2,16 @@
 Calculate correlation.
 """
 
+from functools import partial
+from typing import List, Optional, Tuple, Union
+
 import numpy as np
 import pandas as pd
-from scipy import signal
+from scipy import fft, signal
 import matplotlib.pyplot as plt
-from typing import Tuple
+
+import redpandas.redpd_filter as rpd_filter
+import redpandas.redpd_parallel as rpd_par
 
 
 def find_nearest(array: np.ndarray,
@@ -69,12 +74,139 @@ def most_similar_station_index(xnorm_max) -> Tuple[int, float]:
     return xcorr_ref_index, xcorr_mean_max
 
 
+def xcorr_lags(m_points: int,
+               n_points: int) -> np.ndarray:
+    """
+    Lags in points of the cross correlation of sig_m (reference) with sig_n, in the order and with the sign
+    convention of the xcorr_pandas results: 'full' correlation for unequal lengths, 'same' for equal lengths.
+    A positive lag means sig_m[i + lag] lines up with sig_n[i].
+
+    :param m_points: number of points in sig_m
+    :param n_points: number of points in sig_n
+    :return: numpy array with lags in points
+    """
+    if n_points > m_points:
+        return np.arange(1-n_points, m_points)
+    elif n_points < m_points:
+        # Cross correlation of sig_n with sig_m, sign flipped
+        return -np.arange(1-m_points, n_points)
+    else:
+        return np.arange(-int(n_points/2), n_points - int(n_points/2))
+
+
+def xcorr_fft_points(max_points: int) -> int:
+    """
+    Shared FFT length so the circular cross correlation of any two signals up to max_points long has no wrap-around
+
+    :param max_points: number of points in the longest signal
+    :return: number of points for the FFT
+    """
+    return fft.next_fast_len(max(2*max_points - 1, 1), real=True)
+
+
+def xcorr_from_fft(sig_m_fft: np.ndarray,
+                   sig_n_fft: np.ndarray,
+                   fft_points: int) -> np.ndarray:
+    """
+    Circular cross correlation c[k] = sum_i sig_m[i + k] * sig_n[i] from the real FFTs of the zero padded signals.
+    Negative lags are wrapped at the end, so c[lags % fft_points] is the cross correlation at lags.
+
+    :param sig_m_fft: real FFT of sig_m, computed with fft_points
+    :param sig_n_fft: real FFT of sig_n, computed with fft_points. Last axis must broadcast with sig_m_fft
+    :param fft_points: number of points used in the FFTs
+    :return: numpy array with the circular cross correlation
+    """
+    return fft.irfft(sig_m_fft * np.conj(sig_n_fft), n=fft_points, axis=-1)
+
+
+def _xcorr_peak(xcorr: np.ndarray,
+                xcorr_lags_points: np.ndarray,
+                abs_xcorr: bool) -> Tuple[float, int]:
+    """
+    Peak of the normalized cross correlation and its offset
+
+    :param xcorr: normalized cross correlation
+    :param xcorr_lags_points: lags of xcorr in points
+    :param abs_xcorr: if True, the peak can be negative (pi phase shift)
+    :return: cross correlation peak value and offset in points
+    """
+    if abs_xcorr:
+        xcorr_offset_index = np.argmax(np.abs(xcorr))
+    else:
+        xcorr_offset_index = np.argmax(xcorr)
+    return xcorr[xcorr_offset_index], xcorr_lags_points[xcorr_offset_index]
+
+
+def _xcorr_fft_pairs(pairs: List[Tuple[int, int]],
+                     sig_fft: np.ndarray,
+                     sig_points: np.ndarray,
+                     sig_std: np.ndarray,
+                     fft_points: int,
+                     abs_xcorr: bool) -> List[Tuple[int, int, float, int, float, int]]:
+    """
+    Cross correlation peaks for a block of signal pairs, both orders (m, n) and (n, m) from a single cross spectrum
+
+    :param pairs: list of (m, n) positions with m <= n
+    :param sig_fft: real FFT of every signal (one row per signal), computed with fft_points
+    :param sig_points: number of points of every signal
+    :param sig_std: standard deviation of every signal
+    :param fft_points: number of points used in the FFTs
+    :param abs_xcorr: if True, the peak can be negative (pi phase shift)
+    :return: list of (m, n, peak (m, n), offset points (m, n), peak (n, m), offset points (n, m))
+    """
+    results = []
+    for m, n in pairs:
+        xcorr_circular = xcorr_from_fft(sig_fft[m], sig_fft[n], fft_points)
+        xcorr_circular /= np.sqrt(sig_points[m]*sig_points[n]) * sig_std[m] * sig_std[n]
+
+        lags_mn = xcorr_lags(m_points=sig_points[m], n_points=sig_points[n])
+        peak_mn, offset_mn = _xcorr_peak(xcorr_circular[lags_mn % fft_points], lags_mn, abs_xcorr)
+        if m == n:
+            results.append((m, n, peak_mn, offset_mn, peak_mn, offset_mn))
+            continue
+        # The (n, m) cross correlation is the (m, n) one at negated lags
+        lags_nm = xcorr_lags(m_points=sig_points[n], n_points=sig_points[m])
+        peak_nm, offset_nm = _xcorr_peak(xcorr_circular[(-lags_nm) % fft_points], lags_nm, abs_xcorr)
+        results.append((m, n, peak_mn, offset_mn, peak_nm, offset_nm))
+    return results
+
+
+def _xcorr_fft_pairs_shared(pairs: List[Tuple[int, int]],
+                            sig_fft_descriptor: Tuple[str, Tuple[int, ...], str],
+                            sig_points: np.ndarray,
+                            sig_std: np.ndarray,
+                            fft_points: int,
+                            abs_xcorr: bool) -> List[Tuple[int, int, float, int, float, int]]:
+    """
+    _xcorr_fft_pairs for process pool workers, reading the signal FFTs from shared memory
+
+    :param pairs: list of (m, n) positions with m <= n
+    :param sig_fft_descriptor: descriptor from rpd_par.share_array of the (number of signals, frequencies) FFT array
+    :param sig_points: number of points of every signal
+    :param sig_std: standard deviation of every signal
+    :param fft_points: number of points used in the FFTs
+    :param abs_xcorr: if True, the peak can be negative (pi phase shift)
+    :return: list of (m, n, peak (m, n), offset points (m, n), peak (n, m), offset points (n, m))
+    """
+    shm, sig_fft = rpd_par.attach_shared_array(sig_fft_descriptor)
+    try:
+        return _xcorr_fft_pairs(pairs=pairs, sig_fft=sig_fft, sig_points=sig_points, sig_std=sig_std,
+                                fft_points=fft_points, abs_xcorr=abs_xcorr)
+    finally:
+        del sig_fft
+        shm.close()
+
+
 # Sort out time first: time gate input, refer to shared datum, correct times
 def xcorr_pandas(df: pd.DataFrame,
                  sig_wf_label: str,
                  sig_sample_rate_label: str,
                  fs_fractional_tolerance: float = 0.02,
-                 abs_xcorr: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+                 abs_xcorr: bool = True,
+                 engine: str = 'fft',
+                 n_workers: Optional[int] = None,
+                 common_sample_rate_hz: Optional[Union[str, float]] = None
+                 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
     Returns square matrix, a concise snapshot of the self-similarity of the input data set.
 
@@ -83,12 +215,35 @@ def xcorr_pandas(df: pd.DataFrame,
     :param sig_sample_rate_label: string for the sample rate in Hz column name in df
     :param fs_fractional_tolerance: difference in sample rate (in Hz) tolerated. Default is 0.02
     :param abs_xcorr: Default is True
+    :param engine: 'fft' computes the FFT of every signal once and each pair's cross spectrum once for both (m, n)
+        and (n, m); 'loop' correlates every ordered pair with scipy.signal.correlate. Default is 'fft'
+    :param n_workers: number of processes for the 'fft' engine pairs. Default is None (serial)
+    :param common_sample_rate_hz: optional common sample rate in Hz, or 'Min' for the minimum sample rate in df.
+        Signals are resampled to it (resample_common_rate_pandas, added as new columns to df and reused by later calls
+        while the signals are unchanged) so every pair is covered; offsets are then in points at the common
+        sample rate. Default is None, no resampling
     :return: xcorr normalized, offset in seconds, and offset points
     """
+    if common_sample_rate_hz is not None:
+        df, sig_wf_label, sig_sample_rate_label = \
+            rpd_filter.resample_common_rate_pandas(df=df,
+                                                   sig_wf_label=sig_wf_label,
+                                                   sample_rate_hz_label=sig_sample_rate_label,
+                                                   common_sample_rate_hz=common_sample_rate_hz)
 
     number_sig = len(df.index)
     print("Number of signals:", number_sig)
 
+    if engine == 'fft':
+        return _xcorr_pandas_fft(df=df,
+                                 sig_wf_label=sig_wf_label,
+                                 sig_sample_rate_label=sig_sample_rate_label,
+                                 fs_fractional_tolerance=fs_fractional_tolerance,
+                                 abs_xcorr=abs_xcorr,
+                                 n_workers=n_workers)
+    elif engine != 'loop':
+        raise ValueError(f"Unknown xcorr engine '{engine}'. Type 'fft' or 'loop'.")
+
     # Initialize
     xcorr_offset_points = np.zeros((number_sig, number_sig))
     xcorr_offset_seconds = np.copy(xcorr_offset_points)
@@ -165,6 +320,131 @@ def xcorr_pandas(df: pd.DataFrame,
     return xcorr_normalized_max, xcorr_offset_seconds, xcorr_offset_points
 
 
+def _xcorr_pandas_fft(df: pd.DataFrame,
+                      sig_wf_label: str,
+                      sig_sample_rate_label: str,
+                      fs_fractional_tolerance: float = 0.02,
+                      abs_xcorr: bool = True,
+                      n_workers: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    FFT engine for xcorr_pandas: every signal is transformed once at a shared padded length and the
+    N(N-1)/2 cross spectra are formed by multiplication, each giving both the (m, n) and (n, m) results
+
+    :param df: input pandas data frame
+    :param sig_wf_label: string for the waveform column name in df
+    :param sig_sample_rate_label: string for the sample rate in Hz column name in df
+    :param fs_fractional_tolerance: difference in sample rate (in Hz) tolerated. Default is 0.02
+    :param abs_xcorr: Default is True
+    :param n_workers: number of processes to spread blocks of pairs. Default is None (serial)
+    :return: xcorr normalized, offset in seconds, and offset points
+    """
+    number_sig = len(df.index)
+    sample_rate_hz = np.array([df[sig_sample_rate_label][m] for m in df.index], dtype=float)
+
+    # Initialize
+    xcorr_offset_points = np.zeros((number_sig, number_sig))
+    xcorr_offset_seconds = np.copy(xcorr_offset_points)
+    xcorr_normalized_max = np.copy(xcorr_offset_points)
+
+    # Tolerance is relative to the reference m, so (m, n) and (n, m) are checked separately
+    sample_rate_ok = np.abs(sample_rate_hz[:, np.newaxis] - sample_rate_hz[np.newaxis, :]) \
+        <= fs_fractional_tolerance*sample_rate_hz[:, np.newaxis]
+    for m, n in zip(*np.nonzero(~sample_rate_ok)):
+        print("Sample rates out of tolerance for index m,n =" + str(m) + "," + str(n))
+
+    pairs = [(m, n) for m in range(number_sig) for n in range(m, number_sig)
+             if sample_rate_ok[m, n] or sample_rate_ok[n, m]]
+    if len(pairs) == 0:
+        return xcorr_normalized_max, xcorr_offset_seconds, xcorr_offset_points
+
+    sig_wf = [np.asarray(df[sig_wf_label][m], dtype=float) for m in df.index]
+    sig_points = np.array([len(sig) for sig in sig_wf])
+    sig_std = np.array([sig.std() for sig in sig_wf])
+    fft_points = xcorr_fft_points(int(np.max(sig_points)))
+    sig_fft = np.array([fft.rfft(sig, n=fft_points) for sig in sig_wf])
+
+    if n_workers is None or n_workers <= 1:
+        all_results = _xcorr_fft_pairs(pairs=pairs, sig_fft=sig_fft, sig_points=sig_points, sig_std=sig_std,
+                                       fft_points=fft_points, abs_xcorr=abs_xcorr)
+    else:
+        # Interleave so every block gets a similar share of long and short signals
+        number_blocks = min(len(pairs), 4*n_workers)
+        pair_blocks = [pairs[i::number_blocks] for i in range(number_blocks)]
+        # The spectra go to the workers once through shared memory, not pickled with every block
+        shm, descriptor = rpd_par.share_array(sig_fft)
+        try:
+            job = partial(_xcorr_fft_pairs_shared, sig_fft_descriptor=descriptor, sig_points=sig_points,
+                          sig_std=sig_std, fft_points=fft_points, abs_xcorr=abs_xcorr)
+            block_results_list = rpd_par.parallel_map(job, pair_blocks, n_workers=n_workers)
+        finally:
+            shm.close()
+            shm.unlink()
+        all_results = [result for block_results in block_results_list for result in block_results]
+
+    for m, n, peak_mn, offset_mn, peak_nm, offset_nm in all_results:
+        if sample_rate_ok[m, n]:
+            xcorr_normalized_max[m, n] = peak_mn
+            xcorr_offset_seconds[m, n] = offset_mn/sample_rate_hz[n]
+            xcorr_offset_points[m, n] = offset_mn
+        if sample_rate_ok[n, m]:
+            xcorr_normalized_max[n, m] = peak_nm
+            xcorr_offset_seconds[n, m] = offset_nm/sample_rate_hz[m]
+            xcorr_offset_points[n, m] = offset_nm
+
+    return xcorr_normalized_max, xcorr_offset_seconds, xcorr_offset_points
+
+
+def xcorr_reference_fft(sig_m: np.ndarray,
+                        sig_n_list: List[np.ndarray],
+                        abs_xcorr: bool = True,
+                        return_xcorr_full: bool = False) -> Tuple[List[float], List[int], List[np.ndarray]]:
+    """
+    Cross correlation of a reference signal with a list of signals. The reference FFT is computed once per padded
+    length and the signals are batched by number of points, one FFT call per group.
+
+    :param sig_m: reference signal waveform
+    :param sig_n_list: list of signal waveforms to correlate with the reference
+    :param abs_xcorr: if True, the peak can be negative (pi phase shift). Default is True
+    :param return_xcorr_full: if True, return the normalized cross correlation arrays. Default is False
+    :return: lists with cross correlation peak, offset in points and (if requested, else empty) normalized cross
+        correlation, in the order of sig_n_list
+    """
+    sig_m = np.asarray(sig_m, dtype=float)
+    m_points = len(sig_m)
+    sig_m_std = sig_m.std()
+
+    xcorr_normalized_max = [np.nan]*len(sig_n_list)
+    xcorr_offset_points = [0]*len(sig_n_list)
+    xcorr_full = [None]*len(sig_n_list)
+
+    # Group signals by length, they share lags and padded length
+    groups = {}
+    for position, sig_n in enumerate(sig_n_list):
+        groups.setdefault(len(sig_n), []).append(position)
+
+    sig_m_fft_cache = {}
+    for n_points, positions in groups.items():
+        fft_points = fft.next_fast_len(m_points + n_points - 1, real=True)
+        if fft_points not in sig_m_fft_cache:
+            sig_m_fft_cache[fft_points] = fft.rfft(sig_m, n=fft_points)
+        sig_n_group = np.vstack([np.asarray(sig_n_list[position], dtype=float) for position in positions])
+        xcorr_circular = xcorr_from_fft(sig_m_fft_cache[fft_points], fft.rfft(sig_n_group, n=fft_points, axis=-1),
+                                        fft_points)
+
+        lags = xcorr_lags(m_points=m_points, n_points=n_points)
+        xcorr_group = xcorr_circular[:, lags % fft_points]
+        xcorr_group /= (np.sqrt(n_points*m_points) * sig_n_group.std(axis=-1) * sig_m_std)[:, np.newaxis]
+
+        for xcorr, position in zip(xcorr_group, positions):
+            xcorr_normalized_max[position], xcorr_offset_points[position] = _xcorr_peak(xcorr, lags, abs_xcorr)
+            if return_xcorr_full:
+                xcorr_full[position] = xcorr
+
+    if not return_xcorr_full:
+        xcorr_full = []
+    return xcorr_normalized_max, xcorr_offset_points, xcorr_full
+
+
 def xcorr_re_ref_pandas(df: pd.DataFrame,
                         ref_id_label: str,
                         sig_id_label: str,
@@ -176,7 +456,9 @@ def xcorr_re_ref_pandas(df: pd.DataFrame,
                         new_column_label_xcorr_offset_points: str = 'xcorr_offset_points',
                         new_column_label_xcorr_offset_seconds: str = 'xcorr_offset_seconds',
                         new_column_label_xcorr_normalized_max: str = 'xcorr_normalized_max',
-                        new_column_label_xcorr_full_array: str = 'xcorr_full') -> pd.DataFrame:
+                        new_column_label_xcorr_full_array: str = 'xcorr_full',
+                        engine: str = 'fft',
+                        common_sample_rate_hz: Optional[Union[str, float]] = None) -> pd.DataFrame:
 
     """
     Returns new pandas columns per station with cross-correlation results relative to a reference station
@@ -193,8 +475,23 @@ def xcorr_re_ref_pandas(df: pd.DataFrame,
     :param new_column_label_xcorr_offset_seconds: label for new column with xcorr offset seconds
     :param new_column_label_xcorr_normalized_max: label for new column with xcorr normalized
     :param new_column_label_xcorr_full_array: label for new column with xcorr full array
+    :param engine: 'fft' transforms the reference once per padded length and batches stations of equal length;
+        'loop' correlates station by station with scipy.signal.correlate. Default is 'fft'
+    :param common_sample_rate_hz: optional common sample rate in Hz, or 'Min' for the minimum sample rate in df.
+        Signals are resampled to it (resample_common_rate_pandas, added as new columns to df and reused by later calls
+        while the signals are unchanged) so every pair is covered; offsets are then in points at the common
+        sample rate. Default is None, no resampling
     :return: input dataframe with new columns
     """
+    if engine not in ['fft', 'loop']:
+        raise ValueError(f"Unknown xcorr engine '{engine}'. Type 'fft' or 'loop'.")
+
+    if common_sample_rate_hz is not None:
+        df, sig_wf_label, sig_sample_rate_label = \
+            rpd_filter.resample_common_rate_pandas(df=df,
+                                                   sig_wf_label=sig_wf_label,
+                                                   sample_rate_hz_label=sig_sample_rate_label,
+                                                   common_sample_rate_hz=common_sample_rate_hz)
 
     number_sig = len(df.index)
     print("XCORR Nmber of signals:", number_sig)
@@ -215,73 +512,92 @@ def xcorr_re_ref_pandas(df: pd.DataFrame,
         sig_m = np.copy(df[sig_wf_label][m])
         m_points = len(sig_m)
 
-        for n in df.index:
-            sample_rate_condition = np.abs(df[sig_sample_rate_label][m] - df[sig_sample_rate_label][n]) \
-                                    > fs_fractional_tolerance*df[sig_sample_rate_label][m]
-            if sample_rate_condition:
-                print("Sample rates out of tolerance")
-                continue
-            else:
-                # Generalized sensor cross correlations, including unequal lengths
-                sig_n = np.copy(df[sig_wf_label][n])
-                n_points = len(sig_n)
-
-                if n_points > m_points:
-                    """Cross Correlation 'full' sums over the dimension of sig_n"""
-                    xcorr_indexes = np.arange(1-n_points, m_points)
-                    # Ensure it is a float
-                    xcorr = signal.correlate(sig_m, sig_n, mode='full')
-                    # Normalize
-                    xcorr /= np.sqrt(n_points*m_points) * sig_n.std() * sig_m.std()
-                    if abs_xcorr:
-                        # Allows negative peak in cross correlation (pi phase shift)
-                        xcorr_offset_index = np.argmax(np.abs(xcorr))
-                    else:
-                        # Must be in phase -  for array processing
-                        xcorr_offset_index = np.argmax(xcorr)
-                    xcorr_offset_samples = xcorr_indexes[xcorr_offset_index]
-                elif n_points < m_points:
-                    """Cross Correlation 'full' sums over the dimension of sig_m"""
-                    xcorr_indexes = np.arange(1-m_points, n_points)
-                    xcorr = signal.correlate(sig_n, sig_m, mode='full')
-                    # Normalize
-                    xcorr /= np.sqrt(n_points*m_points) * sig_n.std() * sig_m.std()
-                    if abs_xcorr:
-                        # Allows negative peak in cross correlation (pi phase shift)
-                        xcorr_offset_index = np.argmax(np.abs(xcorr))
-                    else:
-                        # Must be in phase -  for array processing
-                        xcorr_offset_index = np.argmax(xcorr)
-                    # Flip sign
-                    xcorr_offset_samples = -xcorr_indexes[xcorr_offset_index]
-                elif n_points == m_points:
-                    """Cross correlation is centered in the middle of the record and has length n_points"""
-                    # Fastest, o(NX) and can use FFT solution
-                    if n_points % 2 == 0:
-                        xcorr_indexes = np.arange(-int(n_points/2), int(n_points/2))
-                    else:
-                        xcorr_indexes = np.arange(-int(n_points/2), int(n_points/2)+1)
-                    xcorr = signal.correlate(sig_m, sig_n, mode='same')
-                    # Normalize
-                    xcorr /= np.sqrt(n_points*m_points) * sig_n.std() * sig_m.std()
-                    if abs_xcorr:
-                        # Allows negative peak in cross correlation (pi phase shift)
-                        xcorr_offset_index = np.argmax(np.abs(xcorr))
-                    else:
-                        # Must be in phase -  for array processing
-                        xcorr_offset_index = np.argmax(xcorr)
-                    xcorr_offset_samples = xcorr_indexes[xcorr_offset_index]
-                else:
-                    print('One of the waveforms is broken')
+        if engine == 'fft':
+            sig_n_index = []
+            for n in df.index:
+                sample_rate_condition = np.abs(df[sig_sample_rate_label][m] - df[sig_sample_rate_label][n]) \
+                                        > fs_fractional_tolerance*df[sig_sample_rate_label][m]
+                if sample_rate_condition:
+                    print("Sample rates out of tolerance")
                     continue
-
-                # Main export parameters
-                # Allows negative peak in cross correlation (pi phase shift) in raw waveform, unless the input is power
-                xcorr_normalized_max.append(xcorr[xcorr_offset_index])
-                xcorr_offset_points.append(xcorr_offset_samples)
-                xcorr_offset_seconds.append(xcorr_offset_samples/df[sig_sample_rate_label][n])
-                if return_xcorr_full:
-                    xcorr_full.append(xcorr)
+                sig_n_index.append(n)
+
+            xcorr_normalized_max, xcorr_offset_points, xcorr_full = \
+                xcorr_reference_fft(sig_m=sig_m,
+                                    sig_n_list=[df[sig_wf_label][n] for n in sig_n_index],
+                                    abs_xcorr=abs_xcorr,
+                                    return_xcorr_full=return_xcorr_full)
+            xcorr_offset_seconds = [xcorr_offset_samples/df[sig_sample_rate_label][n]
+                                    for xcorr_offset_samples, n in zip(xcorr_offset_points, sig_n_index)]
+        else:
+            for n in df.index:
+                sample_rate_condition = np.abs(df[sig_sample_rate_label][m] - df[sig_sample_rate_label][n]) \
+                                        > fs_fractional_tolerance*df[sig_sample_rate_label][m]
+                if sample_rate_condition:
+                    print("Sample rates out of tolerance")
+                    continue
+                else:
+                    # Generalized sensor cross correlations, including unequal lengths
+                    sig_n = np.copy(df[sig_wf_label][n])
+                    n_points = len(sig_n)
+
+                    if n_points > m_points:
+                        """Cross Correlation 'full' sums over the dimension of sig_n"""
+                        xcorr_indexes = np.arange(1-n_points, m_points)
+                        # Ensure it is a float
+                        xcorr = signal.correlate(sig_m, sig_n, mode='full')
+                        # Normalize
+                        xcorr /= np.sqrt(n_points*m_points) * sig_n.std() * sig_m.std()
+                        if abs_xcorr:
+                            # Allows negative peak in cross correlation (pi phase shift)
+                            xcorr_offset_index = np.argmax(np.abs(xcorr))
+                        else:
+                            # Must be in phase -  for array processing
+                            xcorr_offset_index = np.argmax(xcorr)
+                        xcorr_offset_samples = xcorr_indexes[xcorr_offset_index]
+                    elif n_points < m_points:
+                        """Cross Correlation 'full' sums over the dimension of sig_m"""
+                        xcorr_indexes = np.arange(1-m_points, n_points)
+                        xcorr = signal.correlate(sig_n, sig_m, mode='full')
+                        # Normalize
+                        xcorr /= np.sqrt(n_points*m_points) * sig_n.std() * sig_m.std()
+                        if abs_xcorr:
+                            # Allows negative peak in cross correlation (pi phase shift)
+                            xcorr_offset_index = np.argmax(np.abs(xcorr))
+                        else:
+                            # Must be in phase -  for array processing
+                            xcorr_offset_index = np.argmax(xcorr)
+                        # Flip sign
+                        xcorr_offset_samples = -xcorr_indexes[xcorr_offset_index]
+                    elif n_points == m_points:
+                        """Cross correlation is centered in the middle of the record and has length n_points"""
+                        # Fastest, o(NX) and can use FFT solution
+                        if n_points % 2 == 0:
+                            xcorr_indexes = np.arange(-int(n_points/2), int(n_points/2))
+                        else:
+                            xcorr_indexes = np.arange(-int(n_points/2), int(n_points/2)+1)
+                        xcorr = signal.correlate(sig_m, sig_n, mode='same')
+                        # Normalize
+                        xcorr /= np.sqrt(n_points*m_points) * sig_n.std() * sig_m.std()
+                        if abs_xcorr:
+                            # Allows negative peak in cross correlation (pi phase shift)
+                            xcorr_offset_index = np.argmax(np.abs(xcorr))
+                        else:
+                            # Must be in phase -  for array processing
+                            xcorr_offset_index = np.argmax(xcorr)
+                        xcorr_offset_samples = xcorr_indexes[xcorr_offset_index]
+                    else:
+                        print('One of the waveforms is broken')
+                        continue
+
+                    # Main export parameters
+                    # Allows negative peak in cross correlation (pi phase shift) in raw waveform,
+                    # unless the input is power
+                    xcorr_normalized_max.append(xcorr[xcorr_offset_index])
+                    xcorr_offset_points.append(xcorr_offset_samples)
+                    xcorr_offset_seconds.append(xcorr_offset_samples/df[sig_sample_rate_label][n])
+                    if return_xcorr_full:
+                        xcorr_full.append(xcorr)
 
         # Convert to columns and add it to df
         df[new_column_label_xcorr_normalized_max] = xcorr_normalized_max
@@ -312,7 +628,8 @@ def spectcorr_re_ref_pandas(df: pd.DataFrame,
                             new_column_label_xcorr_peak_frequency_hz: str = 'spectcorr_peak_frequency_hz',
                             new_column_label_xcorr_full_array: str = 'spectcorr_full',
                             new_column_label_xcorr_full_per_band: str = 'spectcorr_per_band_full',
-                            new_column_label_xcorr_full_frequency_hz: str = 'spectcorr_frequency_hz') -> pd.DataFrame:
+                            new_column_label_xcorr_full_frequency_hz: str = 'spectcorr_frequency_hz',
+                            engine: str = 'fft') -> pd.DataFrame:
     """
     Returns new pandas columns per station with spectral correlation results relative to a reference station
 
@@ -332,8 +649,12 @@ def spectcorr_re_ref_pandas(df: pd.DataFrame,
     :param new_column_label_xcorr_full_array: label for new column with xcorr full array
     :param new_column_label_xcorr_full_per_band: label for new column with xcorr full per band
     :param new_column_label_xcorr_full_frequency_hz: label for new column with xcorr frequencies
+    :param engine: 'fft' correlates all frequency bands at once along the time axis, reusing the reference TFR
+        transform for every station; 'loop' correlates band by band with scipy.signal.correlate. Default is 'fft'
     :return: input df with new columns
     """
+    if engine not in ['fft', 'loop']:
+        raise ValueError(f"Unknown spectcorr engine '{engine}'. Type 'fft' or 'loop'.")
 
     # Have to learn how to use/validate correlate2D
     number_sig = len(df.index)
@@ -382,6 +703,11 @@ def spectcorr_re_ref_pandas(df: pd.DataFrame,
         if np.amax(ref_tfr_m) <= 0:
             ref_tfr_m -= np.min(ref_tfr_m)
 
+        if engine == 'fft':
+            # Transform the reference bands once, all stations have the same time grid
+            fft_points = xcorr_fft_points(ref_columns)
+            ref_tfr_m_fft = fft.rfft(np.asarray(ref_tfr_m, dtype=float), n=fft_points, axis=-1)
+
         for n in df.index:
             # Generalized sensor cross correlations, including unequal time lengths
             sig_tfr_n = np.copy(df[sig_tfr_label][n])[freq_index_low:freq_index_high, :]
@@ -402,10 +728,17 @@ def spectcorr_re_ref_pandas(df: pd.DataFrame,
             if np.amax(sig_tfr_n) <= 0:
                 sig_tfr_n -= np.min(sig_tfr_n)
 
-            # normalize per band
-            for k in np.arange(ref_rows):
-                spect_corr[k, :] = signal.correlate(ref_tfr_m[k, :], sig_tfr_n[k, :], mode='same')
-                spect_corr_per_band[k, :] = spect_corr[k, :]/np.max(np.abs(spect_corr[k, :]))
+            if engine == 'fft':
+                # All bands at once, 'same' correlation lags picked from the circular correlation
+                sig_tfr_n_fft = fft.rfft(np.asarray(sig_tfr_n, dtype=float), n=fft_points, axis=-1)
+                spect_corr[:, :] = xcorr_from_fft(ref_tfr_m_fft, sig_tfr_n_fft, fft_points)[:, xcorr_index % fft_points]
+                # normalize per band
+                spect_corr_per_band[:, :] = spect_corr/np.max(np.abs(spect_corr), axis=1, keepdims=True)
+            else:
+                # normalize per band
+                for k in np.arange(ref_rows):
+                    spect_corr[k, :] = signal.correlate(ref_tfr_m[k, :], sig_tfr_n[k, :], mode='same')
+                    spect_corr_per_band[k, :] = spect_corr[k, :]/np.max(np.abs(spect_corr[k, :]))
             # Normalize by max
             spect_corr /= np.max(np.abs(spect_corr))
             frequency_index, time_index = np.unravel_index(np.argmax(spect_corr), spect_corr.shape)
@@ -0,0 +1,77 @@
+import unittest
+import numpy as np
+import pandas as pd
+from scipy import signal
+import redpandas.redpd_cohere as rpd_cohere
+import redpandas.redpd_xcorr as rpd_xcorr
+
+
+class TestCoherenceRefPandas(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(seed=6)
+        source = rng.normal(size=8000)
+        # Equal lengths use the cached segments; the shorter station falls back to scipy
+        lengths = [8000, 8000, 8000, 7000]
+        self.df = pd.DataFrame({"station_id": ["0", "1", "2", "3"],
+                                "audio_wf": [source[:length] + 0.5*rng.normal(size=length) for length in lengths],
+                                "audio_sample_rate_nominal_hz": [800., 800., 805., 800.]})
+
+    def test_fft_engine_matches_scipy(self):
+        for export_option in ['max_coherence', 'ref_frequency']:
+            results = {}
+            for engine in ['scipy', 'fft']:
+                results[engine] = \
+                    rpd_cohere.coherence_re_ref_pandas(df=self.df.copy(), ref_id="1", sig_id_label="station_id",
+                                                       sig_wf_label="audio_wf",
+                                                       sig_sample_rate_label="audio_sample_rate_nominal_hz",
+                                                       window_seconds=0.5, sig_calib=2.,
+                                                       export_option=export_option, engine=engine)
+            # Reference against itself has coherence 1 at every frequency, the peak location is arbitrary
+            np.testing.assert_allclose(results['fft']["coherence_value"][1], 1.)
+            for column in ["coherence_frequency", "coherence_value", "coherence_response_magnitude_bits",
+                           "coherence_response_phase_degrees"]:
+                np.testing.assert_allclose(results['fft'][column].drop(index=1),
+                                           results['scipy'][column].drop(index=1), rtol=1e-8, atol=1e-8)
+
+    def test_fft_engine_process_pool(self):
+        df_serial = rpd_cohere.coherence_re_ref_pandas(df=self.df.copy(), ref_id="0", sig_id_label="station_id",
+                                                       sig_wf_label="audio_wf",
+                                                       sig_sample_rate_label="audio_sample_rate_nominal_hz",
+                                                       window_seconds=0.5)
+        df_pool = rpd_cohere.coherence_re_ref_pandas(df=self.df.copy(), ref_id="0", sig_id_label="station_id",
+                                                     sig_wf_label="audio_wf",
+                                                     sig_sample_rate_label="audio_sample_rate_nominal_hz",
+                                                     window_seconds=0.5, n_workers=2)
+        pd.testing.assert_frame_equal(df_pool.drop(columns="audio_wf"), df_serial.drop(columns="audio_wf"))
+
+    def test_common_sample_rate(self):
+        # Station 2 recorded at twice the sample rate is out of tolerance without a common sample rate
+        self.df.at[2, "audio_wf"] = signal.resample_poly(self.df["audio_wf"][2], 2, 1)
+        self.df.at[2, "audio_sample_rate_nominal_hz"] = 1600.
+        df = rpd_cohere.coherence_re_ref_pandas(df=self.df.copy(), ref_id="0", sig_id_label="station_id",
+                                                sig_wf_label="audio_wf",
+                                                sig_sample_rate_label="audio_sample_rate_nominal_hz",
+                                                window_seconds=0.5, common_sample_rate_hz='Min')
+        self.assertEqual(len(df["coherence_value"]), len(self.df))
+        self.assertEqual(df["audio_sample_rate_nominal_hz_800hz"][2], 800.)
+        self.assertGreater(df["coherence_value"][2], 0.5)
+
+    def test_common_sample_rate_shared_with_xcorr(self):
+        self.df.at[2, "audio_wf"] = signal.resample_poly(self.df["audio_wf"][2], 2, 1)
+        self.df.at[2, "audio_sample_rate_nominal_hz"] = 1600.
+        df = self.df.copy()
+        rpd_xcorr.xcorr_re_ref_pandas(df=df, ref_id_label="0", sig_id_label="station_id", sig_wf_label="audio_wf",
+                                      sig_sample_rate_label="audio_sample_rate_nominal_hz", common_sample_rate_hz=800.)
+        resampled = df["audio_wf_800hz"][2]
+        rpd_cohere.coherence_re_ref_pandas(df=df, ref_id="0", sig_id_label="station_id", sig_wf_label="audio_wf",
+                                           sig_sample_rate_label="audio_sample_rate_nominal_hz",
+                                           window_seconds=0.5, common_sample_rate_hz=800.)
+        # Coherence reuses the signals resampled for the cross correlation
+        self.assertIs(df["audio_wf_800hz"][2], resampled)
+
+    def tearDown(self) -> None:
+        self.df = None
+
+
+if __name__ == '__main__':
+    unittest.main()
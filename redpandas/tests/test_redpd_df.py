@@ -1,7 +1,10 @@
 import unittest
+import numpy as np
 import pandas as pd
 import os
 import shutil
+import tempfile
+import pyarrow as pa
 from redvox.common.data_window import DataWindow
 import redpandas.redpd_df as rpd_df
 from redpandas.tests import TEST_DATA_DIR
@@ -104,5 +107,143 @@ class TestRedpdDataframe(unittest.TestCase):
         shutil.rmtree(f"{TEST_DATA_DIR}/rpd_files", ignore_errors=True)
 
 
+class FailingStation:
+    """Station without data, station_to_dict_from_dw fails on it"""
+    def id(self) -> str:
+        return "1637610021"
+
+
+class FailingDataWindow:
+    def stations(self) -> list:
+        return [FailingStation(), FailingStation()]
+
+    def sdk_version(self) -> str:
+        return "3.0.0"
+
+
+class TestRedpdDataframeFailedStations(unittest.TestCase):
+    def test_all_stations_failed(self):
+        with self.assertRaises(ValueError) as context:
+            rpd_df.redpd_dataframe(input_dw=FailingDataWindow())
+        self.assertIn("1637610021", str(context.exception))
+
+    def test_no_stations(self):
+        df = rpd_df.redpd_dataframe(input_dw=DataWindow(event_name="empty"))
+        self.assertTrue(df.empty)
+
+
+class TestArrowParquet(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(seed=15)
+        self.output_dir = tempfile.TemporaryDirectory()
+        self.df = pd.DataFrame({"station_id": ["1", "2", "3"],
+                                "audio_wf": [rng.normal(size=100), rng.normal(size=80), rng.normal(size=100)],
+                                "barometer_wf_raw": [rng.normal(size=(1, 10)), rng.normal(size=(1, 12)),
+                                                     float("NaN")],
+                                "accelerometer_wf_raw": [rng.normal(size=(3, 20)) for _ in range(3)],
+                                "tfr_bits": [rng.normal(size=(3, 4, 5)).astype(np.float32) for _ in range(3)],
+                                "audio_sample_rate_nominal_hz": [80., 80., 80.]})
+
+    def assert_df_equal(self, df_loaded: pd.DataFrame):
+        self.assertEqual(list(df_loaded.columns), list(self.df.columns))
+        self.assertEqual(list(df_loaded["station_id"]), list(self.df["station_id"]))
+        for column in ["audio_wf", "barometer_wf_raw", "accelerometer_wf_raw", "tfr_bits"]:
+            for n in range(2):
+                self.assertEqual(df_loaded[column][n].dtype, self.df[column][n].dtype)
+                np.testing.assert_array_equal(df_loaded[column][n], self.df[column][n])
+        self.assertTrue(np.isnan(df_loaded["barometer_wf_raw"][2]))
+
+    def test_round_trip(self):
+        path = rpd_df.export_df_to_parquet_arrow(df=self.df, output_dir_pqt=self.output_dir.name)
+        df_loaded = rpd_df.read_df_from_parquet(path)
+        self.assert_df_equal(df_loaded)
+        # Same shape for every row: one tensor buffer, rows are read-only views
+        self.assertFalse(df_loaded["tfr_bits"][0].flags.writeable)
+        self.assertTrue(rpd_df.read_df_from_parquet(path, zero_copy=False)["tfr_bits"][0].flags.writeable)
+
+    def test_read_large_list(self):
+        # Columns with more than 2**31 elements are written with 64-bit offsets (large lists)
+        table = rpd_df.df_to_arrow_table(self.df)
+        index = table.schema.get_field_index("barometer_wf_raw")
+        field = table.schema.field(index)
+        large_field = pa.field(field.name, pa.large_list(pa.large_list(pa.float64())), metadata=field.metadata)
+        table = table.set_column(index, large_field, table.column(index).cast(large_field.type))
+        self.assert_df_equal(rpd_df.df_from_arrow_table(table))
+
+    def write_legacy_parquet(self) -> str:
+        # Layout written by export_df_to_parquet: flattened cells and '_ndim' shape columns
+        df_flat = self.df.copy()
+        for column in ["barometer_wf_raw", "accelerometer_wf_raw", "tfr_bits"]:
+            df_flat[f"{column}_ndim"] = [np.asarray(np.shape(cell)) for cell in self.df[column]]
+            df_flat[column] = [np.ravel(cell) for cell in self.df[column]]
+        path = os.path.join(self.output_dir.name, "legacy.parquet")
+        df_flat.to_parquet(path)
+        return path
+
+    def test_read_legacy_ndim_parquet(self):
+        df_loaded = rpd_df.read_df_from_parquet(self.write_legacy_parquet())
+        self.assertIn("tfr_bits_ndim", df_loaded.columns)
+        self.assert_df_equal(df_loaded.drop(columns=df_loaded.filter(like='_ndim', axis=1).columns))
+
+    def test_read_columns_and_stations(self):
+        for path in [rpd_df.export_df_to_parquet_arrow(df=self.df, output_dir_pqt=self.output_dir.name),
+                     self.write_legacy_parquet()]:
+            df_loaded = rpd_df.read_df_from_parquet(path, columns=["station_id", "accelerometer_wf_raw"],
+                                                    station_ids=["1", "3"])
+            self.assertEqual(list(df_loaded["station_id"]), ["1", "3"])
+            self.assertNotIn("tfr_bits", df_loaded.columns)
+            np.testing.assert_array_equal(df_loaded["accelerometer_wf_raw"][1], self.df["accelerometer_wf_raw"][2])
+
+    def tearDown(self) -> None:
+        self.output_dir.cleanup()
+
+
+class TestParquetDataset(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(seed=18)
+        self.output_dir = tempfile.TemporaryDirectory()
+        self.df = pd.DataFrame({"station_id": ["1", "2", "3"],
+                                "station_make": ["a", "b", "c"],
+                                "audio_wf": [rng.normal(size=100), rng.normal(size=80), rng.normal(size=100)],
+                                "audio_sample_rate_nominal_hz": [80., 80., 80.],
+                                "barometer_wf_raw": [rng.normal(size=(1, 10)), rng.normal(size=(1, 12)),
+                                                     float("NaN")],
+                                "accelerometer_wf_raw": [rng.normal(size=(3, 20)) for _ in range(3)]})
+
+    def test_export_read(self):
+        dataset_dir = rpd_df.export_df_to_parquet_dataset(df=self.df, output_dir_pqt=self.output_dir.name)
+        self.assertEqual(sorted(os.listdir(os.path.join(dataset_dir, "station_id=1"))),
+                         ["sensor=accelerometer", "sensor=audio", "sensor=barometer", "sensor=station"])
+        # Missing sensor is not written
+        self.assertFalse(os.path.exists(os.path.join(dataset_dir, "station_id=3", "sensor=barometer")))
+
+        df_loaded = rpd_df.read_df_from_parquet_dataset(dataset_dir)
+        self.assertEqual(sorted(df_loaded.columns), sorted(self.df.columns))
+        self.assertTrue(np.isnan(df_loaded["barometer_wf_raw"][2]))
+        for column in ["audio_wf", "barometer_wf_raw", "accelerometer_wf_raw"]:
+            for n in range(2):
+                np.testing.assert_array_equal(df_loaded[column][n], self.df[column][n])
+
+        df_selected = rpd_df.read_df_from_parquet_dataset(dataset_dir, columns=["accelerometer_wf_raw"],
+                                                          station_ids=["3"])
+        self.assertEqual(list(df_selected.columns), ["station_id", "accelerometer_wf_raw"])
+        np.testing.assert_array_equal(df_selected["accelerometer_wf_raw"][0], self.df["accelerometer_wf_raw"][2])
+
+    def test_append(self):
+        dataset_dir = rpd_df.export_df_to_parquet_dataset(df=self.df.iloc[:2], output_dir_pqt=self.output_dir.name)
+        path_existing = os.path.join(dataset_dir, "station_id=1", "sensor=audio", "part-0.parquet")
+        mtime_existing = os.path.getmtime(path_existing)
+
+        paths_added = rpd_df.append_df_to_parquet_dataset(df=self.df, dataset_dir=dataset_dir)
+        self.assertEqual(len(paths_added), 3)
+        self.assertEqual(os.path.getmtime(path_existing), mtime_existing)
+        df_loaded = rpd_df.read_df_from_parquet_dataset(dataset_dir, sensors=["audio"])
+        self.assertEqual(list(df_loaded["station_id"]), ["1", "2", "3"])
+        np.testing.assert_array_equal(df_loaded["audio_wf"][2], self.df["audio_wf"][2])
+
+    def tearDown(self) -> None:
+        self.output_dir.cleanup()
+
+
 if __name__ == '__main__':
     unittest.main()
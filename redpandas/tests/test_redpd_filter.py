@@ -0,0 +1,230 @@
+import unittest
+import numpy as np
+import pandas as pd
+from scipy import signal
+import redpandas.redpd_design as rpd_design
+import redpandas.redpd_filter as rpd_filter
+import redpandas.redpd_preprocess as rpd_prep
+
+
+class TestButterPandas(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(seed=21)
+        self.df = pd.DataFrame({"station_id": ["1", "2", "3"],
+                                "wf": [rng.normal(size=2000), rng.normal(size=(3, 2000)), float("NaN")],
+                                "sample_rate_hz": [800., 800., 800.]})
+
+    def test_ba_matches_per_channel(self):
+        df = rpd_filter.bandpass_butter_pandas(self.df.copy(), sig_wf_label="wf",
+                                               sig_sample_rate_label="sample_rate_hz",
+                                               frequency_cut_low_hz=5., frequency_cut_high_hz=50.)
+        b, a = signal.butter(N=4, Wn=[5./400., 50./400.], btype='bandpass')
+        for n in range(2):
+            sig_expected = np.array([signal.filtfilt(b, a, channel * signal.windows.tukey(M=2000, alpha=0.5))
+                                     for channel in np.atleast_2d(self.df["wf"][n])])
+            np.testing.assert_array_equal(np.atleast_2d(df["bandpass"][n]), sig_expected)
+        self.assertTrue(np.isnan(df["bandpass"][2]))
+
+    def test_sos_matches_ba(self):
+        for form in ['ba', 'sos']:
+            self.df = rpd_filter.highpass_butter_pandas(self.df, sig_wf_label="wf",
+                                                        sig_sample_rate_label="sample_rate_hz",
+                                                        frequency_cut_low_hz=20., frequency_cut_high_hz=400.,
+                                                        new_column_label_sig_highpass=form, filter_form=form)
+        for n in range(2):
+            self.assertEqual(self.df["sos"][n].shape, self.df["wf"][n].shape)
+            np.testing.assert_allclose(self.df["sos"][n], self.df["ba"][n],
+                                       atol=1e-3*np.max(np.abs(self.df["ba"][n])))
+
+    def test_sos_stable_low_corner(self):
+        # 100 s period at 800 Hz
+        sig_wf = np.sin(2*np.pi*np.arange(80000)/800.)
+        sig_filtered = rpd_filter.butter_filtfilt_taper(sig_wf=sig_wf, edges=0.01/400., btype='high',
+                                                        filter_form='sos')
+        self.assertTrue(np.all(np.isfinite(sig_filtered)))
+        self.assertLess(np.max(np.abs(sig_filtered[20000:60000] - sig_wf[20000:60000])), 1e-2)
+
+    def test_unknown_form(self):
+        with self.assertRaises(ValueError):
+            rpd_filter.butter_filtfilt_taper(sig_wf=np.ones(100), edges=0.1, btype='high', filter_form='zpk')
+
+    def test_design_cached(self):
+        rpd_design.clear_design_cache()
+        b, a = rpd_design.butter_design(filter_order=4, edges=[0.1, 0.2], btype='bandpass', output='ba')
+        self.assertIs(rpd_design.butter_design(filter_order=4, edges=(0.1, 0.2), btype='bandpass', output='ba')[0], b)
+        self.assertFalse(b.flags.writeable)
+        window = rpd_design.tukey_window(number_points=100, alpha=0.5)
+        self.assertIs(rpd_design.tukey_window(number_points=100, alpha=0.5), window)
+        cache_info = rpd_design.design_cache_info()
+        self.assertEqual((cache_info['butter'].hits, cache_info['butter'].misses), (1, 1))
+        self.assertEqual((cache_info['tukey'].hits, cache_info['tukey'].misses), (1, 1))
+
+    def test_taper_cached(self):
+        rpd_design.clear_design_cache()
+        df = rpd_filter.taper_tukey_pandas(self.df.copy(), sig_wf_label="wf", fraction_cosine=0.1)
+        np.testing.assert_array_equal(df["wf_taper"][1][2],
+                                      self.df["wf"][1][2] * signal.windows.tukey(M=2000, alpha=0.1))
+        # One window computed for the 4 channels of the same length
+        self.assertEqual(rpd_design.design_cache_info()['tukey'].misses, 1)
+
+    def tearDown(self) -> None:
+        self.df = None
+
+
+class TestVectorizedPandas(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(seed=23)
+        wf_nan = rng.normal(size=500)
+        wf_nan[10] = np.nan
+        self.df = pd.DataFrame({"wf": [rng.normal(size=500), wf_nan, rng.normal(size=300), float("NaN"),
+                                       rng.normal(size=(3, 500)), rng.normal(size=(3, 500)),
+                                       rng.normal(size=500).astype(np.float32)]})
+
+    def per_channel(self, sig_function) -> list:
+        # Row by row, channel by channel, as the original loops
+        results = []
+        for sig_wf in self.df["wf"]:
+            if type(sig_wf) == float:
+                results.append(float("NaN"))
+            elif sig_wf.ndim == 1:
+                results.append(sig_function(sig_wf))
+            else:
+                results.append(np.array([sig_function(channel) for channel in sig_wf]))
+        return results
+
+    def assert_column_equal(self, column: pd.Series, expected: list):
+        for result, result_expected in zip(column, expected):
+            if type(result_expected) == float:
+                self.assertTrue(np.isnan(result))
+            else:
+                self.assertEqual(result.dtype, result_expected.dtype)
+                np.testing.assert_array_equal(result, result_expected)
+
+    def test_zero_mean(self):
+        df = rpd_filter.signal_zero_mean_pandas(self.df.copy(), sig_wf_label="wf")
+        self.assert_column_equal(df["zero_mean"], self.per_channel(lambda sig_wf: sig_wf - np.nanmean(sig_wf)))
+
+    def test_taper(self):
+        df = rpd_filter.taper_tukey_pandas(self.df.copy(), sig_wf_label="wf", fraction_cosine=0.25)
+        self.assert_column_equal(df["wf_taper"],
+                                 self.per_channel(lambda sig_wf: sig_wf * signal.windows.tukey(M=len(sig_wf),
+                                                                                               alpha=0.25)))
+
+    def test_normalize(self):
+        for norm_type, norm_type_utils in [('max', rpd_prep.NormType.MAX), ('l1', rpd_prep.NormType.L1),
+                                           ('l2', rpd_prep.NormType.L2), ('other', rpd_prep.NormType.OTHER)]:
+            df = rpd_filter.normalize_pandas(self.df.copy(), sig_wf_label="wf", scaling=2., norm_type=norm_type)
+            self.assert_column_equal(df["normalized"],
+                                     self.per_channel(lambda sig_wf: rpd_prep.normalize(sig_wf, scaling=2.,
+                                                                                        norm_type=norm_type_utils)))
+
+    def tearDown(self) -> None:
+        self.df = None
+
+
+class TestDecimatePoly(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(seed=24)
+        # 48 kHz to 800 Hz is 60 = 2*2*3*5; 8000 Hz to 800 Hz with a 3c signal; 13*800 Hz is not decimated in one step
+        self.df = pd.DataFrame({"station_id": ["0", "1", "2", "3"],
+                                "wf": [rng.normal(size=48000), rng.normal(size=(3, 8000)), rng.normal(size=10400),
+                                       rng.normal(size=800)],
+                                "epoch_s": [np.arange(48000) / 48000. + 10., np.arange(8000) / 8000. + 10.,
+                                            np.arange(10400) / 10400. + 10., np.arange(800) / 800. + 10.],
+                                "sample_rate_hz": [48000., 8000., 10400., 800.]})
+
+    def test_poly_matches_resample_poly(self):
+        df = rpd_filter.decimate_signal_pandas(self.df.copy(), downsample_frequency_hz='Min', sig_id_label="station_id",
+                                               sig_wf_label="wf", sig_timestamps_label="epoch_s",
+                                               sample_rate_hz_label="sample_rate_hz", engine='poly')
+        for n, down in [(0, 60), (1, 10), (2, 13)]:
+            np.testing.assert_allclose(df["decimated_sig_data"][n],
+                                       signal.resample_poly(self.df["wf"][n], 1, down, axis=-1), rtol=1e-12, atol=1e-12)
+            self.assertEqual(df["decimated_sample_rate_hz"][n], 800.)
+            self.assertEqual(df["decimated_sig_epoch"][n].shape[-1], df["decimated_sig_data"][n].shape[-1])
+            self.assertEqual(df["decimated_sig_epoch"][n][0], 10.)
+        self.assertIs(df["decimated_sig_data"][3], self.df["wf"][3])
+
+    def test_rational_factor(self):
+        sig_epoch_s, sig_wf, sample_rate_hz = \
+            rpd_filter.resample_poly_individual_station(sig_wf=self.df["wf"][0], sig_epoch_s=self.df["epoch_s"][0],
+                                                        sample_rate_hz=48000., new_sample_rate_hz=44100.)
+        self.assertEqual(sample_rate_hz, 44100.)
+        np.testing.assert_allclose(sig_wf, signal.resample_poly(self.df["wf"][0], 147, 160), rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(np.diff(sig_epoch_s), 1 / 44100.)
+
+    def test_filter_cache(self):
+        rpd_design.clear_design_cache()
+        for _ in range(2):
+            rpd_filter.resample_poly_individual_station(sig_wf=self.df["wf"][2], sig_epoch_s=self.df["epoch_s"][2],
+                                                        sample_rate_hz=10400., new_sample_rate_hz=800.)
+        cache_info = rpd_design.design_cache_info()["resample_poly"]
+        self.assertEqual((cache_info.hits, cache_info.misses), (1, 1))
+        with self.assertRaises(ValueError):
+            rpd_design.resample_poly_filter(up=1, down=13)[0] = 0.
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            rpd_filter.decimate_signal_pandas(self.df.copy(), downsample_frequency_hz='Min', sig_id_label="station_id",
+                                              sig_wf_label="wf", sig_timestamps_label="epoch_s",
+                                              sample_rate_hz_label="sample_rate_hz", engine='fft')
+
+    def tearDown(self) -> None:
+        self.df = None
+
+
+class TestResampleCommonRate(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(seed=25)
+        self.df = pd.DataFrame({"station_id": ["0", "1", "2", "3"],
+                                "wf": [rng.normal(size=4800), rng.normal(size=1600), rng.normal(size=(3, 800)),
+                                       float("NaN")],
+                                "epoch_s": [np.arange(4800) / 4800., np.arange(1600) / 1600., np.arange(800) / 800.,
+                                            float("NaN")],
+                                "sample_rate_hz": [4800., 1600., 800., 800.]})
+
+    def test_min_rate(self):
+        df, wf_label, sample_rate_hz_label = \
+            rpd_filter.resample_common_rate_pandas(self.df.copy(), sig_wf_label="wf",
+                                                   sample_rate_hz_label="sample_rate_hz",
+                                                   sig_timestamps_label="epoch_s")
+        self.assertEqual((wf_label, sample_rate_hz_label), ("wf_800hz", "sample_rate_hz_800hz"))
+        np.testing.assert_array_equal(df[sample_rate_hz_label][:3], [800., 800., 800.])
+        for n, down in [(0, 6), (1, 2)]:
+            np.testing.assert_allclose(df[wf_label][n], signal.resample_poly(self.df["wf"][n], 1, down),
+                                       rtol=1e-12, atol=1e-12)
+            self.assertEqual(len(df["epoch_s_800hz"][n]), 800)
+        self.assertIs(df[wf_label][2], self.df["wf"][2])
+        self.assertTrue(np.isnan(df[wf_label][3]))
+
+    def test_reuse_existing(self):
+        df, wf_label, _ = rpd_filter.resample_common_rate_pandas(self.df.copy(), sig_wf_label="wf",
+                                                                 sample_rate_hz_label="sample_rate_hz",
+                                                                 common_sample_rate_hz=1600.)
+        resampled = df[wf_label][0]
+        # Upsampled to the common rate
+        self.assertEqual(df[wf_label][2].shape, (3, 1600))
+        df, wf_label_reused, _ = rpd_filter.resample_common_rate_pandas(df, sig_wf_label="wf",
+                                                                        sample_rate_hz_label="sample_rate_hz",
+                                                                        common_sample_rate_hz=1600)
+        self.assertEqual(wf_label_reused, wf_label)
+        self.assertIs(df[wf_label][0], resampled)
+        df, _, _ = rpd_filter.resample_common_rate_pandas(df, sig_wf_label="wf", sample_rate_hz_label="sample_rate_hz",
+                                                          common_sample_rate_hz=1600, reuse_existing=False)
+        self.assertIsNot(df[wf_label][0], resampled)
+        np.testing.assert_array_equal(df[wf_label][0], resampled)
+
+    def test_source_changed(self):
+        df, wf_label, _ = rpd_filter.resample_common_rate_pandas(self.df.copy(), sig_wf_label="wf",
+                                                                 sample_rate_hz_label="sample_rate_hz")
+        df.at[0, "wf"] = 2. * df["wf"][0]
+        df, _, _ = rpd_filter.resample_common_rate_pandas(df, sig_wf_label="wf", sample_rate_hz_label="sample_rate_hz")
+        np.testing.assert_allclose(df[wf_label][0], signal.resample_poly(2. * self.df["wf"][0], 1, 6),
+                                   rtol=1e-12, atol=1e-12)
+
+    def tearDown(self) -> None:
+        self.df = None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import numpy as np
+import redpandas.redpd_gravity as rpd_grav
+
+
+def get_gravity_loop(accelerometer: np.ndarray, smoothing_factor: float) -> np.ndarray:
+    # Original per sample implementation of get_gravity
+    gravity = np.zeros(len(accelerometer)) * np.mean(accelerometer)
+    for i in range(len(gravity) - 1):
+        gravity[i + 1] = (1 - smoothing_factor) * gravity[i] + smoothing_factor * accelerometer[i + 1]
+    return gravity
+
+
+def get_sensor_lowpass_loop(sensor_wf: np.ndarray,
+                            sensor_sample_rate_hz: float,
+                            lowpass_frequency_hz: float = 1) -> np.ndarray:
+    # Original per sample implementation of get_sensor_lowpass
+    smoothing_factor = lowpass_frequency_hz / sensor_sample_rate_hz
+    sensor_lowpass = np.zeros(len(sensor_wf))
+    for i in range(len(sensor_lowpass) - 1):
+        sensor_lowpass[i + 1] = (1 - smoothing_factor) * sensor_lowpass[i] + smoothing_factor * sensor_wf[i + 1]
+    return sensor_lowpass
+
+
+class TestGravity(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(seed=1)
+        self.sample_rate_hz = 400.
+        self.accelerometer_3c = np.array([0., 0., 9.8])[:, np.newaxis] + rng.normal(size=(3, 4000))
+
+    def test_get_gravity_parity(self):
+        alpha = rpd_grav.get_smoothing_factor(self.sample_rate_hz, 1.)
+        for accelerometer in self.accelerometer_3c:
+            np.testing.assert_allclose(rpd_grav.get_gravity(accelerometer, alpha),
+                                       get_gravity_loop(accelerometer, alpha), rtol=1e-12, atol=1e-12)
+
+    def test_get_gravity_nan_propagates(self):
+        accelerometer = self.accelerometer_3c[0].copy()
+        accelerometer[10] = np.nan
+        self.assertTrue(np.all(np.isnan(rpd_grav.get_gravity(accelerometer, 0.1))))
+
+    def test_get_gravity_and_linear_acceleration_3c(self):
+        gravity, linear = rpd_grav.get_gravity_and_linear_acceleration(self.accelerometer_3c, self.sample_rate_hz, 2)
+        self.assertEqual(gravity.shape, (3, 4000))
+        for index_dimension in range(3):
+            gravity_axis, linear_axis = \
+                rpd_grav.get_gravity_and_linear_acceleration(self.accelerometer_3c[index_dimension],
+                                                             self.sample_rate_hz, 2)
+            np.testing.assert_allclose(gravity[index_dimension], gravity_axis)
+            np.testing.assert_allclose(linear[index_dimension], linear_axis)
+
+    def test_get_sensor_lowpass_parity(self):
+        lowpass_3c = rpd_grav.get_sensor_lowpass(self.accelerometer_3c, self.sample_rate_hz, 1.)
+        for index_dimension in range(3):
+            np.testing.assert_allclose(lowpass_3c[index_dimension],
+                                       get_sensor_lowpass_loop(self.accelerometer_3c[index_dimension],
+                                                               self.sample_rate_hz, 1.),
+                                       rtol=1e-12, atol=1e-12)
+
+    def test_get_lowpass_and_highpass_sum(self):
+        lowpass, highpass = rpd_grav.get_lowpass_and_highpass(self.accelerometer_3c, self.sample_rate_hz)
+        np.testing.assert_allclose(lowpass + highpass, self.accelerometer_3c)
+
+    def tearDown(self) -> None:
+        self.accelerometer_3c = None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import numpy as np
+import redpandas.redpd_iterator as rdp_iter
+
+
+class TestRcArrays(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sample_rate_hz = 80.
+        self.frequency_cut_low_hz = 0.5
+        self.frequency_cut_high_hz = 10.
+        rng = np.random.default_rng(seed=7)
+        self.sig_wf = np.sin(2*np.pi*2*np.arange(2000)/self.sample_rate_hz) + rng.normal(scale=0.2, size=2000)
+        self.sig_wf_3c = np.array([self.sig_wf, -2*self.sig_wf, self.sig_wf + 1.])
+
+    def test_high_pass_matches_iterator(self):
+        sig_iterator = np.array(list(rdp_iter.rc_iterator_high_pass(self.sig_wf, self.sample_rate_hz,
+                                                                    self.frequency_cut_low_hz)))
+        np.testing.assert_allclose(rdp_iter.rc_high_pass_array(self.sig_wf, self.sample_rate_hz,
+                                                               self.frequency_cut_low_hz),
+                                   sig_iterator, rtol=1e-12, atol=1e-12)
+
+    def test_low_pass_matches_iterator(self):
+        sig_iterator = np.array(list(rdp_iter.rc_iterator_lowpass(self.sig_wf, self.sample_rate_hz,
+                                                                  self.frequency_cut_high_hz)))
+        np.testing.assert_allclose(rdp_iter.rc_low_pass_array(self.sig_wf, self.sample_rate_hz,
+                                                              self.frequency_cut_high_hz),
+                                   sig_iterator, rtol=1e-12, atol=1e-12)
+
+    def test_highlow_matches_iterator(self):
+        sig_iterator = np.array(list(rdp_iter.rc_iterator_highlow(self.sig_wf, self.sample_rate_hz,
+                                                                  self.frequency_cut_low_hz,
+                                                                  self.frequency_cut_high_hz)))
+        sig_high, sig_low = rdp_iter.rc_highlow_array(self.sig_wf, self.sample_rate_hz,
+                                                      self.frequency_cut_low_hz, self.frequency_cut_high_hz)
+        np.testing.assert_allclose(sig_high, sig_iterator[:, 0], rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(sig_low, sig_iterator[:, 1], rtol=1e-12, atol=1e-12)
+
+    def test_multichannel(self):
+        sig_high_3c, sig_low_3c = rdp_iter.rc_highlow_array(self.sig_wf_3c, self.sample_rate_hz,
+                                                            self.frequency_cut_low_hz, self.frequency_cut_high_hz)
+        self.assertEqual(sig_high_3c.shape, self.sig_wf_3c.shape)
+        for index_dimension, sig_wf in enumerate(self.sig_wf_3c):
+            sig_iterator = np.array(list(rdp_iter.rc_iterator_highlow(sig_wf, self.sample_rate_hz,
+                                                                      self.frequency_cut_low_hz,
+                                                                      self.frequency_cut_high_hz)))
+            np.testing.assert_allclose(sig_high_3c[index_dimension], sig_iterator[:, 0], rtol=1e-12, atol=1e-12)
+            np.testing.assert_allclose(sig_low_3c[index_dimension], sig_iterator[:, 1], rtol=1e-12, atol=1e-12)
+
+    def test_integer_input(self):
+        sig_int = np.arange(10)
+        sig_iterator = np.array(list(rdp_iter.rc_iterator_lowpass(sig_int, self.sample_rate_hz,
+                                                                  self.frequency_cut_high_hz)))
+        np.testing.assert_allclose(rdp_iter.rc_low_pass_array(sig_int, self.sample_rate_hz,
+                                                              self.frequency_cut_high_hz),
+                                   sig_iterator, rtol=1e-12)
+
+    def tearDown(self) -> None:
+        self.sig_wf = None
+        self.sig_wf_3c = None
+
+
+if __name__ == '__main__':
+    unittest.main()
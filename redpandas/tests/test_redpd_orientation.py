@@ -0,0 +1,69 @@
+import unittest
+import numpy as np
+import redpandas.redpd_orientation as rpd_orient
+
+
+def complimentary_filtering_loop(gyroscope_time_s: np.ndarray, gyroscope_angle: np.ndarray,
+                                 accelerometer_angle: np.ndarray, smoothing_factor: float) -> np.ndarray:
+    # Original per sample implementation of complimentary_filtering
+    gyroscope_angle_change = np.diff(gyroscope_angle)
+    gyroscope_time_delta = np.diff(gyroscope_time_s)
+    filtered_angle = gyroscope_angle
+    for i in range(len(accelerometer_angle) - 1):
+        filtered_angle[i + 1] = \
+            smoothing_factor * (filtered_angle[i] + gyroscope_angle_change[i] * gyroscope_time_delta[i]) \
+            + smoothing_factor * accelerometer_angle[i + 1]
+    return filtered_angle
+
+
+class TestOrientationArrays(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(seed=2)
+        self.number_points = 1000
+        self.accelerometers = [rng.normal(size=self.number_points) for _ in range(3)]
+        self.magnetometers = [rng.normal(size=self.number_points) for _ in range(3)]
+        self.time_s = np.arange(self.number_points) / 100.
+        self.gyroscope_angle = np.cumsum(rng.normal(scale=0.01, size=self.number_points))
+        self.accelerometer_angle = rng.normal(scale=0.1, size=self.number_points)
+
+    def test_get_roll_pitch_array(self):
+        roll_array, pitch_array = rpd_orient.get_roll_pitch_array(self.accelerometers)
+        for i in range(self.number_points):
+            pitch, roll = rpd_orient.get_roll_pitch(accel_x=self.accelerometers[0][i],
+                                                    accel_y=self.accelerometers[1][i],
+                                                    accel_z=self.accelerometers[2][i])
+            self.assertAlmostEqual(roll_array[i], roll, places=12)
+            self.assertAlmostEqual(pitch_array[i], pitch, places=12)
+
+    def test_get_yaw_array(self):
+        roll_array, pitch_array = rpd_orient.get_roll_pitch_array(self.accelerometers)
+        yaw_array = rpd_orient.get_yaw_array(roll_array, pitch_array, self.magnetometers)
+        self.assertEqual(len(yaw_array), self.number_points)
+        for i in range(self.number_points):
+            yaw = rpd_orient.get_yaw(roll=roll_array[i], pitch=pitch_array[i], mag_x=self.magnetometers[0][i],
+                                     mag_y=self.magnetometers[1][i], mag_z=self.magnetometers[2][i])
+            self.assertAlmostEqual(yaw_array[i], yaw, places=12)
+
+    def test_complimentary_filtering(self):
+        expected = complimentary_filtering_loop(self.time_s, self.gyroscope_angle.copy(),
+                                                self.accelerometer_angle, 0.9)
+        gyroscope_angle = self.gyroscope_angle.copy()
+        filtered = rpd_orient.complimentary_filtering(self.time_s, gyroscope_angle, self.accelerometer_angle, 0.9)
+        np.testing.assert_allclose(filtered, expected, rtol=1e-10, atol=1e-12)
+        # filtered in place, as before
+        self.assertIs(filtered, gyroscope_angle)
+
+    def test_complimentary_filtering_shorter_accelerometer(self):
+        expected = complimentary_filtering_loop(self.time_s, self.gyroscope_angle.copy(),
+                                                self.accelerometer_angle[:500], 0.5)
+        filtered = rpd_orient.complimentary_filtering(self.time_s, self.gyroscope_angle.copy(),
+                                                      self.accelerometer_angle[:500], 0.5)
+        np.testing.assert_allclose(filtered, expected, rtol=1e-10, atol=1e-12)
+
+    def tearDown(self) -> None:
+        self.accelerometers = None
+        self.magnetometers = None
+
+
+if __name__ == '__main__':
+    unittest.main()
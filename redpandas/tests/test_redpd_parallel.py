@@ -0,0 +1,62 @@
+import unittest
+from functools import partial
+import numpy as np
+import redpandas.redpd_parallel as rpd_par
+
+
+def square_or_fail(x: int) -> int:
+    if x == 3:
+        raise ValueError("bad station")
+    return x * x
+
+
+class TestParallelMap(unittest.TestCase):
+    def setUp(self) -> None:
+        self.items = [5, 1, 4, 2, 0]
+        self.expected = [25, 1, 16, 4, 0]
+
+    def test_serial(self):
+        self.assertEqual(rpd_par.parallel_map(square_or_fail, self.items), self.expected)
+
+    def test_thread_pool_keeps_order(self):
+        self.assertEqual(rpd_par.parallel_map(square_or_fail, self.items, n_workers=3, executor_type="thread"),
+                         self.expected)
+
+    def test_process_pool_keeps_order(self):
+        self.assertEqual(rpd_par.parallel_map(square_or_fail, self.items, n_workers=2, executor_type="process"),
+                         self.expected)
+
+    def test_return_exceptions(self):
+        result = rpd_par.parallel_map(square_or_fail, [2, 3, 4], n_workers=2, executor_type="thread",
+                                      return_exceptions=True)
+        self.assertEqual(result[0], 4)
+        self.assertIsInstance(result[1], ValueError)
+        self.assertEqual(result[2], 16)
+
+    def test_exception_raised_by_default(self):
+        with self.assertRaises(ValueError):
+            rpd_par.parallel_map(square_or_fail, [2, 3, 4])
+
+    def test_unknown_executor(self):
+        with self.assertRaises(ValueError):
+            rpd_par.get_executor(executor_type="gpu")
+
+    def tearDown(self) -> None:
+        self.items = None
+        self.expected = None
+
+
+class TestSharedArray(unittest.TestCase):
+    def test_read_shared_array_in_workers(self):
+        array = np.arange(12.).reshape((4, 3))
+        shm, descriptor = rpd_par.share_array(array)
+        try:
+            rows = rpd_par.parallel_map(partial(rpd_par.read_shared_array, descriptor), range(4), n_workers=2)
+        finally:
+            shm.close()
+            shm.unlink()
+        np.testing.assert_array_equal(np.array(rows), array)
+
+
+if __name__ == '__main__':
+    unittest.main()
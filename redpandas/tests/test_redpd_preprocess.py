@@ -0,0 +1,247 @@
+import unittest
+import numpy as np
+import obspy.signal.filter
+import pandas as pd
+from scipy import signal
+import redpandas.redpd_preprocess as rpd_prep
+
+
+def reconstruct_from_diff_loop(sig_diff_wf: np.ndarray) -> np.ndarray:
+    # Reference recursion previously used in highpass_from_diff
+    sig_reconstruct = np.zeros((len(sig_diff_wf)))
+    sig_reconstruct[0] = sig_diff_wf[0]
+    for i in range(1, len(sig_diff_wf) - 1):
+        sig_reconstruct[i] = sig_diff_wf[i] + sig_reconstruct[i-1]
+    return sig_reconstruct
+
+
+class TestReconstructFromDiff(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sig_diff = np.random.default_rng(seed=42).normal(size=5000)
+
+    def test_matches_loop(self):
+        np.testing.assert_array_equal(rpd_prep.reconstruct_from_diff(self.sig_diff),
+                                      reconstruct_from_diff_loop(self.sig_diff))
+
+    def test_last_sample_is_zero(self):
+        self.assertEqual(rpd_prep.reconstruct_from_diff(self.sig_diff)[-1], 0.)
+
+    def test_single_sample(self):
+        np.testing.assert_array_equal(rpd_prep.reconstruct_from_diff(np.array([2.5])), np.array([2.5]))
+
+    def test_multichannel(self):
+        sig_diff_3c = np.array([self.sig_diff, 2*self.sig_diff, -self.sig_diff])
+        reconstruct_3c = rpd_prep.reconstruct_from_diff(sig_diff_3c)
+        for index_dimension, sig_diff in enumerate(sig_diff_3c):
+            np.testing.assert_array_equal(reconstruct_3c[index_dimension], reconstruct_from_diff_loop(sig_diff))
+
+    def tearDown(self) -> None:
+        self.sig_diff = None
+
+
+class TestTaperTukey(unittest.TestCase):
+    def test_writable_copy(self):
+        taper = rpd_prep.taper_tukey(sig_wf_or_time=np.zeros(100), fraction_cosine=0.5)
+        np.testing.assert_array_equal(taper, signal.windows.tukey(M=100, alpha=0.5, sym=True))
+        taper *= 2.
+        np.testing.assert_array_equal(rpd_prep.taper_tukey(sig_wf_or_time=np.zeros(100), fraction_cosine=0.5),
+                                      signal.windows.tukey(M=100, alpha=0.5, sym=True))
+
+
+def highpass_from_diff_reference(sig_wf: np.ndarray,
+                                 sample_rate_hz: float,
+                                 highpass_type: str,
+                                 frequency_filter_low: float,
+                                 filter_order: int = 4) -> np.ndarray:
+    # Single channel reference: obspy filter, per-channel taper and design
+    sensor_waveform_grad_dm = rpd_prep.demean_nan(np.gradient(sig_wf))
+    number_points_folded = int(len(sensor_waveform_grad_dm)//2)
+    sensor_waveform_fold = np.pad(np.copy(sensor_waveform_grad_dm),
+                                  (number_points_folded, number_points_folded), 'reflect')
+    sensor_waveform_fold *= signal.windows.tukey(M=len(sensor_waveform_fold), alpha=0.5, sym=True)
+    if highpass_type == "obspy":
+        sensor_waveform_dp_filtered = obspy.signal.filter.highpass(corners=filter_order,
+                                                                   data=np.copy(sensor_waveform_fold),
+                                                                   freq=frequency_filter_low,
+                                                                   df=sample_rate_hz,
+                                                                   zerophase=True)
+    else:
+        [b, a] = signal.butter(N=filter_order, Wn=frequency_filter_low, fs=sample_rate_hz, btype='highpass')
+        sensor_waveform_dp_filtered = signal.filtfilt(b, a, sensor_waveform_fold)
+    sensor_waveform_dp_filtered = sensor_waveform_dp_filtered[number_points_folded:-number_points_folded]
+    return reconstruct_from_diff_loop(sensor_waveform_dp_filtered)
+
+
+class TestHighpassFromDiffMultichannel(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sample_rate_hz = 50.
+        self.sig_epoch_s = np.arange(0, 900, 1/self.sample_rate_hz)
+        rng = np.random.default_rng(seed=1)
+        self.sig_wf_3c = np.array([9.8 + 0.1*np.sin(2*np.pi*0.2*self.sig_epoch_s),
+                                   0.5 + rng.normal(scale=0.01, size=len(self.sig_epoch_s)),
+                                   -0.2 + 0.001*self.sig_epoch_s])
+        self.sig_wf_3c[1, 100] = np.nan
+
+    def test_obspy_matches_per_channel(self):
+        sig_highpass_3c, _ = rpd_prep.highpass_from_diff_multichannel(sig_wf=self.sig_wf_3c,
+                                                                      sig_epoch_s=self.sig_epoch_s,
+                                                                      sample_rate_hz=self.sample_rate_hz,
+                                                                      highpass_type='obspy')
+        self.assertEqual(sig_highpass_3c.shape, self.sig_wf_3c.shape)
+        for index_dimension, sig_wf in enumerate(self.sig_wf_3c):
+            np.testing.assert_allclose(sig_highpass_3c[index_dimension],
+                                       highpass_from_diff_reference(sig_wf, self.sample_rate_hz, 'obspy', 0.01),
+                                       rtol=1e-10, atol=1e-12)
+
+    def test_butter_matches_per_channel(self):
+        sig_highpass_3c, _ = rpd_prep.highpass_from_diff_multichannel(sig_wf=self.sig_wf_3c,
+                                                                      sig_epoch_s=self.sig_epoch_s,
+                                                                      sample_rate_hz=self.sample_rate_hz,
+                                                                      highpass_type='butter')
+        for index_dimension, sig_wf in enumerate(self.sig_wf_3c):
+            np.testing.assert_allclose(sig_highpass_3c[index_dimension],
+                                       highpass_from_diff_reference(sig_wf, self.sample_rate_hz, 'butter', 0.01),
+                                       rtol=1e-10, atol=1e-12)
+
+    def test_rc_matches_single_channel(self):
+        sig_highpass_3c, _ = rpd_prep.highpass_from_diff_multichannel(sig_wf=self.sig_wf_3c,
+                                                                      sig_epoch_s=self.sig_epoch_s,
+                                                                      sample_rate_hz=self.sample_rate_hz,
+                                                                      highpass_type='rc')
+        for index_dimension, sig_wf in enumerate(self.sig_wf_3c):
+            sig_highpass, _ = rpd_prep.highpass_from_diff(sig_wf=sig_wf,
+                                                          sig_epoch_s=self.sig_epoch_s,
+                                                          sample_rate_hz=self.sample_rate_hz,
+                                                          highpass_type='rc')
+            np.testing.assert_array_equal(sig_highpass_3c[index_dimension], sig_highpass)
+
+    def test_unknown_filter(self):
+        with self.assertRaises(Exception):
+            rpd_prep.highpass_from_diff_multichannel(sig_wf=self.sig_wf_3c,
+                                                     sig_epoch_s=self.sig_epoch_s,
+                                                     sample_rate_hz=self.sample_rate_hz,
+                                                     highpass_type='fir')
+
+    def tearDown(self) -> None:
+        self.sig_wf_3c = None
+        self.sig_epoch_s = None
+
+
+class TestHighpassFromDiff(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sample_rate_hz = 30.
+        self.sig_epoch_s = np.arange(0, 600, 1/self.sample_rate_hz)
+        self.sig_wf = 101. + 0.01*np.sin(2*np.pi*0.5*self.sig_epoch_s) + 0.001*self.sig_epoch_s
+
+    def test_butter_shape(self):
+        sig_highpass, frequency_filter_low = rpd_prep.highpass_from_diff(sig_wf=self.sig_wf,
+                                                                         sig_epoch_s=self.sig_epoch_s,
+                                                                         sample_rate_hz=self.sample_rate_hz,
+                                                                         highpass_type='butter')
+        self.assertEqual(sig_highpass.shape, self.sig_wf.shape)
+        self.assertEqual(frequency_filter_low, 0.01)
+
+    def test_obspy_matches_obspy_filter(self):
+        sig_highpass, _ = rpd_prep.highpass_from_diff(sig_wf=self.sig_wf,
+                                                      sig_epoch_s=self.sig_epoch_s,
+                                                      sample_rate_hz=self.sample_rate_hz,
+                                                      highpass_type='obspy',
+                                                      frequency_filter_low=0.05)
+        np.testing.assert_allclose(sig_highpass,
+                                   highpass_from_diff_reference(self.sig_wf, self.sample_rate_hz, 'obspy', 0.05),
+                                   rtol=1e-10, atol=1e-12)
+
+    def test_obspy_above_nyquist(self):
+        with self.assertRaisesRegex(ValueError, "Selected corner frequency is above Nyquist."):
+            rpd_prep.highpass_from_diff(sig_wf=self.sig_wf,
+                                        sig_epoch_s=self.sig_epoch_s,
+                                        sample_rate_hz=self.sample_rate_hz,
+                                        highpass_type='obspy',
+                                        frequency_filter_low=20.)
+
+    def test_rc_shape(self):
+        sig_highpass, _ = rpd_prep.highpass_from_diff(sig_wf=self.sig_wf,
+                                                      sig_epoch_s=self.sig_epoch_s,
+                                                      sample_rate_hz=self.sample_rate_hz,
+                                                      highpass_type='rc')
+        self.assertEqual(sig_highpass.shape, self.sig_wf.shape)
+
+    def tearDown(self) -> None:
+        self.sig_wf = None
+        self.sig_epoch_s = None
+
+
+class TestHighpassFromDiffChunked(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(seed=20)
+        self.sample_rate_hz = 30.
+        time_s = np.arange(6000) / self.sample_rate_hz
+        self.sig_wf = 101. + 0.01 * np.sin(2. * np.pi * time_s / 20.) + 0.001 * rng.normal(size=(3, time_s.size))
+        self.sig_wf[1, 100] = np.nan
+
+    def whole_record(self, sig_wf: np.ndarray, highpass_type: str) -> np.ndarray:
+        # Same causal processing on the whole record at once
+        sig_grad = np.nan_to_num(np.gradient(sig_wf, axis=-1))
+        if highpass_type == 'butter':
+            sos = signal.butter(N=4, Wn=0.01, fs=self.sample_rate_hz, btype='highpass', output='sos')
+            zi = signal.sosfilt_zi(sos)[(slice(None),) + (None,) * (sig_grad.ndim - 1)] * sig_grad[..., :1]
+            sig_filtered = signal.sosfilt(sos, sig_grad, axis=-1, zi=zi)[0]
+        else:
+            b, a = rpd_prep.rdp_iter.rc_high_pass_coefficients(self.sample_rate_hz, 0.01)
+            sig_filtered = signal.lfilter(b, a, sig_grad, axis=-1, zi=signal.lfilter_zi(b, a)*sig_grad[..., :1])[0]
+        return np.cumsum(sig_filtered, axis=-1)
+
+    def test_chunks_match_whole_record(self):
+        for highpass_type in ['butter', 'rc']:
+            for sig_wf in [self.sig_wf, self.sig_wf[0]]:
+                sig_expected = self.whole_record(sig_wf, highpass_type)
+                for chunk_points in [1, 2, 777, 6000]:
+                    sig_chunked = rpd_prep.highpass_from_diff_chunked(sig_wf=sig_wf,
+                                                                      sample_rate_hz=self.sample_rate_hz,
+                                                                      chunk_points=chunk_points,
+                                                                      highpass_type=highpass_type,
+                                                                      frequency_filter_low=0.01)
+                    self.assertEqual(sig_chunked.shape, sig_wf.shape)
+                    np.testing.assert_allclose(sig_chunked, sig_expected, rtol=1e-9, atol=1e-12)
+
+    def test_unknown_type(self):
+        with self.assertRaises(Exception):
+            rpd_prep.highpass_from_diff_chunked(sig_wf=self.sig_wf, sample_rate_hz=self.sample_rate_hz,
+                                                highpass_type='obspy')
+
+    def test_too_few_points(self):
+        for sig_wf in [np.zeros(0), np.ones(1), np.ones((3, 1))]:
+            with self.assertRaises(ValueError):
+                rpd_prep.highpass_from_diff_chunked(sig_wf=sig_wf, sample_rate_hz=self.sample_rate_hz)
+
+    def tearDown(self) -> None:
+        self.sig_wf = None
+
+
+class TestDfUnflatten(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(seed=16)
+        self.arrays = [rng.normal(size=(3, 4, 5, 2)), rng.normal(size=(2, 7)), rng.normal(size=9), float("NaN")]
+        # Non-default index, as after filtering stations
+        self.df = pd.DataFrame({"wf": [np.ravel(array) for array in self.arrays],
+                                "wf_ndim": [np.asarray(np.shape(array)) for array in self.arrays]},
+                               index=[10, 3, 7, 1])
+
+    def test_df_unflatten(self):
+        rpd_prep.df_unflatten(self.df)
+        for values, array in zip(self.df["wf"], self.arrays[:3]):
+            self.assertEqual(values.shape, array.shape)
+            np.testing.assert_array_equal(values, array)
+        self.assertTrue(np.all(np.isnan(self.df["wf"][1])))
+
+    def test_df_column_unflatten_views(self):
+        flat_values = self.df["wf"][10]
+        rpd_prep.df_column_unflatten(self.df, col_wf_label="wf", col_ndim_label="wf_ndim")
+        self.assertTrue(np.shares_memory(self.df["wf"][10], flat_values))
+
+    def tearDown(self) -> None:
+        self.df = None
+
+
+if __name__ == '__main__':
+    unittest.main()
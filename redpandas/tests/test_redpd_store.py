@@ -0,0 +1,82 @@
+import pickle
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import redpandas.redpd_df as rpd_df
+import redpandas.redpd_filter as rpd_filter
+import redpandas.redpd_store as rpd_store
+
+
+class TestWaveformHandle(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(seed=19)
+        self.store_dir = tempfile.TemporaryDirectory()
+        self.array = rng.normal(size=(3, 100))
+        self.handle = rpd_store.store_array(self.array, f"{self.store_dir.name}/acc.npy")
+
+    def test_array_interface(self):
+        self.assertEqual(self.handle.shape, (3, 100))
+        self.assertEqual(self.handle.ndim, 2)
+        self.assertEqual(len(self.handle), 3)
+        np.testing.assert_array_equal(np.asarray(self.handle), self.array)
+        np.testing.assert_array_equal(self.handle[1], self.array[1])
+        np.testing.assert_array_equal(2.*self.handle - 1., 2.*self.array - 1.)
+        np.testing.assert_array_equal(np.sin(self.handle), np.sin(self.array))
+        self.assertEqual(self.handle.max(), self.array.max())
+        self.assertEqual(np.nanmean(self.handle), np.nanmean(self.array))
+
+    def test_read_only(self):
+        with self.assertRaises(ValueError):
+            self.handle += 1.
+
+    def test_pickle(self):
+        handle = pickle.loads(pickle.dumps(self.handle))
+        self.assertEqual(handle.path, self.handle.path)
+        np.testing.assert_array_equal(handle, self.array)
+
+    def tearDown(self) -> None:
+        self.handle = None
+        self.store_dir.cleanup()
+
+
+class TestStoreDfArrays(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(seed=19)
+        self.store_dir = tempfile.TemporaryDirectory()
+        grid = np.arange(10.)
+        self.df = pd.DataFrame({"station_id": ["1", "2", "3"],
+                                "audio_wf": [rng.normal(size=100), rng.normal(size=80), float("NaN")],
+                                "accelerometer_wf_raw": [rng.normal(size=(3, 20)) for _ in range(3)],
+                                "tfr_time_s": [grid, grid, grid]})
+
+    def test_store_load(self):
+        df_stored = rpd_store.store_df_arrays(self.df.copy(), store_dir=self.store_dir.name)
+        self.assertIsInstance(df_stored["audio_wf"][0], rpd_store.WaveformHandle)
+        self.assertTrue(np.isnan(df_stored["audio_wf"][2]))
+        # Shared grid is stored once
+        self.assertIs(df_stored["tfr_time_s"][0], df_stored["tfr_time_s"][2])
+        df_loaded = rpd_store.load_df_arrays(df_stored.copy())
+        self.assertIsInstance(df_loaded["accelerometer_wf_raw"][1], np.ndarray)
+        np.testing.assert_array_equal(df_loaded["accelerometer_wf_raw"][1], self.df["accelerometer_wf_raw"][1])
+
+    def test_functions_accept_handles(self):
+        df_stored = rpd_store.store_df_arrays(self.df.copy(), store_dir=self.store_dir.name)
+        for column in ["audio_wf", "accelerometer_wf_raw"]:
+            df_expected = rpd_filter.signal_zero_mean_pandas(self.df.copy(), sig_wf_label=column)
+            df_handles = rpd_filter.signal_zero_mean_pandas(df_stored.copy(), sig_wf_label=column)
+            for n in range(2):
+                np.testing.assert_allclose(df_handles["zero_mean"][n], df_expected["zero_mean"][n])
+
+        path = rpd_df.export_df_to_parquet_arrow(df=df_stored, output_dir_pqt=self.store_dir.name)
+        df_parquet = rpd_df.read_df_from_parquet(path)
+        np.testing.assert_array_equal(df_parquet["accelerometer_wf_raw"][2], self.df["accelerometer_wf_raw"][2])
+        np.testing.assert_array_equal(df_parquet["audio_wf"][1], self.df["audio_wf"][1])
+
+    def tearDown(self) -> None:
+        self.df = None
+        self.store_dir.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import redpandas.redpd_tfr as rpd_tfr
+
+
+class TestTfrBitsPandaBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(seed=7)
+        # Two audio stations sharing a grid, one with a different length, and two 3c sensors
+        self.df = pd.DataFrame({"station_id": ["0", "1", "2", "3", "4"],
+                                "sig_wf": [rng.normal(size=1024), rng.normal(size=1024), rng.normal(size=900),
+                                           rng.normal(size=(3, 1024)), float("NaN")],
+                                "sig_sample_rate_hz": [80., 80., 80., 80., 80.]})
+
+    def test_cwt_batch_matches_loop(self):
+        df_loop = rpd_tfr.tfr_bits_panda(df=self.df.copy(), sig_wf_label="sig_wf",
+                                         sig_sample_rate_label="sig_sample_rate_hz", engine='loop')
+        df_batch = rpd_tfr.tfr_bits_panda(df=self.df.copy(), sig_wf_label="sig_wf",
+                                          sig_sample_rate_label="sig_sample_rate_hz", engine='batch')
+        for n in [0, 1, 2, 3]:
+            for column in ["tfr_bits", "tfr_time_s", "tfr_frequency_hz"]:
+                self.assertEqual(df_batch[column][n].shape, df_loop[column][n].shape)
+                np.testing.assert_allclose(df_batch[column][n], df_loop[column][n], rtol=1e-10, atol=1e-10)
+        self.assertTrue(np.isnan(df_batch["tfr_bits"][4]))
+
+    def test_process_pool_matches_serial(self):
+        df_serial = rpd_tfr.tfr_bits_panda(df=self.df.copy(), sig_wf_label="sig_wf",
+                                           sig_sample_rate_label="sig_sample_rate_hz")
+        df_pool = rpd_tfr.tfr_bits_panda(df=self.df.copy(), sig_wf_label="sig_wf",
+                                         sig_sample_rate_label="sig_sample_rate_hz", n_workers=2)
+        for n in [0, 1, 2, 3]:
+            for column in ["tfr_bits", "tfr_time_s", "tfr_frequency_hz"]:
+                np.testing.assert_array_equal(df_pool[column][n], df_serial[column][n])
+
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            df_computed = rpd_tfr.tfr_bits_panda(df=self.df.copy(), sig_wf_label="sig_wf",
+                                                 sig_sample_rate_label="sig_sample_rate_hz", cache_dir=cache_dir)
+            self.assertEqual(len(os.listdir(cache_dir)), 4)
+            df_cached = rpd_tfr.tfr_bits_panda(df=self.df.copy(), sig_wf_label="sig_wf",
+                                               sig_sample_rate_label="sig_sample_rate_hz", cache_dir=cache_dir)
+        df_no_cache = rpd_tfr.tfr_bits_panda(df=self.df.copy(), sig_wf_label="sig_wf",
+                                             sig_sample_rate_label="sig_sample_rate_hz")
+        for n in [0, 1, 2, 3]:
+            for column in ["tfr_bits", "tfr_time_s", "tfr_frequency_hz"]:
+                np.testing.assert_array_equal(df_computed[column][n], df_no_cache[column][n])
+                np.testing.assert_array_equal(df_cached[column][n], df_no_cache[column][n])
+        self.assertTrue(np.isnan(df_cached["tfr_bits"][4]))
+
+    def test_compact_storage(self):
+        df_float64 = rpd_tfr.tfr_bits_panda(df=self.df.copy(), sig_wf_label="sig_wf",
+                                            sig_sample_rate_label="sig_sample_rate_hz")
+        for tfr_storage, tolerance in [('float32', 1e-5), ('uint16', 1e-3)]:
+            df_compact = rpd_tfr.tfr_bits_panda(df=self.df.copy(), sig_wf_label="sig_wf",
+                                                sig_sample_rate_label="sig_sample_rate_hz", tfr_storage=tfr_storage)
+            self.assertEqual(df_compact["tfr_bits"][3].dtype, np.dtype(tfr_storage))
+            # One grid shared by the rows with the same sample rate and grid
+            self.assertIs(df_compact["tfr_time_s"][0], df_compact["tfr_time_s"][3])
+            for n in [0, 1, 2, 3]:
+                tfr_bits = rpd_tfr.tfr_bits_from_panda(df_compact, n)
+                tfr_range = np.ptp(df_float64["tfr_bits"][n])
+                np.testing.assert_allclose(tfr_bits, df_float64["tfr_bits"][n], atol=tolerance*tfr_range)
+                tfr_time_s, tfr_frequency_hz = rpd_tfr.tfr_grids_from_panda(df_compact, n)
+                np.testing.assert_array_equal(tfr_time_s, df_float64["tfr_time_s"][n])
+                np.testing.assert_array_equal(tfr_frequency_hz, df_float64["tfr_frequency_hz"][n])
+
+    def test_row_grids_writable(self):
+        df_batch = rpd_tfr.tfr_bits_panda(df=self.df.copy(), sig_wf_label="sig_wf",
+                                          sig_sample_rate_label="sig_sample_rate_hz")
+        tfr_time_s = np.copy(df_batch["tfr_time_s"][1])
+        tfr_time_s_row = df_batch["tfr_time_s"][0]
+        tfr_time_s_row += 1.
+        tfr_frequency_hz_row = df_batch["tfr_frequency_hz"][3]
+        tfr_frequency_hz_row[0] *= 2.
+        # Grids are not shared between rows or channels
+        np.testing.assert_array_equal(df_batch["tfr_time_s"][1], tfr_time_s)
+        np.testing.assert_array_equal(df_batch["tfr_frequency_hz"][3][1], df_batch["tfr_frequency_hz"][0])
+
+    def tearDown(self) -> None:
+        self.df = None
+
+
+if __name__ == '__main__':
+    unittest.main()
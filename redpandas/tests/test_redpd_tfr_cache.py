@@ -0,0 +1,58 @@
+import os
+import tempfile
+import time
+import unittest
+import numpy as np
+import redpandas.redpd_tfr_cache as rpd_tfr_cache
+
+
+class TestTfrCacheKey(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sig_wf = np.arange(100.)
+
+    def test_key_repeatable(self):
+        self.assertEqual(rpd_tfr_cache.tfr_cache_key(self.sig_wf, 80., 'cwt', 3),
+                         rpd_tfr_cache.tfr_cache_key(self.sig_wf.copy(), 80., 'cwt', 3))
+
+    def test_key_changes_with_inputs(self):
+        key = rpd_tfr_cache.tfr_cache_key(self.sig_wf, 80., 'cwt', 3)
+        changed_sig_wf = self.sig_wf.copy()
+        changed_sig_wf[50] += 1.
+        self.assertNotEqual(key, rpd_tfr_cache.tfr_cache_key(changed_sig_wf, 80., 'cwt', 3))
+        self.assertNotEqual(key, rpd_tfr_cache.tfr_cache_key(self.sig_wf, 81., 'cwt', 3))
+        self.assertNotEqual(key, rpd_tfr_cache.tfr_cache_key(self.sig_wf, 80., 'stft', 3))
+        self.assertNotEqual(key, rpd_tfr_cache.tfr_cache_key(self.sig_wf, 80., 'cwt', 6))
+        self.assertNotEqual(key, rpd_tfr_cache.tfr_cache_key(self.sig_wf.reshape((4, 25)), 80., 'cwt', 3))
+
+
+class TestTfrCacheStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(seed=8)
+        self.tfr = rng.normal(size=(20, 200)), np.arange(200.), np.arange(20.)
+
+    def test_save_load(self):
+        self.assertIsNone(rpd_tfr_cache.load_tfr(self.cache_dir.name, "abc"))
+        rpd_tfr_cache.save_tfr(self.cache_dir.name, "abc", *self.tfr)
+        for loaded, saved in zip(rpd_tfr_cache.load_tfr(self.cache_dir.name, "abc"), self.tfr):
+            np.testing.assert_array_equal(loaded, saved)
+
+    def test_lru_eviction(self):
+        rpd_tfr_cache.save_tfr(self.cache_dir.name, "first", *self.tfr)
+        file_size = os.path.getsize(rpd_tfr_cache.tfr_cache_path(self.cache_dir.name, "first"))
+        rpd_tfr_cache.save_tfr(self.cache_dir.name, "second", *self.tfr)
+        # Use the first one, so the second is the least recently used
+        past = time.time() - 100
+        os.utime(rpd_tfr_cache.tfr_cache_path(self.cache_dir.name, "second"), (past, past))
+        self.assertIsNotNone(rpd_tfr_cache.load_tfr(self.cache_dir.name, "first"))
+        rpd_tfr_cache.save_tfr(self.cache_dir.name, "third", *self.tfr, max_size_bytes=int(2.5*file_size))
+        self.assertIsNone(rpd_tfr_cache.load_tfr(self.cache_dir.name, "second"))
+        self.assertIsNotNone(rpd_tfr_cache.load_tfr(self.cache_dir.name, "first"))
+        self.assertIsNotNone(rpd_tfr_cache.load_tfr(self.cache_dir.name, "third"))
+
+    def tearDown(self) -> None:
+        self.cache_dir.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+import unittest
+import numpy as np
+import pandas as pd
+import redpandas.redpd_xcorr as rpd_xcorr
+
+
+class TestXcorrPandas(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(seed=3)
+        source = rng.normal(size=1200)
+        # Delayed, scaled copies of a shared source plus noise, with equal (even and odd) and unequal lengths
+        starts = [0, 37, 90, 5, 140, 60]
+        lengths = [800, 800, 701, 701, 950, 640]
+        self.df = pd.DataFrame({"station_id": [str(i) for i in range(len(starts))],
+                                "audio_wf": [(-1)**i * source[start:start + length] + 0.3*rng.normal(size=length)
+                                             for i, (start, length) in enumerate(zip(starts, lengths))],
+                                "audio_sample_rate_nominal_hz": [80., 80., 80., 80., 80., 90.]})
+
+    def test_fft_engine_matches_loop(self):
+        for abs_xcorr in [True, False]:
+            xcorr_loop = rpd_xcorr.xcorr_pandas(df=self.df, sig_wf_label="audio_wf",
+                                                sig_sample_rate_label="audio_sample_rate_nominal_hz",
+                                                abs_xcorr=abs_xcorr, engine='loop')
+            xcorr_fft = rpd_xcorr.xcorr_pandas(df=self.df, sig_wf_label="audio_wf",
+                                               sig_sample_rate_label="audio_sample_rate_nominal_hz",
+                                               abs_xcorr=abs_xcorr, engine='fft')
+            for loop, fft in zip(xcorr_loop, xcorr_fft):
+                np.testing.assert_allclose(fft, loop, rtol=1e-9, atol=1e-12)
+
+    def test_fft_engine_process_pool(self):
+        xcorr_serial = rpd_xcorr.xcorr_pandas(df=self.df, sig_wf_label="audio_wf",
+                                              sig_sample_rate_label="audio_sample_rate_nominal_hz")
+        xcorr_pool = rpd_xcorr.xcorr_pandas(df=self.df, sig_wf_label="audio_wf",
+                                            sig_sample_rate_label="audio_sample_rate_nominal_hz", n_workers=2)
+        for serial, pool in zip(xcorr_serial, xcorr_pool):
+            np.testing.assert_array_equal(pool, serial)
+
+    def test_fft_engine_shared_spectra(self):
+        # More blocks than workers, each worker reads the spectra from shared memory
+        for abs_xcorr in [True, False]:
+            xcorr_serial = rpd_xcorr.xcorr_pandas(df=self.df, sig_wf_label="audio_wf",
+                                                  sig_sample_rate_label="audio_sample_rate_nominal_hz",
+                                                  abs_xcorr=abs_xcorr)
+            xcorr_pool = rpd_xcorr.xcorr_pandas(df=self.df, sig_wf_label="audio_wf",
+                                                sig_sample_rate_label="audio_sample_rate_nominal_hz",
+                                                abs_xcorr=abs_xcorr, n_workers=3)
+            for serial, pool in zip(xcorr_serial, xcorr_pool):
+                np.testing.assert_array_equal(pool, serial)
+
+    def test_common_sample_rate(self):
+        df = self.df.copy()
+        xcorr_skipped = rpd_xcorr.xcorr_pandas(df=df, sig_wf_label="audio_wf",
+                                               sig_sample_rate_label="audio_sample_rate_nominal_hz")
+        xcorr_common = rpd_xcorr.xcorr_pandas(df=df, sig_wf_label="audio_wf",
+                                              sig_sample_rate_label="audio_sample_rate_nominal_hz",
+                                              common_sample_rate_hz=80.)
+        # The 90 Hz station is correlated with the others once resampled to 80 Hz
+        self.assertEqual(xcorr_skipped[0][0, 5], 0.)
+        self.assertTrue(np.all(xcorr_common[0] != 0.))
+        xcorr_resampled = rpd_xcorr.xcorr_pandas(df=df, sig_wf_label="audio_wf_80hz",
+                                                 sig_sample_rate_label="audio_sample_rate_nominal_hz_80hz")
+        for common, resampled in zip(xcorr_common, xcorr_resampled):
+            np.testing.assert_array_equal(common, resampled)
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            rpd_xcorr.xcorr_pandas(df=self.df, sig_wf_label="audio_wf",
+                                   sig_sample_rate_label="audio_sample_rate_nominal_hz", engine='gpu')
+
+    def tearDown(self) -> None:
+        self.df = None
+
+
+class TestXcorrReRefPandas(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(seed=4)
+        source = rng.normal(size=1000)
+        starts = [0, 21, 55, 13, 80]
+        lengths = [600, 600, 547, 700, 547]
+        self.df = pd.DataFrame({"station_id": [str(i) for i in range(len(starts))],
+                                "audio_wf": [source[start:start + length] + 0.3*rng.normal(size=length)
+                                             for start, length in zip(starts, lengths)],
+                                "audio_sample_rate_nominal_hz": [80.]*len(starts)})
+
+    def test_fft_engine_matches_loop(self):
+        df_loop = rpd_xcorr.xcorr_re_ref_pandas(df=self.df.copy(), ref_id_label="0", sig_id_label="station_id",
+                                                sig_wf_label="audio_wf",
+                                                sig_sample_rate_label="audio_sample_rate_nominal_hz",
+                                                return_xcorr_full=True, engine='loop')
+        df_fft = rpd_xcorr.xcorr_re_ref_pandas(df=self.df.copy(), ref_id_label="0", sig_id_label="station_id",
+                                               sig_wf_label="audio_wf",
+                                               sig_sample_rate_label="audio_sample_rate_nominal_hz",
+                                               return_xcorr_full=True, engine='fft')
+        self.assertListEqual(list(df_fft.columns), list(df_loop.columns))
+        np.testing.assert_allclose(df_fft["xcorr_normalized_max"], df_loop["xcorr_normalized_max"], rtol=1e-9)
+        np.testing.assert_array_equal(df_fft["xcorr_offset_points"], df_loop["xcorr_offset_points"])
+        np.testing.assert_allclose(df_fft["xcorr_offset_seconds"], df_loop["xcorr_offset_seconds"])
+        for xcorr_fft, xcorr_loop in zip(df_fft["xcorr_full"], df_loop["xcorr_full"]):
+            np.testing.assert_allclose(xcorr_fft, xcorr_loop, rtol=1e-9, atol=1e-12)
+
+    def test_common_sample_rate(self):
+        # Station 4 recorded at twice the sample rate
+        self.df.at[4, "audio_wf"] = np.repeat(self.df["audio_wf"][4], 2)
+        self.df.at[4, "audio_sample_rate_nominal_hz"] = 160.
+        for engine in ['fft', 'loop']:
+            df = rpd_xcorr.xcorr_re_ref_pandas(df=self.df.copy(), ref_id_label="0", sig_id_label="station_id",
+                                               sig_wf_label="audio_wf",
+                                               sig_sample_rate_label="audio_sample_rate_nominal_hz",
+                                               engine=engine, common_sample_rate_hz='Min')
+            self.assertEqual(len(df["xcorr_offset_seconds"]), len(self.df))
+            self.assertEqual(np.abs(df["xcorr_offset_points"][4]), 80)
+            np.testing.assert_allclose(np.abs(df["xcorr_offset_seconds"][4]), 1.)
+
+    def tearDown(self) -> None:
+        self.df = None
+
+
+class TestSpectcorrReRefPandas(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(seed=5)
+        frequency_hz = np.linspace(1., 40., 60)
+        tfr_shape = (len(frequency_hz), 301)
+        self.df = pd.DataFrame({"station_id": ["0", "1", "2"],
+                                "tfr": [rng.normal(size=tfr_shape) - 10. for _ in range(3)],
+                                "tfr_frequency_hz": [frequency_hz]*3,
+                                "audio_sample_rate_nominal_hz": [80.]*3,
+                                "frequency_low_hz": [np.float64(5.)]*3,
+                                "frequency_high_hz": [np.float64(30.)]*3})
+
+    def test_fft_engine_matches_loop(self):
+        results = {}
+        for engine in ['loop', 'fft']:
+            results[engine] = rpd_xcorr.spectcorr_re_ref_pandas(df=self.df.copy(), ref_id_label="1",
+                                                                sig_id_label="station_id", sig_tfr_label="tfr",
+                                                                sig_tfr_frequency_label="tfr_frequency_hz",
+                                                                sig_sample_rate_label="audio_sample_rate_nominal_hz",
+                                                                sig_tfr_frequency_low_hz_label="frequency_low_hz",
+                                                                sig_tfr_frequency_high_hz_label="frequency_high_hz",
+                                                                return_xcorr_full=True, engine=engine)
+        for column in ["spectcorr_offset_points", "spectcorr_offset_seconds", "spectcorr_peak_frequency_hz"]:
+            np.testing.assert_array_equal(results['fft'][column], results['loop'][column])
+        for column in ["spectcorr_full", "spectcorr_per_band_full"]:
+            for spect_fft, spect_loop in zip(results['fft'][column], results['loop'][column]):
+                np.testing.assert_allclose(spect_fft, spect_loop, rtol=1e-9, atol=1e-12)
+
+    def tearDown(self) -> None:
+        self.df = None
+
+
+if __name__ == '__main__':
+    unittest.main()